@@ -1,4 +1,6 @@
 from openagi.llms.azure import AzureChatOpenAIModel
+from openagi.llms.cache import CachedLLM
+from openagi.llms.replay import RecordingLLM, ReplayLLM
 from openagi.agent import Admin
 from openagi.memory import Memory
 from openagi.worker import Worker
@@ -104,7 +106,7 @@ def f1_score(prediction, ground_truth):
     f1 = (2 * precision * recall) / (precision + recall)
     return f1, precision, recall
 
-def agent(query, llm):
+def build_admin(llm):
     planner = TaskPlanner(autonomous=True)
     admin = Admin(
         planner=planner,
@@ -112,39 +114,62 @@ def agent(query, llm):
         actions=[WikiSearchAction],
         llm=llm,
     )
-    res = admin.run(
-        query=query,
-        description="Provide answer for the query. You should decompose your task into executable actions.",
-    )
-    return res
+    return admin
 
-def run_agent(level = 'easy'):
+def run_agent(level = 'easy', concurrency=4):
     os.environ["AZURE_BASE_URL"] = ""
     os.environ["AZURE_DEPLOYMENT_NAME"] = ""
     os.environ["AZURE_MODEL_NAME"]="gpt4"
     os.environ["AZURE_OPENAI_API_VERSION"]=""
     os.environ["AZURE_OPENAI_API_KEY"]=  ""
-    config = AzureChatOpenAIModel.load_from_env_config()
-    llm = AzureChatOpenAIModel(config=config)
+    # OPENAGI_CASSETTE_MODE=record saves the LLM calls of the run into the cassette, and
+    # OPENAGI_CASSETTE_MODE=replay serves them back offline, e.g. to benchmark the framework itself.
+    cassette_mode = os.environ.get("OPENAGI_CASSETTE_MODE", "").lower()
+    cassette_path = os.environ.get("OPENAGI_CASSETTE", f"./data/{level}_cassette.jsonl")
+    if cassette_mode == "replay":
+        llm = ReplayLLM(
+            cassette_path=cassette_path,
+            latency=os.environ.get("OPENAGI_REPLAY_LATENCY", "none"),
+            seed=0,
+        )
+    elif cassette_mode == "record":
+        config = AzureChatOpenAIModel.load_from_env_config()
+        llm = RecordingLLM(wrapped=AzureChatOpenAIModel(config=config), cassette_path=cassette_path)
+    else:
+        config = AzureChatOpenAIModel.load_from_env_config()
+        # Responses are cached on disk, so that repeated runs skip the identical LLM calls.
+        llm = CachedLLM(
+            wrapped=AzureChatOpenAIModel(config=config),
+            cache_path="./data/llm_cache.sqlite",
+        )
 
     hotpot_data = load_hotpot_qa_data(level)
     hotpot_data = hotpot_data.reset_index(drop=True)
     task_instructions = [
         (row["question"], row["answer"]) for _, row in hotpot_data.iterrows()
-    ]
+    ][0:30]
 
     f1_list = []
     correct = 0
-    results = {}
 
-    for task , answer in tqdm(task_instructions[0:30]):
-        response = agent(task , llm)
+    # Every question runs in its own session, sharing the LLM client and the actions.
+    admin = build_admin(llm)
+    questions = [task for task, _ in task_instructions]
+    description = "Provide answer for the query. You should decompose your task into executable actions."
+    for session_result in tqdm(
+        admin.run_many(questions, description=description, concurrency=concurrency),
+        total=len(questions),
+    ):
+        response = session_result.result or ""
+        answer = task_instructions[session_result.index][1]
         f1 , _ ,_ = f1_score(response,answer)
         f1_list.append(f1)
         correct += int(response == answer)
 
-        avg_f1 = np.mean(f1_list)
-        acc = correct / len(task_instructions[0:30])
+    avg_f1 = np.mean(f1_list)
+    acc = correct / len(task_instructions)
+    if hasattr(llm, "stats"):
+        print(f"LLM stats: {llm.stats}")
     return avg_f1, acc
 
 # levels are 'easy', 'medium', 'hard'
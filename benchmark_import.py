@@ -0,0 +1,68 @@
+"""
+Measures the cold start of openagi: the time to import `openagi.agent` in a fresh interpreter,
+and the packages it spends that time on.
+
+Usage:
+    python benchmark_import.py [--runs 5] [--module openagi.agent] [--top 10]
+
+The LLM SDKs (langchain and the provider clients) should not show up among the packages, since
+the providers are only imported on first use, see `openagi.llms.registry`.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+# Top-level packages of the LLM SDKs, besides the langchain ones.
+LLM_SDKS = ("openai", "anthropic", "groq", "cohere", "mistralai", "ollama")
+
+
+def import_times(module: str):
+    """Returns the total import time of the module and the self time per top-level package."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    packages: Counter = Counter()
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[12:].split("|"))
+        packages[name.strip().split(".")[0]] += int(self_us)
+        if name.strip() == module:
+            total = int(cumulative_us)
+    return total / 1e6, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="openagi.agent")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, packages = [], Counter()
+    for _ in range(args.runs):
+        total, run_packages = import_times(args.module)
+        totals.append(total)
+        packages.update(run_packages)
+
+    print(f"import {args.module}: median {statistics.median(totals):.3f}s over {args.runs} runs")
+    for package, self_us in packages.most_common(args.top):
+        print(f"  {package:<30} {self_us / args.runs / 1e6:.3f}s")
+    sdks = sorted(
+        package for package in packages if package.startswith("langchain") or package in LLM_SDKS
+    )
+    print(f"LLM SDKs imported: {', '.join(sdks) if sdks else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
-from textwrap import dedent
-from pydantic import BaseModel, Field
+import asyncio
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Any, Optional
 
 from openagi.llms.base import LLMBaseModel
+from openagi.actions.descriptors import describe_action
+from openagi.llms.tools import function_tool
 from openagi.memory.memory import Memory
 from typing import ClassVar, Dict, Any
 
@@ -22,26 +24,48 @@ class BaseAction(BaseModel):
         exclude=True,
         default=None,
     )
+    # Actions without side effects can be started speculatively, before the LLM response
+    # is complete, since their result can be discarded if the final action differs.
+    speculative: ClassVar[bool] = False
 
     def execute(self):
         """Executes the action"""
         raise NotImplementedError("Subclasses must implement this method.")
 
+    async def aexecute(self):
+        """Executes the action asynchronously, by default running `execute` in a worker thread."""
+        return await asyncio.to_thread(self.execute)
+
     @classmethod
     def cls_doc(cls):
-        default_exclude_doc_fields = ["llm", "memory", "session_id", "name", "description"]
-        return {
-            "cls": {
-                "kls": cls.__name__,
-                "module": cls.__module__,
-                "doc": dedent(cls.__doc__).strip() if cls.__doc__ else "",
-            },
-            "params": {
-                field_name: field.description
-                for field_name, field in cls.model_fields.items()
-                if field_name not in default_exclude_doc_fields
-            },
-        }
+        """
+        Describes the action to the LLM. The description is computed once per class, see
+        `describe_action`.
+        """
+        return describe_action(cls).cls_doc()
+
+    @classmethod
+    def tool_schema(cls) -> Dict[str, Any]:
+        """Returns the action as a function tool, for the LLMs calling the actions natively."""
+        doc = cls.cls_doc()
+        properties, required, defs = {}, [], {}
+        for field_name in doc["params"]:
+            field = cls.model_fields[field_name]
+            try:
+                schema = TypeAdapter(field.annotation).json_schema()
+            except Exception:
+                # Types without a JSON schema, e.g. arbitrary classes, accept any value.
+                schema = {}
+            defs.update(schema.pop("$defs", {}))
+            if field.description:
+                schema["description"] = field.description
+            properties[field_name] = schema
+            if field.is_required():
+                required.append(field_name)
+        parameters = {"type": "object", "properties": properties, "required": required}
+        if defs:
+            parameters["$defs"] = defs
+        return function_tool(cls.__name__, doc["cls"]["doc"], parameters)
 
 class ConfigurableAction(BaseAction):
     config: ClassVar[Dict[str, Any]] = {}
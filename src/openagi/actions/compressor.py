@@ -12,6 +12,11 @@ class SummarizerAction(BaseAction):
         description="Messages/Data to be summarized",
     )
 
+    def get_prompt(self) -> str:
+        return SummarizerPrompt.from_template({"past_messages": self.past_messages})
+
     def execute(self):
-        summarizer: str = SummarizerPrompt.from_template({"past_messages": self.past_messages})
-        return self.llm.run(summarizer)
+        return self.llm.run(self.get_prompt())
+
+    async def aexecute(self):
+        return await self.llm.arun(self.get_prompt())
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from textwrap import dedent
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from openagi.llms.tokens import approximate_tokens
+
+# Bumped whenever the layout of the descriptors or of their encoding changes.
+DESCRIPTOR_VERSION = 2
+
+# Fields of the actions that are set by the agents rather than by the LLM.
+EXCLUDED_PARAMS = ("llm", "memory", "session_id", "name", "description")
+
+# Keys of the compact encoding, explained once at the top of the encoded actions.
+SHORT_KEYS = {"kls": "n", "module": "m", "doc": "d", "params": "p"}
+SHORT_KEY_NAMES = {
+    "kls": "class name",
+    "module": "module",
+    "doc": "description",
+    "params": "parameters",
+}
+
+
+class ActionDescriptor(NamedTuple):
+    """What the LLM is told about an action, computed once per action class."""
+
+    kls: str
+    module: str
+    doc: str
+    params: Dict[str, Any]
+    # Changes with the descriptor, e.g. to tell apart the prompts built from other action docs.
+    version: str
+
+    def cls_doc(self) -> Dict[str, Any]:
+        return {
+            "cls": {"kls": self.kls, "module": self.module, "doc": self.doc},
+            "params": dict(self.params),
+        }
+
+
+@lru_cache(maxsize=None)
+def describe_action(act_cls: type) -> ActionDescriptor:
+    """
+    Returns the descriptor of an action class. Descriptors are memoized per class, so the
+    dictionaries they hold are shared and must not be modified.
+    """
+    doc = dedent(act_cls.__doc__).strip() if act_cls.__doc__ else ""
+    params = {
+        field_name: field.description
+        for field_name, field in act_cls.model_fields.items()
+        if field_name not in EXCLUDED_PARAMS
+    }
+    payload = json.dumps(
+        [DESCRIPTOR_VERSION, act_cls.__name__, act_cls.__module__, doc, params], default=str
+    )
+    version = f"{DESCRIPTOR_VERSION}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]}"
+    return ActionDescriptor(act_cls.__name__, act_cls.__module__, doc, params, version)
+
+
+def minify_doc(doc: str, first_paragraph: bool = False) -> str:
+    """Collapses the whitespaces of a docstring, keeping only its first paragraph if asked to."""
+    if first_paragraph:
+        doc = re.split(r"\n\s*\n", doc.strip(), maxsplit=1)[0]
+    return " ".join(doc.split())
+
+
+def _shared_params(descriptors: Sequence[ActionDescriptor]) -> Dict[str, Any]:
+    """The parameters described alike in all the actions, written once in the compact encoding."""
+    if len(descriptors) < 2:
+        return {}
+    first, *others = descriptors
+    return {
+        name: description
+        for name, description in first.params.items()
+        if all(name in other.params and other.params[name] == description for other in others)
+    }
+
+
+def _encode_action(
+    descriptor: ActionDescriptor, shared: Dict[str, Any], with_modules: bool, minify_docs: bool
+) -> str:
+    entry: Dict[str, Any] = {SHORT_KEYS["kls"]: descriptor.kls}
+    if with_modules:
+        entry[SHORT_KEYS["module"]] = descriptor.module
+    entry[SHORT_KEYS["doc"]] = minify_doc(descriptor.doc, first_paragraph=minify_docs)
+    entry[SHORT_KEYS["params"]] = {
+        name: value for name, value in descriptor.params.items() if name not in shared
+    }
+    return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+def _short_keys_legend(with_modules: bool) -> str:
+    keys = [key for key in SHORT_KEYS if with_modules or key != "module"]
+    return "Keys of each action: " + ", ".join(
+        f"{SHORT_KEYS[key]}={SHORT_KEY_NAMES[key]}" for key in keys
+    )
+
+
+def encode_actions(
+    descriptors: Sequence[ActionDescriptor],
+    compact: bool = True,
+    minify_docs: bool = False,
+    with_modules: Optional[bool] = None,
+) -> str:
+    """
+    Encodes the descriptors of the actions for a prompt.
+
+    Args:
+        descriptors: The descriptors of the actions.
+        compact: If True, each action is a line of minified JSON with short keys, explained once,
+            and the parameters shared by all the actions are described once. Otherwise the
+            `cls_doc` of the actions are written as a Python list, as the prompts used to be.
+        minify_docs: If True, only the first paragraph of the docstrings is kept.
+        with_modules: Whether to include the modules of the actions. Defaults to only including
+            them when actions share a class name, the actions being looked up by name.
+
+    Returns:
+        str: The actions as written in the prompts.
+    """
+    if not compact:
+        return str([descriptor.cls_doc() for descriptor in descriptors])
+
+    if with_modules is None:
+        names = [descriptor.kls for descriptor in descriptors]
+        with_modules = len(set(names)) < len(names)
+    shared = _shared_params(descriptors)
+    lines = [_short_keys_legend(with_modules)]
+    if shared:
+        lines.append(
+            f"Params of every action: {json.dumps(shared, separators=(',', ':'), default=str)}"
+        )
+    lines.extend(
+        _encode_action(descriptor, shared, with_modules, minify_docs)
+        for descriptor in descriptors
+    )
+    return "\n".join(lines)
+
+
+def size_report(descriptors: Sequence[ActionDescriptor], llm: Any = None) -> List[Dict[str, Any]]:
+    """
+    Reports the size of each descriptor in the prompts, as written in full and in the compact
+    encoding.
+
+    Args:
+        descriptors: The descriptors of the actions.
+        llm: LLM whose tokenizer counts the tokens. Defaults to an approximation.
+
+    Returns:
+        List[Dict[str, Any]]: The characters and tokens of each action in both encodings, largest
+            first.
+    """
+    count = llm.count_tokens if llm is not None else approximate_tokens
+    shared = _shared_params(descriptors)
+    report = []
+    for descriptor in descriptors:
+        full = str(descriptor.cls_doc())
+        compact = _encode_action(descriptor, shared, with_modules=False, minify_docs=False)
+        report.append(
+            {
+                "action": descriptor.kls,
+                "version": descriptor.version,
+                "chars": len(full),
+                "tokens": count(full),
+                "compact_chars": len(compact),
+                "compact_tokens": count(compact),
+            }
+        )
+    return sorted(report, key=lambda entry: entry["tokens"], reverse=True)
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import ClassVar, Dict, Optional
 from pydantic import Field
 
 from openagi.actions.base import BaseAction
@@ -65,6 +65,8 @@ class ReadFileAction(BaseAction):
     Reads the contents of a file specified by the `file_path` parameter.
     """
 
+    speculative: ClassVar[bool] = True
+
     file_path: str = Field(..., description="Name of the file along with the directory.")
 
     def execute(self):
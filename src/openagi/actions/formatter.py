@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 from pydantic import Field
 
@@ -13,8 +13,45 @@ class FormatterAction(BaseAction):
         default="markdown",
         description="Type to which the content will be formatted to. It will be modified to the supported formats and returned. Supported Formats - markdown/plan-text",
     )
+    max_chunk_chars: int = Field(
+        default=6000,
+        description=(
+            "Long content is split at paragraphs into chunks of at most this many characters, "
+            "formatted in parallel."
+        ),
+    )
+
+    def _get_chunks(self) -> List[str]:
+        if isinstance(self.content, (list, tuple)):
+            return [f"{item}" for item in self.content]
+
+        chunks, current = [], ""
+        for paragraph in f"{self.content}".split("\n\n"):
+            if current and len(current) + len(paragraph) + 2 > self.max_chunk_chars:
+                chunks.append(current)
+                current = paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        chunks.append(current)
+        return chunks
+
+    def get_prompt(self, content: Any = None):
+        content = self.content if content is None else content
+        return (
+            f"Format and return the below response in {self.format_type} format without removing "
+            f"any content. You can rephrase if required.\n{content}"
+        )
 
     def execute(self):
-        return self.llm.run(
-            f"Format and return the below response in {self.format_type} format without removing any content. You can rephrase if required.\n{self.content}"
+        chunks = self._get_chunks()
+        if len(chunks) == 1:
+            return self.llm.run(self.get_prompt(chunks[0]))
+        return "\n\n".join(self.llm.run_batch([self.get_prompt(chunk) for chunk in chunks]))
+
+    async def aexecute(self):
+        chunks = self._get_chunks()
+        if len(chunks) == 1:
+            return await self.llm.arun(self.get_prompt(chunks[0]))
+        return "\n\n".join(
+            await self.llm.arun_batch([self.get_prompt(chunk) for chunk in chunks])
         )
@@ -1,4 +1,5 @@
 import logging
+from typing import ClassVar
 
 from pydantic import Field
 
@@ -10,6 +11,8 @@ class MemoryRagAction(BaseAction):
     This action is responsible to reading and not writing. Writing is done by default for every task.
     """
 
+    speculative: ClassVar[bool] = True
+
     query: str = Field(
         ...,
         description="Query, a string, to run to retrieve the data from the results of previous tasks. Returns an Array of the results.",
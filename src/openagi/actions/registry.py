@@ -0,0 +1,126 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from openagi.actions.base import BaseAction
+from openagi.actions.descriptors import (
+    ActionDescriptor,
+    describe_action,
+    encode_actions,
+    size_report,
+)
+from openagi.exception import InvalidActionError
+
+
+class ActionRegistry:
+    """
+    The actions an Admin or a Worker can run, indexed once by class name.
+
+    The actions requested by the LLM are resolved against the registry instead of importing the
+    module and class names it wrote, so that dispatching an action is a dictionary lookup and
+    only the registered actions can be run.
+    """
+
+    def __init__(self, actions: Iterable[Any]) -> None:
+        self.actions: Tuple[type, ...] = tuple(
+            dict.fromkeys(
+                act_cls
+                for act_cls in actions
+                if isinstance(act_cls, type)
+                and issubclass(act_cls, BaseAction)
+                and act_cls is not BaseAction
+            )
+        )
+        self._by_name: Dict[str, List[type]] = {}
+        for act_cls in self.actions:
+            self._by_name.setdefault(act_cls.__name__, []).append(act_cls)
+        self._docs: Optional[List[Dict]] = None
+        self._tools: Optional[List[Dict]] = None
+        self._encoded: Dict[Tuple[bool, bool], str] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    @property
+    def descriptors(self) -> List[ActionDescriptor]:
+        """The descriptors of the registered actions, memoized per class."""
+        return [describe_action(act_cls) for act_cls in self.actions]
+
+    @property
+    def docs(self) -> List[Dict]:
+        """The `cls_doc` of the registered actions, computed once."""
+        if self._docs is None:
+            self._docs = [act_cls.cls_doc() for act_cls in self.actions]
+        return self._docs
+
+    def encode(self, compact: bool = True, minify_docs: bool = False) -> str:
+        """
+        The registered actions as written in the prompts, see `encode_actions`. Computed once per
+        encoding.
+        """
+        key = (compact, minify_docs)
+        if key not in self._encoded:
+            self._encoded[key] = encode_actions(
+                self.descriptors, compact=compact, minify_docs=minify_docs
+            )
+        return self._encoded[key]
+
+    def size_report(self, llm: Any = None) -> List[Dict[str, Any]]:
+        """The size of the description of each registered action, see `size_report`."""
+        return size_report(self.descriptors, llm)
+
+    @property
+    def tools(self) -> List[Dict]:
+        """The `tool_schema` of the registered actions, computed once."""
+        if self._tools is None:
+            self._tools = [act_cls.tool_schema() for act_cls in self.actions]
+        return self._tools
+
+    def get(self, name: str, module: Optional[str] = None) -> type:
+        """
+        Returns the action registered under the class name. The module only disambiguates
+        actions sharing a name, since LLMs often misspell it.
+
+        Raises:
+            InvalidActionError: If no action of that name is registered.
+        """
+        candidates = self._by_name.get(name)
+        if not candidates:
+            raise InvalidActionError(
+                f"Action {name!r} is not supported. Supported actions: {sorted(self._by_name)}."
+            )
+        if len(candidates) > 1 and module:
+            for act_cls in candidates:
+                if act_cls.__module__ == module:
+                    return act_cls
+        if module and candidates[0].__module__ != module:
+            logging.debug(
+                f"Action {name} requested from {module}, using {candidates[0].__module__}."
+            )
+        return candidates[0]
+
+    def select(self, names: Iterable[str]) -> List[type]:
+        """Returns the registered actions of the given class names, ignoring the unknown ones."""
+        names = dict.fromkeys(name for name in names if isinstance(name, str))
+        return [act_cls for name in names for act_cls in self._by_name.get(name, ())]
+
+    def resolve(self, json_data: List[Dict]) -> List[Tuple[type, Dict]]:
+        """
+        Resolves the actions requested by the LLM to their classes and parameters.
+
+        Raises:
+            KeyError: If an action misses its `cls`, `kls` or `params`.
+            InvalidActionError: If an action is not registered.
+        """
+        actions = []
+        for item in json_data:
+            act_cls = self.get(item["cls"]["kls"], item["cls"].get("module"))
+            params = item["params"]
+            if not isinstance(params, dict):
+                raise InvalidActionError(
+                    f"Parameters of action {act_cls.__name__} must be an object, got {params!r}."
+                )
+            actions.append((act_cls, params))
+        return actions
@@ -13,6 +13,9 @@ class ArxivSearch(ConfigurableAction):
     """
     Arxiv Search is a tool used to search articles in Physics, Mathematics, Computer Science, Quantitative Biology, Quantitative Finance, and Statistics
     """
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query or question")
     max_results: int = Field(10, description="Total results, in int, to be executed from the search. Defaults to 10.")
 
@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, ClassVar
 from openagi.actions.base import ConfigurableAction
 from pydantic import Field
 from duckduckgo_search import DDGS
@@ -8,6 +8,8 @@ import logging
 class DuckDuckGoSearch(ConfigurableAction):
     """Use this Action to search DuckDuckGo for a query."""
 
+    speculative: ClassVar[bool] = True
+
     name: str = Field(
         default_factory=str,
         description="DuckDuckGoSearch Action to search over duckduckgo using the query.",
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, ClassVar
 from openagi.actions.base import ConfigurableAction
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders.csv_loader import CSVLoader
@@ -11,6 +11,8 @@ class TextLoaderTool(ConfigurableAction):
     This action loads and processes content from .txt files, combining
     metadata and content into a single context string.
     """
+
+    speculative: ClassVar[bool] = True
     
     def execute(self) -> str:
         file_path: str = self.get_config('filename')
@@ -30,6 +32,8 @@ class PDFLoaderTool(ConfigurableAction):
     This action loads and processes content from .pdf files, combining
     metadata and content into a single context string.
     """
+
+    speculative: ClassVar[bool] = True
     
     def execute(self) -> str:
         file_path: str = self.get_config('filename')
@@ -49,6 +53,8 @@ class CSVLoaderTool(ConfigurableAction):
     This action loads and processes content from .csv files, combining
     row numbers and content into a formatted string representation.
     """
+
+    speculative: ClassVar[bool] = True
     
     def execute(self) -> str:
         file_path: str = self.get_config('filename')
@@ -3,6 +3,7 @@ from pydantic import Field
 from openagi.exception import OpenAGIException
 import os
 import warnings
+from typing import ClassVar
 
 try:
     from exa_py import Exa
@@ -15,6 +16,9 @@ class ExaSearch(ConfigurableAction):
     This action uses the Exa API to perform searches and retrieve relevant content
     based on user queries. Requires an API key to be configured before use.
     """
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query or question")
     
     def __init__(self, **data):
@@ -1,6 +1,6 @@
 import base64
 import os
-from typing import Dict, List
+from typing import ClassVar, Dict, List
 from openagi.exception import OpenAGIException
 import requests
 from langchain_community.document_loaders.github import GithubFileLoader
@@ -48,6 +48,8 @@ class GitHubFileLoadAction(BaseAction):
     #Use this Action to extract specific extension files from GitHub.
     """
 
+    speculative: ClassVar[bool] = True
+
     repo: str = Field(
         default_factory=str,
         description="Repository name- Format: username/repo e.g., aiplanethub/openagi",
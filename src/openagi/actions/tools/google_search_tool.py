@@ -2,6 +2,7 @@ from openagi.actions.base import ConfigurableAction
 from pydantic import Field
 from openagi.exception import OpenAGIException
 import logging
+from typing import ClassVar
 
 try:
    from googlesearch import search
@@ -12,6 +13,9 @@ class GoogleSearchTool(ConfigurableAction):
     """
     Google Search is a tool used for scraping the Google search engine. Extract information from Google search results.
     """
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query or question ")
 
     max_results: int = Field(
@@ -1,6 +1,7 @@
 from openagi.actions.base import ConfigurableAction
 from openagi.exception import OpenAGIException
 from pydantic import Field
+from typing import ClassVar
 
 try:
 	from Bio import Entrez
@@ -14,6 +15,8 @@ class PubMedSearch(ConfigurableAction):
 	scientific articles based on user queries. Requires an email address
 	to be configured for NCBI's tracking purposes.
 	"""
+
+	speculative: ClassVar[bool] = True
 	
 	query: str = Field(..., description="Search query for PubMed")
 	max_results: int = Field(
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, ClassVar
 import warnings
 import os
 from pydantic import Field
@@ -14,6 +14,9 @@ class RedditSearch(ConfigurableAction):
     """
     Reddit Search Tool to search and retrieve posts/comments from Reddit using PRAW
     """
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query to search Reddit")
     subreddit: Optional[str] = Field(
         default=None,
@@ -2,7 +2,7 @@ import logging
 import os
 import requests
 from urllib.parse import urlencode
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import Field
 from openagi.actions.base import ConfigurableAction
@@ -11,6 +11,9 @@ import warnings
 
 class SearchApiSearch(ConfigurableAction):
     """SearchApi.io provides a real-time API to access search results from Google (default), Google Scholar, Bing, Baidu, and other search engines."""
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(
         ..., description="User query of type string used to fetch web search results from a search engine."
     )
@@ -9,6 +9,9 @@ from openagi.exception import OpenAGIException
 
 class GoogleSerpAPISearch(ConfigurableAction):
     """Google Serp API Search Tool"""
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(
         ..., description="User query of type string used to fetch web search results from Google."
     )
@@ -9,6 +9,9 @@ from openagi.exception import OpenAGIException
 
 class SerperSearch(ConfigurableAction):
     """Google Serper.dev Search Tool"""
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query to fetch web search results from Google")
     
     def __init__(self, **data):
@@ -3,6 +3,7 @@ from pydantic import Field
 from openagi.exception import OpenAGIException
 import os
 import warnings
+from typing import ClassVar
 
 try:
     from tavily import TavilyClient
@@ -13,6 +14,9 @@ class TavilyWebSearchQA(ConfigurableAction):
     """
     Tavily Web Search QA is a tool used when user needs to ask the question in terms of query to get response
     """
+
+    speculative: ClassVar[bool] = True
+
     query: str = Field(..., description="User query or question")
     
     def __init__(self, **data):
@@ -16,6 +16,8 @@ class UnstructuredPdfLoaderAction(ConfigurableAction):
     Returns a list of dictionary with keys 'type', 'element_id', 'text', 'metadata'.
     """
 
+    speculative: ClassVar[bool] = True
+
     def execute(self):
         file_path = self.get_config('filename')    
         logging.info(f"Reading file {file_path}")
@@ -4,6 +4,7 @@ from langchain_community.document_loaders import WebBaseLoader
 from pydantic import Field
 from openagi.actions.base import ConfigurableAction
 import logging
+from typing import ClassVar
 
 class WebBaseContextTool(ConfigurableAction):
 	"""
@@ -11,6 +12,8 @@ class WebBaseContextTool(ConfigurableAction):
     If a url seems to be failing for more than once, ignore it and move forward.
 	"""
 
+	speculative: ClassVar[bool] = True
+
 	link: str = Field(
 		default_factory=str,
 		description="Extract context for the Agents from the Web Search through web page",
@@ -1,5 +1,5 @@
 import json
-from typing import Any
+from typing import Any, ClassVar
 from openagi.actions.base import ConfigurableAction
 from pydantic import Field
 import wikipedia
@@ -8,6 +8,8 @@ import logging
 class WikipediaSearch(ConfigurableAction):
 	"""Use this Action to search Wikipedia for a query."""
 
+	speculative: ClassVar[bool] = True
+
 	name: str = Field(
 		default_factory=str,
 		description="WikipediaSearch Action to search Wikipedia using the query.",
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional
 from openagi.actions.base import ConfigurableAction
 from openagi.exception import OpenAGIException
 from pydantic import Field
@@ -14,6 +14,8 @@ class YahooFinanceTool(ConfigurableAction):
 	This action uses the yfinance library to retrieve financial information
 	about stocks, including current price, historical data, and company info.
 	"""
+
+	speculative: ClassVar[bool] = True
 	
 	symbol: str = Field(..., description="Stock symbol to look up (e.g., 'AAPL' for Apple)")
 	info_type: str = Field(
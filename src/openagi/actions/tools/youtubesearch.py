@@ -1,6 +1,6 @@
 from openagi.actions.base import ConfigurableAction
 from pydantic import Field
-from typing import Any
+from typing import Any, ClassVar
 from openagi.exception import OpenAGIException
 
 try:
@@ -12,6 +12,8 @@ except ImportError:
 class YouTubeSearchTool(ConfigurableAction):
     """Youtube Search Tool"""
 
+    speculative: ClassVar[bool] = True
+
     query: str = Field(
         ..., description="Keyword required to search the video content on YouTube"
     )
@@ -1,5 +1,13 @@
+import asyncio
+import copy
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
 from openagi.actions.base import BaseAction
+from openagi.utils.extraction import get_act_classes_from_json
 
 
 def run_action(action_cls: str, memory, llm, **kwargs):
@@ -19,3 +27,238 @@ def run_action(action_cls: str, memory, llm, **kwargs):
     action: BaseAction = action_cls(**kwargs)  # Create an instance with provided kwargs
     res = action.execute()
     return res
+
+
+async def arun_action(action_cls: str, memory, llm, **kwargs):
+    """
+    Runs the specified action asynchronously with the provided keyword arguments.
+
+    Args:
+        action_cls (str): The class name of the action to be executed.
+        **kwargs: Keyword arguments to be passed to the action class constructor.
+
+    Returns:
+        The result of executing the action.
+    """
+    logging.info(f"Running Action - {str(action_cls)}")
+    kwargs["memory"] = memory
+    kwargs["llm"] = llm
+    action: BaseAction = action_cls(**kwargs)
+    res = await action.aexecute()
+    return res
+
+
+def _action_timeout_error(action_cls, timeout: float) -> TimeoutError:
+    return TimeoutError(
+        f"Action {action_cls.__name__} did not complete within {timeout} seconds."
+    )
+
+
+def run_actions(
+    actions: List[Tuple[type, Dict]],
+    memory,
+    llm,
+    concurrent: bool = False,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    Runs the actions extracted from a single LLM response.
+
+    Args:
+        actions (List[Tuple[type, Dict]]): The action classes and their parameters, as returned by
+            `get_act_classes_from_json`.
+        concurrent (bool): If True, the actions are run concurrently in threads instead of one
+            after the other.
+        timeout (Optional[float]): Maximum number of seconds each action is allowed to run. A
+            thread cannot be cancelled, so an action that times out keeps running in the
+            background until it returns, and only its result is dropped.
+
+    Returns:
+        List[Any]: The result of each action, in the same order as `actions`. An action that
+        failed or timed out is given the raised exception as its result.
+    """
+    if not actions:
+        return []
+
+    if not concurrent and timeout is None:
+        results = []
+        for act_cls, params in actions:
+            try:
+                results.append(run_action(action_cls=act_cls, memory=memory, llm=llm, **params))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    # Actions that timed out cannot be interrupted, so each action gets its own thread
+    # and the pool is not waited upon.
+    executor = ThreadPoolExecutor(max_workers=len(actions))
+    results = []
+    try:
+        if concurrent:
+            start = time.monotonic()
+            futures = [
+                executor.submit(run_action, action_cls=act_cls, memory=memory, llm=llm, **params)
+                for act_cls, params in actions
+            ]
+        for indx, (act_cls, params) in enumerate(actions):
+            if concurrent:
+                future = futures[indx]
+                remaining = (
+                    None if timeout is None else max(0, start + timeout - time.monotonic())
+                )
+            else:
+                future = executor.submit(
+                    run_action, action_cls=act_cls, memory=memory, llm=llm, **params
+                )
+                remaining = timeout
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                results.append(_action_timeout_error(act_cls, timeout))
+            except Exception as e:
+                results.append(e)
+    finally:
+        executor.shutdown(wait=False)
+    return results
+
+
+async def arun_actions(
+    actions: List[Tuple[type, Dict]],
+    memory,
+    llm,
+    concurrent: bool = False,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    Runs the actions extracted from a single LLM response asynchronously.
+
+    Args:
+        actions (List[Tuple[type, Dict]]): The action classes and their parameters, as returned by
+            `get_act_classes_from_json`.
+        concurrent (bool): If True, the actions are awaited concurrently instead of one after the
+            other.
+        timeout (Optional[float]): Maximum number of seconds each action is allowed to run. An
+            action that times out is cancelled, but the `execute` of the actions without their
+            own `aexecute` runs in a thread, which keeps running until it returns.
+
+    Returns:
+        List[Any]: The result of each action, in the same order as `actions`. An action that
+        failed or timed out is given the raised exception as its result.
+    """
+
+    async def _run(act_cls, params):
+        try:
+            return await asyncio.wait_for(
+                arun_action(action_cls=act_cls, memory=memory, llm=llm, **params), timeout
+            )
+        except asyncio.TimeoutError:
+            return _action_timeout_error(act_cls, timeout)
+        except Exception as e:
+            return e
+
+    if concurrent:
+        return list(await asyncio.gather(*(_run(act_cls, params) for act_cls, params in actions)))
+    return [await _run(act_cls, params) for act_cls, params in actions]
+
+
+class SpeculativeActions:
+    """
+    Actions started while the LLM response is still being streamed.
+
+    The actions of the first action JSON found in the stream are started right away when all of
+    them are `speculative`, i.e. free of side effects. Once the response is complete, their
+    results are only used if the final action is the same, otherwise they are discarded.
+    """
+
+    def __init__(
+        self,
+        memory,
+        llm,
+        concurrent: bool = False,
+        timeout: Optional[float] = None,
+        registry=None,
+    ) -> None:
+        self.memory = memory
+        self.llm = llm
+        self.concurrent = concurrent
+        self.timeout = timeout
+        self.registry = registry
+        self._action: Optional[List[Dict]] = None
+        self._pending: Any = None
+
+    def _get_actions(self, action) -> Optional[List[Tuple[type, Dict]]]:
+        """Returns the action classes and parameters to start, if all of them are speculative."""
+        try:
+            actions = get_act_classes_from_json(copy.deepcopy(action), self.registry)
+        except Exception as e:
+            logging.debug(f"Not starting the actions speculatively: {e}")
+            return None
+        if not all(getattr(act_cls, "speculative", False) for act_cls, _ in actions):
+            return None
+        return actions
+
+    def discard(self):
+        """Discards the results of the started actions, if any."""
+        if isinstance(self._pending, asyncio.Future):
+            self._pending.cancel()
+        self._pending = self._action = None
+
+    def start(self, action) -> bool:
+        """Starts the actions in a background thread. Returns whether they were started."""
+        self.discard()
+        action = action if isinstance(action, list) else [action]
+        actions = self._get_actions(action)
+        if not actions:
+            return False
+
+        logging.info(
+            f"Speculatively running actions: {[act_cls.__name__ for act_cls, _ in actions]}"
+        )
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = executor.submit(
+            run_actions, actions, self.memory, self.llm, self.concurrent, self.timeout
+        )
+        executor.shutdown(wait=False)
+        self._action = copy.deepcopy(action)
+        return True
+
+    def astart(self, action) -> bool:
+        """Starts the actions in a task of the running loop. Returns whether they were started."""
+        self.discard()
+        action = action if isinstance(action, list) else [action]
+        actions = self._get_actions(action)
+        if not actions:
+            return False
+
+        logging.info(
+            f"Speculatively running actions: {[act_cls.__name__ for act_cls, _ in actions]}"
+        )
+        self._pending = asyncio.ensure_future(
+            arun_actions(actions, self.memory, self.llm, self.concurrent, self.timeout)
+        )
+        self._action = copy.deepcopy(action)
+        return True
+
+    def _take_pending(self, action):
+        pending, started_action = self._pending, self._action
+        self._pending = self._action = None
+        if pending is None:
+            return None
+        if started_action != (action if isinstance(action, list) else [action]):
+            logging.info(
+                "Final action differs from the speculatively started one, discarding its results."
+            )
+            if isinstance(pending, asyncio.Future):
+                pending.cancel()
+            return None
+        return pending
+
+    def take(self, action) -> Optional[List[Any]]:
+        """Returns the results of the started actions if they match the final action."""
+        pending = self._take_pending(action)
+        return pending.result() if pending is not None else None
+
+    async def atake(self, action) -> Optional[List[Any]]:
+        """Async counterpart of `take`."""
+        pending = self._take_pending(action)
+        return await pending if pending is not None else None
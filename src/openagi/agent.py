@@ -1,26 +1,40 @@
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 from enum import Enum
 from textwrap import dedent
-from typing import Any, Dict, List, Optional, Union, Tuple
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, Iterator, List, Optional, Union, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from openagi.actions.base import BaseAction
+from openagi.actions.registry import ActionRegistry
 from openagi.actions.compressor import SummarizerAction
 from openagi.actions.formatter import FormatterAction
 from openagi.actions.obs_rag import MemoryRagAction
-from openagi.actions.utils import run_action
-from openagi.exception import OpenAGIException
-from openagi.llms.azure import LLMBaseModel
+from openagi.actions.utils import arun_action, run_action, run_actions
+from openagi.exception import InvalidActionError, OpenAGIException
+from openagi.llms.base import LLMBaseModel
+from openagi.llms.budget import BudgetedLLM, TokenBudget, fit_prompt
+from openagi.llms.tokens import TokenUsage
 from openagi.memory.memory import Memory
+from openagi.memory.scratchpad import Scratchpad
 from openagi.planner.task_decomposer import BasePlanner, TaskPlanner
 from openagi.prompts.worker_task_execution import WorkerAgentTaskExecution
+from openagi.tasks.graph import TaskGraph
 from openagi.tasks.lists import TaskLists
+from openagi.tasks.task import Task
+from openagi.tracing import close_trace_sink
 from openagi.utils.extraction import (
     find_last_r_failure_content,
     get_act_classes_from_json,
     get_last_json,
 )
 from openagi.utils.helper import get_default_llm
+from openagi.utils.streaming import stream_until_json
 from openagi.utils.tool_list import get_tool_list
 from openagi.worker import Worker
 from openagi.memory.sessiondict import SessionDict
@@ -31,8 +45,25 @@ class OutputFormat(str, Enum):
     markdown = "markdown"
     raw_text = "raw_text"
 
+
+class SessionResult(BaseModel):
+    """Result of one of the queries run by `Admin.run_many`."""
+
+    index: int = Field(description="Position of the query in the given queries.")
+    query: str = Field(description="The query that was run.")
+    session_id: str = Field(description="SessionID of the run.")
+    result: Any = Field(default=None, description="Result of the run, None if it failed.")
+    error: Optional[str] = Field(default=None, description="Error raised by the run, if any.")
+    elapsed: float = Field(description="Time taken by the run, in seconds.")
+
 session = None
 
+TASK_CONTEXT_INSTRUCTIONS = (
+    "Include summary of all the thoughts, but include all the "
+    "relevant points from the observations without missing any."
+)
+
+
 class Admin(BaseModel):
     planner: Optional[BasePlanner] = Field(
         description="Type of planner to use for task decomposition.",
@@ -67,10 +98,78 @@ class Admin(BaseModel):
         default="final_output",
         description="Key to be used to store the output.",
     )
+    max_parallel_tasks: int = Field(
+        default=4,
+        description="Maximum number of independent tasks executed concurrently by the workers.",
+    )
+    compact_action_docs: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the actions are described to the LLM in a compact "
+            "encoding: a line of minified JSON with short keys per action, the "
+            "parameters shared by all of them being described once."
+        ),
+    )
+    parallel_actions: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the actions requested in a "
+            "single LLM response are run concurrently."
+        ),
+    )
+    action_timeout: Optional[float] = Field(
+        default=None,
+        description=(
+            "Maximum number of seconds each action is allowed "
+            "to run. None waits for the action to complete."
+        ),
+    )
+    streaming: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the LLM output is streamed and the generation "
+            "stops as soon as the action or output JSON is complete."
+        ),
+    )
+    scratchpad_token_budget: Optional[int] = Field(
+        default=None,
+        description=(
+            "Token budget of the Thought/Action/Observation history sent to the LLM. Older "
+            "observations are compacted once it is exceeded. None keeps the whole history."
+        ),
+    )
+    max_task_contexts: Optional[int] = Field(
+        default=None,
+        description=(
+            "Number of the most recent task contexts passed as is to the next task. "
+            "Older ones are rolled into a single summary. None passes all of them."
+        ),
+    )
+    token_budget: Optional[TokenBudget] = Field(
+        default=None,
+        description=(
+            "Token and spend budget of each run. The agents compact their history, and "
+            "force their output, before it is exhausted. None does not limit the runs."
+        ),
+    )
 
     input_action: Optional[HumanCLIInput] = Field(default_factory=HumanCLIInput,
                                                description="To get feedback in case long term memory has been enabled")
 
+    # Task contexts keyed by task id and result hash, computed once per completed task.
+    _task_contexts: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    # Rolled summaries of the oldest task contexts, keyed by the task context keys they cover.
+    _rolled_task_contexts: Dict[Tuple[str, ...], str] = PrivateAttr(default_factory=dict)
+    # Task contexts being computed, so that concurrent tasks wait for them instead of computing
+    # them again.
+    _task_contexts_in_flight: Dict[str, Future] = PrivateAttr(default_factory=dict)
+    # Guards the task contexts, which the tasks running concurrently read and write.
+    _task_contexts_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    # Tokens and cost of the last run, when it had a token budget.
+    _run_usage: Optional[TokenUsage] = PrivateAttr(default=None)
+    # Actions of the Admin indexed by class name, see `action_registry`.
+    _registry: Optional[ActionRegistry] = PrivateAttr(default=None)
+
     def model_post_init(self, __context: Any) -> None:
         model = super().model_post_init(__context)
 
@@ -83,6 +182,11 @@ class Admin(BaseModel):
         if not self.memory:
             self.memory = Memory()
 
+        # Workers given to the constructor share the LLM and memory of the Admin, as assigned
+        # ones do.
+        for worker in self.workers:
+            self._attach_worker(worker)
+
         self.actions = self.actions or []
 
         default_actions = [MemoryRagAction]
@@ -98,20 +202,30 @@ class Admin(BaseModel):
                 raise ValueError(f"{act_cls} is not a subclass of BaseAction")
         return act_clss
 
+    def action_registry(self) -> ActionRegistry:
+        """Returns the registry of the actions of the Admin, built again only when they change."""
+        if self._registry is None or self._registry.actions != tuple(self.actions):
+            self._registry = ActionRegistry(self.actions)
+        return self._registry
+
+    def _attach_worker(self, worker: Worker):
+        if not getattr(worker, "llm", False):
+            setattr(worker, "llm", self.llm)
+        if not getattr(worker, "memory", False):
+            setattr(worker, "memory", self.memory)
+
     def assign_workers(self, workers: List[Worker]):
         if workers:
             for worker in workers:
-                if not getattr(worker, "llm", False):
-                    setattr(worker, "llm", self.llm)
-                if not getattr(worker, "memory", False):
-                    setattr(worker, "memory", self.memory)
+                self._attach_worker(worker)
 
         if not self.workers:
             self.workers = workers
         else:
             self.workers.extend(workers)
 
-    def run_planner(self, query: str, description: str, long_term_context: str):
+    def _prepare_planner(self):
+        """Shares the LLM and the workers with the planner, and returns the docs it plans with."""
         if self.planner:
             if not getattr(self.planner, "llm", False):
                 setattr(self.planner, "llm", self.llm)
@@ -119,16 +233,10 @@ class Admin(BaseModel):
             setattr(self.planner, "workers", self.workers)
 
         logging.info("Thinking...")
-        actions_dict: List[BaseAction] = []
-
-        for act in self.actions:
-            actions_dict.append(act.cls_doc())
+        return self._get_planner_docs()
 
-        workers_dict = []
-        for worker in self.workers:
-            workers_dict.append(worker.worker_doc())
-            for action in worker.actions:
-                actions_dict.append(action.cls_doc())
+    def run_planner(self, query: str, description: str, long_term_context: str):
+        actions_dict, workers_dict = self._prepare_planner()
 
         return self.planner.plan(
             query=query,
@@ -138,40 +246,258 @@ class Admin(BaseModel):
             supported_workers=workers_dict,
         )
 
+    async def arun_planner(self, query: str, description: str, long_term_context: str):
+        """Async counterpart of `run_planner`."""
+        actions_dict, workers_dict = self._prepare_planner()
+
+        return await self.planner.aplan(
+            query=query,
+            description=description,
+            long_term_context=long_term_context,
+            supported_actions=actions_dict,
+            supported_workers=workers_dict,
+        )
+
+    def _get_planner_docs(self):
+        # Actions shared by the Admin and the workers are described once.
+        actions = list(self.actions)
+        workers_dict = []
+        for worker in self.workers:
+            workers_dict.append(worker.worker_doc())
+            actions.extend(worker.actions)
+        return ActionRegistry(actions).docs, workers_dict
+
     def _generate_tasks_list(self, planned_tasks):
         task_lists = TaskLists()
         task_lists.add_tasks(tasks=planned_tasks)
         logging.debug(f"Created {task_lists.get_tasks_queue().qsize()} Tasks.")
         return task_lists
 
-    def get_previous_task_contexts(self, task_lists: TaskLists):
-        task_summaries = []
-        logging.info("Retrieving completed task contexts...")
-        t_list = task_lists.completed_tasks.queue
-        for indx, task in enumerate(t_list):
-            memory = run_action(
-                action_cls=MemoryRagAction,
-                task=task,
+    @staticmethod
+    def _task_context_key(task: Task) -> str:
+        result_hash = hashlib.sha256(str(task.result).encode("utf-8")).hexdigest()
+        return f"{task.id}:{result_hash}"
+
+    def _claim_task_contexts(self, tasks: List[Task]) -> Tuple[Dict[str, Task], List[Future]]:
+        """
+        Returns the tasks whose context is not computed yet, by context key, which the caller must
+        compute and store, and the futures of the contexts another caller is already computing.
+        """
+        pending, in_flight = {}, []
+        with self._task_contexts_lock:
+            for task in tasks:
+                key = self._task_context_key(task)
+                if key in self._task_contexts or key in pending:
+                    continue
+                future = self._task_contexts_in_flight.get(key)
+                if future is not None:
+                    in_flight.append(future)
+                else:
+                    pending[key] = task
+                    self._task_contexts_in_flight[key] = Future()
+        return pending, in_flight
+
+    def _release_task_contexts(self, keys: List[str], error: Optional[BaseException] = None):
+        """Wakes up the callers waiting for the given task contexts, once stored or failed."""
+        with self._task_contexts_lock:
+            futures = [self._task_contexts_in_flight.pop(key) for key in keys]
+        for future in futures:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+    def _summary_prompts(self, memories: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Returns the keys of the retrieved task contexts to summarize, and their prompts."""
+        if not self.summarize_task_context:
+            return [], []
+        keys = [key for key, memory in memories.items() if memory]
+        prompts = [
+            SummarizerAction(
+                past_messages=memories[key],
                 llm=self.llm,
                 memory=self.memory,
-                query=task.id,
+                instructions=TASK_CONTEXT_INSTRUCTIONS,
+            ).get_prompt()
+            for key in keys
+        ]
+        if keys:
+            logging.info(f"Summarizing the context of {len(keys)} tasks.")
+        return keys, prompts
+
+    def _store_task_contexts(
+        self, memories: Dict[str, Any], summarized: List[str], summaries: List[Any]
+    ):
+        for key, summary in zip(summarized, summaries):
+            if not summary:
+                raise Exception("No memory returned after summarization.")
+            memories[key] = summary
+        with self._task_contexts_lock:
+            self._task_contexts.update(memories)
+        self._release_task_contexts(list(memories))
+
+    def _stored_task_contexts(self, tasks: List[Task]) -> List[Any]:
+        with self._task_contexts_lock:
+            return [self._task_contexts[self._task_context_key(task)] for task in tasks]
+
+    def _get_task_contexts(self, tasks: List[Task]) -> List[Any]:
+        """
+        Returns the contexts of completed tasks, retrieving and summarizing each only once. The
+        contexts not computed yet are summarized in a single batch of LLM calls.
+        """
+        pending, in_flight = self._claim_task_contexts(tasks)
+        try:
+            memories = {
+                key: run_action(
+                    action_cls=MemoryRagAction,
+                    task=task,
+                    llm=self.llm,
+                    memory=self.memory,
+                    query=task.id,
+                )
+                for key, task in pending.items()
+            }
+            summarized, prompts = self._summary_prompts(memories)
+            self._store_task_contexts(memories, summarized, self.llm.run_batch(prompts))
+        except BaseException as e:
+            self._release_task_contexts(list(pending), e)
+            raise
+        for future in in_flight:
+            future.result()
+        return self._stored_task_contexts(tasks)
+
+    async def _aget_task_contexts(self, tasks: List[Task]) -> List[Any]:
+        """Async counterpart of `_get_task_contexts`."""
+        pending, in_flight = self._claim_task_contexts(tasks)
+        try:
+            retrieved = await asyncio.gather(
+                *[
+                    arun_action(
+                        action_cls=MemoryRagAction,
+                        task=task,
+                        llm=self.llm,
+                        memory=self.memory,
+                        query=task.id,
+                    )
+                    for task in pending.values()
+                ]
             )
-            if memory and self.summarize_task_context:
-                params = {
-                    "past_messages": memory,
-                    "llm": self.llm,
-                    "memory": self.memory,
-                    "instructions": "Include summary of all the thoughts, but include all the relevant points from the observations without missing any.",
-                }
-                memory = run_action(action_cls=SummarizerAction, **params)
-                if not memory:
-                    raise Exception("No memory returned after summarization.")
-            task_summaries.append(f"\n{indx+1}. {task.name} - {task.description}\n{memory}")
-        else:
+            memories = dict(zip(pending, retrieved))
+            summarized, prompts = self._summary_prompts(memories)
+            self._store_task_contexts(memories, summarized, await self.llm.arun_batch(prompts))
+        except BaseException as e:
+            self._release_task_contexts(list(pending), e)
+            raise
+        for future in in_flight:
+            # Shielded, so that a cancelled task does not fail the others waiting for the context.
+            await asyncio.shield(asyncio.wrap_future(future))
+        return self._stored_task_contexts(tasks)
+
+    def _get_rolled_context_start(self, keys: List[str]) -> Tuple[int, Optional[str]]:
+        """Finds the longest prefix of the task context keys that was already rolled up."""
+        with self._task_contexts_lock:
+            for end in range(len(keys), 0, -1):
+                rolled = self._rolled_task_contexts.get(tuple(keys[:end]))
+                if rolled is not None:
+                    return end, rolled
+        return 0, None
+
+    def _store_rolled_task_context(self, keys: List[str], rolled: str):
+        with self._task_contexts_lock:
+            self._rolled_task_contexts[tuple(keys)] = rolled
+
+    def _roll_task_contexts(self, tasks: List[Task], task_summaries: List[str]) -> str:
+        """Folds the oldest task contexts one by one into a single summary, reusing past folds."""
+        keys = [self._task_context_key(task) for task in tasks]
+        start, rolled = self._get_rolled_context_start(keys)
+        for end in range(start + 1, len(keys) + 1):
+            rolled = run_action(
+                action_cls=SummarizerAction,
+                past_messages="\n".join(filter(None, [rolled, task_summaries[end - 1]])),
+                llm=self.llm,
+                memory=self.memory,
+                instructions=TASK_CONTEXT_INSTRUCTIONS,
+            )
+            self._store_rolled_task_context(keys[:end], rolled)
+        return rolled
+
+    async def _aroll_task_contexts(self, tasks: List[Task], task_summaries: List[str]) -> str:
+        """Async counterpart of `_roll_task_contexts`."""
+        keys = [self._task_context_key(task) for task in tasks]
+        start, rolled = self._get_rolled_context_start(keys)
+        for end in range(start + 1, len(keys) + 1):
+            rolled = await arun_action(
+                action_cls=SummarizerAction,
+                past_messages="\n".join(filter(None, [rolled, task_summaries[end - 1]])),
+                llm=self.llm,
+                memory=self.memory,
+                instructions=TASK_CONTEXT_INSTRUCTIONS,
+            )
+            self._store_rolled_task_context(keys[:end], rolled)
+        return rolled
+
+    def _format_task_summaries(self, t_list: List[Task], contexts: List[Any]) -> List[str]:
+        return [
+            f"\n{indx+1}. {task.name} - {task.description}\n{memory}"
+            for indx, (task, memory) in enumerate(zip(t_list, contexts))
+        ]
+
+    def _rolled_task_split(self, task_summaries: List[str]) -> int:
+        """Number of the oldest task contexts to roll into a single summary."""
+        if self.max_task_contexts and len(task_summaries) > self.max_task_contexts:
+            return len(task_summaries) - self.max_task_contexts
+        return 0
+
+    @staticmethod
+    def _join_task_summaries(task_summaries: List[str], split: int, rolled: Optional[str]) -> str:
+        if split:
+            task_summaries = [
+                f"\nSummary of the earlier tasks:\n{rolled}"
+            ] + task_summaries[split:]
+        return "\n".join(task_summaries).strip()
+
+    def get_previous_task_contexts(
+        self, task_lists: TaskLists, tasks: Optional[List[Task]] = None
+    ):
+        """
+        Returns the context of the given tasks, defaulting to all the completed tasks.
+
+        The context of each task is computed once and reused for the following tasks. When
+        `max_task_contexts` is set, the oldest contexts are rolled into a single summary.
+        """
+        logging.info("Retrieving completed task contexts...")
+        t_list = list(task_lists.completed_tasks.queue if tasks is None else tasks)
+        if not t_list:
+            logging.warning("No Tasks to summarize.")
+            return "None"
+
+        task_summaries = self._format_task_summaries(t_list, self._get_task_contexts(t_list))
+        split = self._rolled_task_split(task_summaries)
+        rolled = (
+            self._roll_task_contexts(t_list[:split], task_summaries[:split]) if split else None
+        )
+        return self._join_task_summaries(task_summaries, split, rolled)
+
+    async def aget_previous_task_contexts(
+        self, task_lists: TaskLists, tasks: Optional[List[Task]] = None
+    ):
+        """Async counterpart of `get_previous_task_contexts`."""
+        logging.info("Retrieving completed task contexts...")
+        t_list = list(task_lists.completed_tasks.queue if tasks is None else tasks)
+        if not t_list:
             logging.warning("No Tasks to summarize.")
-        if task_summaries:
-            return "\n".join(task_summaries).strip()
-        return "None"
+            return "None"
+
+        task_summaries = self._format_task_summaries(
+            t_list, await self._aget_task_contexts(t_list)
+        )
+        split = self._rolled_task_split(task_summaries)
+        rolled = (
+            await self._aroll_task_contexts(t_list[:split], task_summaries[:split])
+            if split
+            else None
+        )
+        return self._join_task_summaries(task_summaries, split, rolled)
 
     def _get_worker_by_id(self, worker_id: str):
         for worker in self.workers:
@@ -179,39 +505,152 @@ class Admin(BaseModel):
                 return worker
         raise ValueError(f"Worker with id {worker_id} not found.")
 
+    def _execute_graph_task(self, task_lists: TaskLists, task: Task, upstream: List[Task]):
+        worker = self._get_worker_by_id(task.worker_id)
+        context = self.get_previous_task_contexts(task_lists=task_lists, tasks=upstream)
+        return worker.execute_task(task, context=context)
+
+    def _complete_graph_task(
+        self,
+        task_lists: TaskLists,
+        task_graph: TaskGraph,
+        outputs: Dict[str, Any],
+        cur_task: Task,
+        result,
+    ):
+        output, task = result
+        self.memory.update_task(task)
+        task_lists.add_completed_tasks(task)
+        task_graph.mark_completed(cur_task.id)
+        outputs[cur_task.id] = output
+
     def worker_task_execution(self, query: str, description: str, task_lists: TaskLists):
+        """
+        Executes the planned tasks with their workers. Tasks whose upstream tasks are
+        completed run concurrently, and each task gets only the context of its upstream tasks.
+
+        Args:
+            query (str): The query to be processed.
+            description (str): A description of the task.
+            task_lists (TaskLists): The task lists to be processed.
+
+        Returns:
+            str: The output of the last planned task.
+        """
         res = None
+        task_graph = TaskGraph(task_lists.get_unprocessed_tasks())
+        outputs = {}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_parallel_tasks))
+        try:
+            running = {}
+            while not task_graph.all_tasks_completed:
+                # Tasks are only submitted to free threads, so that none is left queued when
+                # another one fails.
+                for cur_task in task_graph.ready_tasks():
+                    if len(running) >= max(1, self.max_parallel_tasks):
+                        break
+                    task_graph.mark_running(cur_task.id)
+                    future = executor.submit(
+                        self._execute_graph_task,
+                        task_lists,
+                        cur_task,
+                        task_graph.ancestors(cur_task.id),
+                    )
+                    running[future] = cur_task
+
+                if not running:
+                    raise OpenAGIException("No tasks are ready to be executed.")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._complete_graph_task(
+                        task_lists, task_graph, outputs, running.pop(future), future.result()
+                    )
+        finally:
+            # On failure, only the running tasks, which cannot be interrupted, are waited for.
+            executor.shutdown(cancel_futures=True)
+
+        if task_graph.order:
+            res = outputs[task_graph.order[-1]]
 
-        while not task_lists.all_tasks_completed:
-            cur_task = task_lists.get_next_unprocessed_task()
-            worker = self._get_worker_by_id(cur_task.worker_id)
-            res, task = worker.execute_task(
-                cur_task,
-                context=self.get_previous_task_contexts(task_lists=task_lists),
-            )
-            self.memory.update_task(task)
-            task_lists.add_completed_tasks(task)
+        logging.info("Finished Execution...")
+
+        if self.output_format == OutputFormat.markdown and res:
+            logging.info("Output Formatting...")
+            res = self._get_output_formatter(res).execute()
+        logging.debug(f"Execution Completed for Session ID - {self.memory.session_id}")
+        return res
+
+    async def _aexecute_graph_task(self, task_lists: TaskLists, task: Task, upstream: List[Task]):
+        worker = self._get_worker_by_id(task.worker_id)
+        context = await self.aget_previous_task_contexts(task_lists=task_lists, tasks=upstream)
+        return await worker.aexecute_task(task, context=context)
+
+    async def aworker_task_execution(self, query: str, description: str, task_lists: TaskLists):
+        """
+        Async counterpart of `worker_task_execution`. Ready tasks run as concurrent
+        coroutines, bounded by `max_parallel_tasks`.
+        """
+        res = None
+        task_graph = TaskGraph(task_lists.get_unprocessed_tasks())
+        outputs = {}
+
+        running = {}
+        try:
+            while not task_graph.all_tasks_completed:
+                for cur_task in task_graph.ready_tasks():
+                    if len(running) >= max(1, self.max_parallel_tasks):
+                        break
+                    task_graph.mark_running(cur_task.id)
+                    future = asyncio.ensure_future(
+                        self._aexecute_graph_task(
+                            task_lists, cur_task, task_graph.ancestors(cur_task.id)
+                        )
+                    )
+                    running[future] = cur_task
+
+                if not running:
+                    raise OpenAGIException("No tasks are ready to be executed.")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    self._complete_graph_task(
+                        task_lists, task_graph, outputs, running.pop(future), future.result()
+                    )
+        finally:
+            # When a task fails, the other ones are cancelled before the error is raised.
+            for future in running:
+                future.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        if task_graph.order:
+            res = outputs[task_graph.order[-1]]
 
         logging.info("Finished Execution...")
 
         if self.output_format == OutputFormat.markdown and res:
             logging.info("Output Formatting...")
-            output_formatter = FormatterAction(
-                content=res,
-                format_type=OutputFormat.markdown,
-                llm=self.llm,
-                memory=self.memory,
-            )
-            res = output_formatter.execute()
+            res = await self._get_output_formatter(res).aexecute()
         logging.debug(f"Execution Completed for Session ID - {self.memory.session_id}")
         return res
 
+    def _get_output_formatter(self, content) -> FormatterAction:
+        return FormatterAction(
+            content=content,
+            format_type=OutputFormat.markdown,
+            llm=self.llm,
+            memory=self.memory,
+        )
+
     def _provoke_thought_obs(self, observation):
         thoughts = dedent(f"""Observation: {observation}""".strip())
         return thoughts
 
     def _should_continue(self, llm_resp: str) -> Tuple[bool, Optional[Dict]]:
         output: Dict = get_last_json(llm_resp, llm=self.llm, max_iterations=self.max_iterations)
+        if not isinstance(output, dict):
+            output = None
         output_key_exists = bool(output and output.get(self.output_key))
         return (not output_key_exists, output)
 
@@ -251,11 +690,19 @@ class Admin(BaseModel):
             str: JSON of the list of Workers that needs to be executed
         """
 
+        task_lists = self._assign_auto_workers(task_lists)
+
+        if self.workers:
+            return self.worker_task_execution(
+                query=query,
+                description=description,
+                task_lists=task_lists,
+            )
+
+    def _assign_auto_workers(self, task_lists: TaskLists) -> TaskLists:
+        """Creates a Worker for every role in the autonomous plan and assigns it to its tasks."""
         workers = []
-        tools_list = get_tool_list()
-        
-        for action in self.actions:
-            tools_list.append(action)
+        tools = ActionRegistry(get_tool_list() + list(self.actions))
 
         worker_dict = {}
         main_task_list = TaskLists()
@@ -273,7 +720,7 @@ class Admin(BaseModel):
                     instructions=worker_config["instructions"],
                     llm=self.llm,
                     actions=self.get_supported_actions_for_worker(
-                        worker_config["supported_actions"],tools_list
+                        worker_config["supported_actions"], tools
                     ),
                 )
                 worker_dict[worker_config["role"]] = worker_instance
@@ -283,15 +730,14 @@ class Admin(BaseModel):
             cur_task.worker_id = worker_instance.id
             main_task_list.add_task(cur_task)
 
-        task_lists = main_task_list
         self.assign_workers(workers=workers)
+        return main_task_list
 
-        if self.workers:
-            return self.worker_task_execution(
-                query=query,
-                description=description,
-                task_lists=task_lists,
-            )
+    def _run_llm(self, prompt: str) -> str:
+        """Runs the LLM, stopping the generation at the action or output JSON when streaming."""
+        if self.streaming:
+            return stream_until_json(self.llm, prompt, keys=("action", self.output_key))
+        return self.llm.run(prompt)
 
     def single_agent_execution(self, query: str, description: str, task_lists: TaskLists):
         """
@@ -305,9 +751,9 @@ class Admin(BaseModel):
         Returns:
             str: The final result of the task execution.
         """
-        all_thoughts_and_obs = []
         output = None
         previous_task_context = None
+        tokens_saved = 0
 
         while not task_lists.all_tasks_completed:
             iteration = 1
@@ -315,6 +761,8 @@ class Admin(BaseModel):
 
             cur_task = task_lists.get_next_unprocessed_task()
             logging.info(f"**** Executing Task - {cur_task.name} [{cur_task.id}] ****")
+            # Each task has its own history, pinned to its base prompt.
+            all_thoughts_and_obs = Scratchpad(token_budget=self.scratchpad_token_budget, pinned=1)
 
             task_to_execute = f"{cur_task.name}. {cur_task.description}"
             agent_description = "Task executor"
@@ -325,7 +773,7 @@ class Admin(BaseModel):
             te_vars = dict(
                 task_to_execute=task_to_execute,
                 worker_description=agent_description,
-                supported_actions=[action.cls_doc() for action in self.actions],
+                supported_actions=self.action_registry().encode(compact=self.compact_action_docs),
                 thought_provokes=initial_thought_provokes,
                 output_key=self.output_key,
                 context=previous_task_context,
@@ -337,7 +785,7 @@ class Admin(BaseModel):
             prompt = f"{base_prompt}\nThought:\nIteration: {iteration}\nActions:\n"
 
             logging.debug("Running LLM with prompt...")
-            observations = self.llm.run(prompt)
+            observations = self._run_llm(prompt)
             logging.info(f"LLM execution completed. Observations: {observations}")
             all_thoughts_and_obs.append(prompt)
 
@@ -349,7 +797,8 @@ class Admin(BaseModel):
                     logging.info(f"Task completed. Output: {output}")
                     break
 
-                resp_json = get_last_json(observations)
+                # Already parsed by `_should_continue`.
+                resp_json = output
 
                 output = resp_json.get(self.output_key) if resp_json else None
                 if output:
@@ -368,23 +817,39 @@ class Admin(BaseModel):
                     all_thoughts_and_obs.append(observations)
                     iteration += 1
                 elif action_json:
-                    actions = get_act_classes_from_json(action_json)
-
-                    for act_cls, params in actions:
+                    try:
+                        actions = get_act_classes_from_json(action_json, self.action_registry())
+                    except InvalidActionError as e:
+                        # Reported to the LLM as the observation, without running anything.
+                        logging.warning(f"Invalid action requested: {e}")
+                        observations = f"{e} Use one of the supported actions."
+                        all_thoughts_and_obs.append(f"Observation: {observations}\n")
+                        actions = []
+                    for _, params in actions:
                         params["previous_action"] = None  # Modify as needed
-                        params["llm"] = self.llm
-                        params["memory"] = self.memory
-                        try:
-                            logging.debug(f"Running action: {act_cls.__name__}...")
-                            res = run_action(action_cls=act_cls, **params)
-                            logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
-                        except Exception as e:
-                            logging.error(f"Error running action: {e}")
-                            observations = f"Action: {action_json}\n{observations}. {e} Try to fix the error and try again. Ignore if already tried more than twice"
+
+                    logging.debug(
+                        f"Running actions: {[act_cls.__name__ for act_cls, _ in actions]}..."
+                    )
+                    results = run_actions(
+                        actions,
+                        memory=self.memory,
+                        llm=self.llm,
+                        concurrent=self.parallel_actions,
+                        timeout=self.action_timeout,
+                    )
+                    for (act_cls, _), res in zip(actions, results):
+                        if isinstance(res, Exception):
+                            logging.error(f"Error running action: {res}")
+                            observations = (
+                                f"Action: {action_json}\n{observations}. {res} Try to fix the "
+                                "error and try again. Ignore if already tried more than twice"
+                            )
                             all_thoughts_and_obs.append(observations)
                             iteration += 1
                             continue
 
+                        logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
                         observation_prompt = f"Observation: {res}\n"
                         all_thoughts_and_obs.append(observation_prompt)
                         observations = res
@@ -393,10 +858,23 @@ class Admin(BaseModel):
                     thought_prompt = self._provoke_thought_obs(observations)
                     all_thoughts_and_obs.append(f"\n{thought_prompt}\nActions:\n")
 
-                    prompt = f"{base_prompt}\n" + "\n".join(all_thoughts_and_obs)
+                    # The first entry already holds the base prompt.
+                    fits, prompt = fit_prompt(
+                        self.llm, lambda: "\n".join(all_thoughts_and_obs), all_thoughts_and_obs
+                    )
+                    if not fits:
+                        logging.warning(
+                            "Token budget nearly exhausted, forcing "
+                            f"the output of task {cur_task.name}"
+                        )
+                        _, output = self._force_output(observations, all_thoughts_and_obs)
+                        cur_task.result = output
+                        cur_task.actions = te_vars["supported_actions"]
+                        self.memory.update_task(cur_task)
+                        break
                     logging.debug(f"\nSTART:{'*' * 20}\n{prompt}\n{'*' * 20}:END")
                     logging.debug("Running LLM with updated prompt...")
-                    observations = self.llm.run(prompt)
+                    observations = self._run_llm(prompt)
                     iteration += 1
             else:
                 if iteration == max_iterations:
@@ -412,10 +890,13 @@ class Admin(BaseModel):
                     self.memory.update_task(cur_task)
                     task_lists.add_completed_tasks(cur_task)
 
+            tokens_saved += all_thoughts_and_obs.tokens_saved
             previous_task_context = self.get_previous_task_contexts(task_lists)
             task_lists.add_completed_tasks(cur_task)
 
         logging.info("Finished Execution...")
+        if tokens_saved:
+            logging.info(f"Scratchpad compaction saved {tokens_saved} prompt tokens")
 
         if self.output_format == OutputFormat.markdown:
             logging.info("Output Formatting...")
@@ -431,52 +912,148 @@ class Admin(BaseModel):
         return output
 
 
-    def run(self, query: str, description: str,planned_tasks: Optional[List[Dict]] = None):
+    def _retrieve_ltm(self, query: str) -> Tuple[Optional[str], List[str], Optional[SessionDict]]:
+        """
+        Retrieves similar sessions from long term memory.
+
+        Returns:
+            Tuple[Optional[str], List[str], Optional[SessionDict]]: The answer of a very similar
+            session without negative feedback if any, the long term context for the planner and
+            the similar session that received negative feedback.
+        """
+        logging.info("Retrieving similar queries from long term memory...")
+        similar_sessions = self.memory.get_ltm(query)
+        ltm = []
+        bad_session = None
+        for memory in similar_sessions:
+            metadata = memory["metadata"]
+            if memory["similarity_score"] >= self.memory.ltm_threshold:
+                if metadata["ans_feedback"]=='' and metadata["plan_feedback"]=='':
+                    logging.info(
+                        "Found a very similar query (similarity = "
+                        f"{memory['similarity_score']} in long term memory "
+                        "without negative feedback, returning answer directly"
+                    )
+                    result = memory["document"]
+                    # ask for feedback here and UPDATE the response
+                    # write for case when threshold is crossed but negative feedback
+                    session = SessionDict.from_dict(metadata)
+                    self.save_ltm("update", session)
+                    return result, ltm, bad_session
+                else:
+                    ltm.append(LTMFormatPrompt().base_prompt.format(**metadata))
+                    bad_session = SessionDict.from_dict(metadata)
+                    break
+            # ltm.append(LTMFormatPrompt().base_prompt.format(**metadata))
+            # the above is commented because i think it is better to have a threshold on what gets
+            # retrieved instead of relying on top k. This way we only retrieve one session though,
+            # but it should be a good session.
+        return None, ltm, bad_session
+
+    def _save_run_ltm(
+        self,
+        query: str,
+        description: str,
+        planned_tasks: List[Dict],
+        result: Any,
+        bad_session: Optional[SessionDict],
+    ):
+        # Human feedback part
+        if bad_session:
+            bad_session.plan = str(planned_tasks)
+            bad_session.answer =  result
+            self.save_ltm("update", bad_session)
+        else:
+            session = SessionDict(
+                query=query,
+                description=description,
+                plan=str(planned_tasks),
+                session_id=self.memory.session_id,
+                answer=result
+            )
+            self.save_ltm("add", session)
+
+    @property
+    def run_usage(self) -> Optional[TokenUsage]:
+        """Tokens and cost of the last run, when the Admin has a `token_budget`."""
+        return self._run_usage
+
+    @contextmanager
+    def _run_budget(self):
+        """
+        Yields the Admin carrying out a run. With a `token_budget`, it is a copy of this Admin
+        whose LLM, and those of the planner and the workers, account all the LLM calls of the run,
+        actions included, against a fresh copy of the budget. This Admin is left untouched, so
+        that each run, concurrent ones included, has its own budget.
+        """
+        if self.token_budget is None:
+            yield self
+            return
+
+        budget = self.token_budget.new_run()
+        budgeted = {}
+
+        def with_budget(llm: Optional[LLMBaseModel]) -> Optional[LLMBaseModel]:
+            if llm is None:
+                return None
+            if id(llm) not in budgeted:
+                budgeted[id(llm)] = BudgetedLLM(wrapped=llm, budget=budget)
+            return budgeted[id(llm)]
+
+        workers = [
+            worker.model_copy(update={"llm": with_budget(worker.llm)}) for worker in self.workers
+        ]
+        planner = self.planner.model_copy(
+            update={"llm": with_budget(getattr(self.planner, "llm", None)), "workers": workers}
+        )
+        runner = self.model_copy(
+            update={"llm": with_budget(self.llm), "planner": planner, "workers": workers}
+        )
+        try:
+            yield runner
+        finally:
+            self._run_usage = budget.usage
+            logging.info(
+                f"Run used {self._run_usage.prompt_tokens} prompt tokens and "
+                f"{self._run_usage.completion_tokens} completion tokens in "
+                f"{self._run_usage.calls} LLM calls, cost {self._run_usage.cost:.4f}"
+            )
+
+    def run(self, query: str, description: str, planned_tasks: Optional[List[Dict]] = None):
+        with self._run_budget() as runner:
+            return runner._run(query, description, planned_tasks)
+
+    def _start_run(self, planned_tasks: Optional[List[Dict]]):
         logging.info("Running Admin Agent...")
         logging.info(f"SessionID - {self.memory.session_id}")
 
         if self.memory.long_term and planned_tasks:
             logging.warning("Long Term Memory is not applicable for user given plan.")
 
+    def _plan_task_lists(self, planned_tasks: List[Dict]) -> TaskLists:
+        logging.info("Tasks Planned...")
+        logging.debug(f"{planned_tasks=}")
+
+        task_lists: TaskLists = self._generate_tasks_list(planned_tasks=planned_tasks)
+
+        self.memory.save_planned_tasks(tasks=list(task_lists.tasks.queue))
+        return task_lists
+
+    def _run(self, query: str, description: str,planned_tasks: Optional[List[Dict]] = None):
+        self._start_run(planned_tasks)
+
         ltm = ["None"]
-        bad_feedback = False
         bad_session = None
         if self.memory.long_term and not planned_tasks:
-            logging.info("Retrieving similar queries from long term memory...")
-            similar_sessions = self.memory.get_ltm(query)
-            ltm = []
-            for memory in similar_sessions:
-                metadata = memory["metadata"]
-                if memory["similarity_score"] >= self.memory.ltm_threshold:
-                    if metadata["ans_feedback"]=='' and metadata["plan_feedback"]=='':
-                        logging.info(f"Found a very similar query (similarity = {memory['similarity_score']} in long term memory without negative feedback, returning answer directly")
-                        result = memory["document"]
-                        # ask for feedback here and UPDATE the response
-                        # write for case when threshold is crossed but negative feedback
-                        session = SessionDict.from_dict(metadata)
-                        self.save_ltm("update", session)
-                        return result
-                    else:
-                        ltm.append(LTMFormatPrompt().base_prompt.format(**metadata))
-                        bad_feedback = True
-                        bad_session = SessionDict.from_dict(metadata)
-                        break
-                # ltm.append(LTMFormatPrompt().base_prompt.format(**metadata))
-                # the above is commented because i think it is better to have a threshold on what gets retrieved
-                # instead of relying on top k. This way we only retrieve one session though, but it should be a
-                # good session.
+            result, ltm, bad_session = self._retrieve_ltm(query)
+            if result is not None:
+                return result
 
         old_context = "\n\n".join(ltm)
         if not planned_tasks:
             planned_tasks = self.run_planner(query=query, description=description, long_term_context=old_context)
 
-
-        logging.info("Tasks Planned...")
-        logging.debug(f"{planned_tasks=}")
-
-        task_lists: TaskLists = self._generate_tasks_list(planned_tasks=planned_tasks)
-
-        self.memory.save_planned_tasks(tasks=list(task_lists.tasks.queue))
+        task_lists = self._plan_task_lists(planned_tasks)
 
         if self.planner.autonomous:
             result = self.auto_workers_assignment(
@@ -493,45 +1070,184 @@ class Admin(BaseModel):
                 result = self.single_agent_execution(
                     query=query, description=description, task_lists=task_lists
                 )
-        # Human feedback part
         if self.memory.long_term:
-            if bad_feedback:
-                bad_session.plan = str(planned_tasks)
-                bad_session.answer =  result
-                self.save_ltm("update", bad_session)
-            else:
-                session = SessionDict(
-                    query=query,
-                    description=description,
-                    plan=str(planned_tasks),
-                    session_id=self.memory.session_id,
-                    answer=result
-                )
-                self.save_ltm("add", session)
+            self._save_run_ltm(query, description, planned_tasks, result, bad_session)
+        close_trace_sink(self.memory.session_id)
+        return result
+
+    async def arun(
+        self, query: str, description: str, planned_tasks: Optional[List[Dict]] = None
+    ):
+        """
+        Async counterpart of `run`, so that many sessions can be driven from one event loop.
+
+        Planning and the worker execution await the LLM and the actions. Long term memory,
+        which waits for human feedback, and the single agent execution run in a worker thread.
+        """
+        with self._run_budget() as runner:
+            return await runner._arun(query, description, planned_tasks)
+
+    async def _arun(
+        self, query: str, description: str, planned_tasks: Optional[List[Dict]] = None
+    ):
+        self._start_run(planned_tasks)
+
+        ltm = ["None"]
+        bad_session = None
+        if self.memory.long_term and not planned_tasks:
+            result, ltm, bad_session = await asyncio.to_thread(self._retrieve_ltm, query)
+            if result is not None:
+                return result
+
+        old_context = "\n\n".join(ltm)
+        if not planned_tasks:
+            planned_tasks = await self.arun_planner(
+                query=query, description=description, long_term_context=old_context
+            )
+
+        task_lists = self._plan_task_lists(planned_tasks)
+
+        if self.planner.autonomous:
+            task_lists = self._assign_auto_workers(task_lists)
+
+        if self.workers:
+            result = await self.aworker_task_execution(
+                query=query,
+                description=description,
+                task_lists=task_lists,
+            )
+        elif self.planner.autonomous:
+            result = None
+        else:
+            result = await asyncio.to_thread(
+                self.single_agent_execution,
+                query=query,
+                description=description,
+                task_lists=task_lists,
+            )
+        if self.memory.long_term:
+            await asyncio.to_thread(
+                self._save_run_ltm, query, description, planned_tasks, result, bad_session
+            )
+        close_trace_sink(self.memory.session_id)
         return result
 
+    def new_session(self) -> "Admin":
+        """
+        Returns a copy of the Admin for a new session.
+
+        The LLM, the actions and the storage clients are shared with this Admin, while the
+        memory, the planner, the workers and the cached task contexts belong to the new session.
+        """
+        memory = self.memory.new_session()
+        workers = [
+            worker.new_session(
+                memory if not worker.memory or worker.memory is self.memory else worker.memory
+            )
+            for worker in self.workers
+        ]
+        session = self.model_copy(
+            update={
+                "memory": memory,
+                "workers": workers,
+                "actions": list(self.actions),
+                "planner": self.planner.model_copy(update={"workers": workers}),
+            }
+        )
+        session._task_contexts = {}
+        session._rolled_task_contexts = {}
+        session._task_contexts_in_flight = {}
+        session._task_contexts_lock = threading.Lock()
+        return session
+
+    def run_many(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        description: str = "",
+        concurrency: int = 4,
+    ) -> Iterator[SessionResult]:
+        """
+        Runs many queries, each in its own session, with at most `concurrency` of them at a time.
+
+        Args:
+            queries (List[Union[str, Dict[str, Any]]]): The queries to run. A query can also be
+                given as a dict with the `query`, `description` and `planned_tasks` arguments of
+                `run`.
+            description (str): The description used for the queries given as strings.
+            concurrency (int): Maximum number of sessions running at the same time.
+
+        Yields:
+            SessionResult: The result of each query, as soon as it completes.
+        """
+        if self.memory.long_term and concurrency > 1:
+            logging.warning(
+                "Long Term Memory asks for feedback on the CLI, "
+                "which is not suited to concurrent sessions."
+            )
+
+        def _run(indx: int, kwargs: Dict[str, Any]) -> SessionResult:
+            session = self.new_session()
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = session.run(**kwargs)
+            except Exception as e:
+                logging.error(f"Session {session.memory.session_id} failed: {e}")
+                error = str(e)
+            return SessionResult(
+                index=indx,
+                query=kwargs["query"],
+                session_id=session.memory.session_id,
+                result=result,
+                error=error,
+                elapsed=time.perf_counter() - start,
+            )
+
+        start = time.perf_counter()
+        completed = failed = 0
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        try:
+            futures = []
+            for indx, query in enumerate(queries):
+                kwargs = dict(query) if isinstance(query, dict) else {"query": query}
+                kwargs.setdefault("description", description)
+                futures.append(executor.submit(_run, indx, kwargs))
+
+            for future in as_completed(futures):
+                session_result = future.result()
+                completed += 1
+                failed += session_result.error is not None
+                yield session_result
+        finally:
+            # Closing the generator early cancels the queries that have not started yet.
+            executor.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - start
+        logging.info(
+            f"Completed {completed} queries ({failed} failed) in {elapsed:.2f}s with "
+            f"concurrency {concurrency}: {completed / elapsed if elapsed else 0:.2f} queries/s"
+        )
+
     def _can_task_execute(self, llm_resp: str) -> Union[bool, Optional[str]]:
         content: str = find_last_r_failure_content(text=llm_resp)
         if content:
             return False, content
         return True, content
 
-    def get_supported_actions_for_worker(self, actions_list: List[str],tool_list: List[str]):
+    def get_supported_actions_for_worker(
+        self, actions_list: List[str], tool_list: Union[ActionRegistry, List[type]]
+    ):
         """
         This function takes a list of action names (strings) and returns a list of class objects
         from the modules within the 'tools' folder that match these action names and inherit from BaseAction.
 
         :param actions_list: List of action names as strings.
+        :param tool_list: Registry of the available actions, or a list of action classes.
         :return: List of matching class objects.
         """
-        matching_classes = []
-        #tool_list = get_tool_list()
-        # Iterate through all modules in the tools package
-        for action in tool_list:
-            if action.__name__ in actions_list:
-                matching_classes.append(action)
-
-        return matching_classes
+        if not isinstance(tool_list, ActionRegistry):
+            tool_list = ActionRegistry(tool_list)
+        return tool_list.select(actions_list)
 
     def save_ltm(self, action_type: str, session: SessionDict):
         """
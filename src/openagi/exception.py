@@ -8,3 +8,11 @@ class ExecutionFailureException(Exception):
 
 class LLMResponseError(OpenAGIException):
     """No useful Response found"""
+
+
+class TokenBudgetExceeded(OpenAGIException):
+    """The token or spend budget of the run is exhausted"""
+
+
+class InvalidActionError(OpenAGIException):
+    """The LLM requested an action that is not registered or is malformed"""
@@ -1,8 +1,10 @@
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from langchain_openai import AzureChatOpenAI  # Assuming this import is correct
 
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client, openai_http_clients
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
 
 
@@ -22,16 +24,20 @@ class AzureChatOpenAIModel(LLMBaseModel):
     This class implements the specific logic required to work with Azure's OpenAI service.
     """
 
+    supports_messages: ClassVar[bool] = True
+    supports_tools: ClassVar[bool] = binds_tools(AzureChatOpenAI)
     config: Any
 
     def load(self):
         """Initializes the AzureChatOpenAI instance with configurations."""
-        self.llm = AzureChatOpenAI(
+        self.llm = get_shared_client(
+            AzureChatOpenAI,
             azure_deployment=self.config.deployment_name,
             model_name=self.config.model_name,
             openai_api_version=self.config.openai_api_version,
             openai_api_key=self.config.api_key,
             azure_endpoint=self.config.base_url,
+            **openai_http_clients(AzureChatOpenAI),
         )
         return self.llm
 
@@ -48,10 +54,40 @@ class AzureChatOpenAIModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Azure Chat OpenAI model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the Azure Chat OpenAI model to the input, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Azure Chat OpenAI model to the input."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> AzureChatConfigModel:
         """Loads the AzureChatOpenAI configurations from a YAML file.
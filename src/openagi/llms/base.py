@@ -1,8 +1,14 @@
+import asyncio
 from abc import abstractmethod
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, ClassVar, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from pydantic import BaseModel
 
+from openagi.llms.messages import Message, messages_to_text, to_langchain_messages, to_messages
+from openagi.llms.tokens import TokenUsage, get_tokenizer
+from openagi.llms.tools import Tool, ToolResponse, to_tool_response
+
 
 class LLMConfigModel(BaseModel):
     """Base configuration model for all LLMs.
@@ -27,6 +33,19 @@ class LLMBaseModel(BaseModel):
     config: Any
     llm: Any = None
 
+    # Whether `run` and `stream` also accept a list of role-tagged messages, see
+    # `openagi.llms.messages`.
+    supports_messages: ClassVar[bool] = False
+
+    # Whether `run_tools` gets structured tool calls from the provider, see `openagi.llms.tools`.
+    supports_tools: ClassVar[bool] = False
+
+    # Default number of calls of `run_batch` and `arun_batch` in flight at once.
+    batch_concurrency: ClassVar[int] = 8
+
+    # Config fields holding credentials, left out of `identity`.
+    secret_fields: ClassVar[Tuple[str, ...]] = ("api_key", "api_token", "secret", "password")
+
     @abstractmethod
     def load(self):
         """Initializes the LLM instance with configurations."""
@@ -44,6 +63,210 @@ class LLMBaseModel(BaseModel):
         """
         pass
 
+    def messages_input(self, messages: List[Message]) -> Any:
+        """
+        Returns role-tagged messages as the LLM accepts them: as is if it supports messages,
+        flattened into a prompt otherwise.
+        """
+        messages = to_messages(messages)
+        return messages if self.supports_messages else messages_to_text(messages)
+
+    def run_messages(self, messages: List[Message]):
+        """Runs the LLM on a conversation of role-tagged messages, e.g. the turns of an agent.
+
+        Chat models get the messages natively, so that providers caching prompt prefixes only
+        process the new turns. Other models get them flattened into a single prompt.
+
+        Args:
+            messages: The messages, with the `system`, `user` and `assistant` roles.
+
+        Returns:
+            The response to the last message.
+        """
+        return self.run(self.messages_input(messages))
+
+    async def arun_messages(self, messages: List[Message]):
+        """Async counterpart of `run_messages`."""
+        return await self.arun(self.messages_input(messages))
+
+    def run_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        """Runs the LLM on a conversation with tools it can call, returning the calls as data.
+
+        The default implementation binds the tools to the langchain chat model of the provider,
+        for the subclasses setting `supports_tools`.
+
+        Args:
+            messages: The messages, with the `system`, `user` and `assistant` roles.
+            tools: The tools, as function schemas in the OpenAI format.
+
+        Returns:
+            The text of the response and the tool calls requested by the LLM.
+        """
+        if not self.supports_tools:
+            raise NotImplementedError(f"{self.__class__.__name__} does not support tool calling.")
+        if not self.llm:
+            self.load()
+        response = self.llm.bind_tools(tools).invoke(to_langchain_messages(messages))
+        return to_tool_response(response)
+
+    async def arun_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        """Async counterpart of `run_tools`."""
+        if not self.supports_tools:
+            raise NotImplementedError(f"{self.__class__.__name__} does not support tool calling.")
+        if not self.llm:
+            self.load()
+        response = await self.llm.bind_tools(tools).ainvoke(to_langchain_messages(messages))
+        return to_tool_response(response)
+
+    async def arun(self, input_data: Any):
+        """Interacts with the LLM service asynchronously using the provided input.
+
+        Subclasses with an async client should override this. By default `run` is
+        executed in a worker thread so that the event loop is not blocked.
+
+        Args:
+            input_data: The input to process by the LLM. The format can vary.
+
+        Returns:
+            The result from processing the input data through the LLM.
+        """
+        return await asyncio.to_thread(self.run, input_data)
+
+    def stream(self, input_data: Any) -> Iterator[str]:
+        """Streams the response of the LLM service to the provided input, chunk by chunk.
+
+        Subclasses with a streaming client should override this. By default the complete
+        response of `run` is yielded as a single chunk. The consumer may stop iterating
+        early, in which case the generation is cancelled when the provider supports it.
+
+        Args:
+            input_data: The input to process by the LLM. The format can vary.
+
+        Yields:
+            The chunks of text of the response.
+        """
+        yield self.run(input_data)
+
+    async def astream(self, input_data: Any) -> AsyncIterator[str]:
+        """Streams the response of the LLM service asynchronously, chunk by chunk.
+
+        By default the complete response of `arun` is yielded as a single chunk.
+
+        Args:
+            input_data: The input to process by the LLM. The format can vary.
+
+        Yields:
+            The chunks of text of the response.
+        """
+        yield await self.arun(input_data)
+
+    def run_batch(
+        self,
+        inputs: Sequence[Any],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Runs the LLM on independent inputs at once, returning the responses in the same order.
+
+        Subclasses with a native batch endpoint can override this. By default the calls go through
+        `run`, so that the middlewares apply to each of them, and up to `max_concurrency` of them
+        are in flight at once.
+
+        Args:
+            inputs: The inputs to process by the LLM.
+            max_concurrency: Maximum number of calls in flight. Defaults to `batch_concurrency`.
+            return_exceptions: If True, a failed call is given the raised exception as its
+                response instead of the exception being raised.
+
+        Returns:
+            The responses to the inputs, in the same order.
+        """
+        inputs = list(inputs)
+        if not inputs:
+            return []
+
+        def call(input_data):
+            try:
+                return self.run(input_data)
+            except Exception as exc:
+                if return_exceptions:
+                    return exc
+                raise
+
+        if len(inputs) == 1:
+            return [call(inputs[0])]
+        workers = min(len(inputs), max_concurrency or self.batch_concurrency)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return list(executor.map(call, inputs))
+
+    async def arun_batch(
+        self,
+        inputs: Sequence[Any],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Async counterpart of `run_batch`, with up to `max_concurrency` `arun` calls at once."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.batch_concurrency))
+
+        async def call(input_data):
+            async with semaphore:
+                return await self.arun(input_data)
+
+        return await asyncio.gather(
+            *[call(input_data) for input_data in inputs], return_exceptions=return_exceptions
+        )
+
+    def count_tokens(self, input_data: Any) -> int:
+        """Counts the tokens of a prompt, a list of messages or a response, as the provider does.
+
+        The tokenizer is exact for the OpenAI models when `tiktoken` is installed and a fast local
+        approximation otherwise.
+        """
+        return get_tokenizer(self).count_input(input_data)
+
+    def run_with_usage(self, input_data: Any) -> Tuple[Any, TokenUsage]:
+        """Runs the LLM, returning the response along with the tokens of the call.
+
+        Args:
+            input_data: The input to process by the LLM. The format can vary.
+
+        Returns:
+            The response and the prompt and completion tokens of the call.
+        """
+        response = self.run(input_data)
+        usage = TokenUsage(
+            prompt_tokens=self.count_tokens(input_data),
+            completion_tokens=self.count_tokens(response),
+            calls=1,
+        )
+        return response, usage
+
+    async def arun_with_usage(self, input_data: Any) -> Tuple[Any, TokenUsage]:
+        """Async counterpart of `run_with_usage`."""
+        response = await self.arun(input_data)
+        usage = TokenUsage(
+            prompt_tokens=self.count_tokens(input_data),
+            completion_tokens=self.count_tokens(response),
+            calls=1,
+        )
+        return response, usage
+
+    def identity(self) -> Dict[str, Any]:
+        """Identifies the provider, model and parameters of the LLM, leaving out the credentials.
+
+        Returns:
+            A JSON serializable dict, suitable to tell apart the responses of different LLMs.
+        """
+        config = self.config.model_dump() if isinstance(self.config, BaseModel) else {}
+        return {
+            "provider": self.__class__.__name__,
+            "config": {
+                name: value
+                for name, value in config.items()
+                if not any(secret in name.lower() for secret in self.secret_fields)
+            },
+        }
+
     @staticmethod
     @abstractmethod
     def load_from_env_config():
@@ -0,0 +1,239 @@
+import logging
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from openagi.exception import TokenBudgetExceeded
+from openagi.llms.messages import Message
+from openagi.llms.middleware import LLMMiddleware
+from openagi.llms.tokens import TokenUsage
+from openagi.llms.tools import Tool, ToolResponse
+
+# Completion tokens assumed for a call until the first calls of the run are measured.
+DEFAULT_COMPLETION_TOKENS = 256
+
+
+class TokenBudget(BaseModel):
+    """Token and spend budget of a run, shared by all its LLM calls.
+
+    Prices are given per million tokens, in the currency of `max_cost`. Limits left to None are
+    not enforced, and the usage is tracked either way.
+
+    Example:
+        budget = TokenBudget(
+            max_prompt_tokens=500000,
+            max_cost=1.0,
+            prompt_token_price=2.5,
+            completion_token_price=10,
+        )
+    """
+
+    max_prompt_tokens: Optional[int] = Field(
+        default=None, description="Maximum number of prompt tokens."
+    )
+    max_completion_tokens: Optional[int] = Field(
+        default=None, description="Maximum number of completion tokens."
+    )
+    max_cost: Optional[float] = Field(default=None, description="Maximum spend.")
+    prompt_token_price: float = Field(
+        default=0.0, description="Price of a million prompt tokens."
+    )
+    completion_token_price: float = Field(
+        default=0.0, description="Price of a million completion tokens."
+    )
+
+    _usage: TokenUsage = PrivateAttr(default_factory=TokenUsage)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def new_run(self) -> "TokenBudget":
+        """Returns a budget with the same limits and no usage, for a new run."""
+        return TokenBudget(**self.model_dump())
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (
+            prompt_tokens * self.prompt_token_price
+            + completion_tokens * self.completion_token_price
+        ) / 1e6
+
+    def record(self, prompt_tokens: int, completion_tokens: int) -> TokenUsage:
+        """Adds the tokens of a call to the usage of the run, returning the usage of the call."""
+        usage = TokenUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=self.cost(prompt_tokens, completion_tokens),
+            calls=1,
+        )
+        with self._lock:
+            self._usage = self._usage + usage
+        return usage
+
+    @property
+    def usage(self) -> TokenUsage:
+        with self._lock:
+            return self._usage.model_copy()
+
+    @property
+    def remaining_prompt_tokens(self) -> Optional[int]:
+        if self.max_prompt_tokens is None:
+            return None
+        return max(0, self.max_prompt_tokens - self.usage.prompt_tokens)
+
+    @property
+    def exceeded(self) -> bool:
+        """Whether one of the limits is reached."""
+        usage = self.usage
+        return (
+            (self.max_prompt_tokens is not None and usage.prompt_tokens >= self.max_prompt_tokens)
+            or (
+                self.max_completion_tokens is not None
+                and usage.completion_tokens >= self.max_completion_tokens
+            )
+            or (self.max_cost is not None and usage.cost >= self.max_cost)
+        )
+
+    def _completion_estimate(self, usage: TokenUsage) -> float:
+        return usage.completion_tokens / usage.calls if usage.calls else DEFAULT_COMPLETION_TOKENS
+
+    def fits(self, prompt_tokens: int, calls: int = 1) -> bool:
+        """
+        Whether `calls` more calls sending `prompt_tokens` in total fit in the budget, their
+        completion tokens being estimated from the average of the calls so far.
+        """
+        usage = self.usage
+        completion_tokens = calls * self._completion_estimate(usage)
+        if (
+            self.max_prompt_tokens is not None
+            and usage.prompt_tokens + prompt_tokens > self.max_prompt_tokens
+        ):
+            return False
+        if (
+            self.max_completion_tokens is not None
+            and usage.completion_tokens + completion_tokens > self.max_completion_tokens
+        ):
+            return False
+        if (
+            self.max_cost is not None
+            and usage.cost + self.cost(prompt_tokens, completion_tokens) > self.max_cost
+        ):
+            return False
+        return True
+
+    def check(self):
+        """Raises `TokenBudgetExceeded` if the budget is exhausted."""
+        if self.exceeded:
+            usage = self.usage
+            raise TokenBudgetExceeded(
+                f"Token budget exhausted after {usage.calls} LLM calls: "
+                f"{usage.prompt_tokens} prompt tokens, {usage.completion_tokens} "
+                f"completion tokens, cost {usage.cost:.4f}."
+            )
+
+
+class BudgetedLLM(LLMMiddleware):
+    """LLM middleware accounting the tokens of each call against a `TokenBudget`.
+
+    Calls are refused with `TokenBudgetExceeded` once the budget is exhausted. The agents check
+    the budget before each iteration, compacting their history or forcing their output so that
+    this is not reached.
+    """
+
+    budget: TokenBudget = Field(
+        default_factory=TokenBudget, description="Budget the calls are accounted against."
+    )
+
+    def _record(self, input_data: Any, response: Any) -> TokenUsage:
+        return self.budget.record(self.count_tokens(input_data), self.count_tokens(response))
+
+    def run_with_usage(self, input_data: Any) -> Tuple[Any, TokenUsage]:
+        self.budget.check()
+        response = self.wrapped.run(input_data)
+        return response, self._record(input_data, response)
+
+    async def arun_with_usage(self, input_data: Any) -> Tuple[Any, TokenUsage]:
+        self.budget.check()
+        response = await self.wrapped.arun(input_data)
+        return response, self._record(input_data, response)
+
+    def run(self, input_data: Any):
+        return self.run_with_usage(input_data)[0]
+
+    def run_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        self.budget.check()
+        response = self.wrapped.run_tools(messages, tools)
+        self._record(messages, response)
+        return response
+
+    async def arun_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        self.budget.check()
+        response = await self.wrapped.arun_tools(messages, tools)
+        self._record(messages, response)
+        return response
+
+    async def arun(self, input_data: Any):
+        return (await self.arun_with_usage(input_data))[0]
+
+    def stream(self, input_data: Any):
+        self.budget.check()
+        chunks = []
+        try:
+            for chunk in self.wrapped.stream(input_data):
+                chunks.append(chunk or "")
+                yield chunk
+        finally:
+            self._record(input_data, "".join(chunks))
+
+    async def astream(self, input_data: Any):
+        self.budget.check()
+        chunks = []
+        try:
+            async for chunk in self.wrapped.astream(input_data):
+                chunks.append(chunk or "")
+                yield chunk
+        finally:
+            self._record(input_data, "".join(chunks))
+
+
+def fit_prompt(llm: Any, build_prompt: Callable[[], Any], history: Any) -> Tuple[bool, Any]:
+    """
+    Fits the next prompt of an agent loop in the token budget of its LLM, if a `BudgetedLLM`.
+
+    Room is kept for the call forcing the output, which sends the same history again. When the
+    prompt does not fit, the token budget of the `history` scratchpad is lowered so that it gets
+    compacted.
+
+    Args:
+        llm: The LLM of the agent.
+        build_prompt: Builds the prompt from the current history.
+        history (Scratchpad): The Thought/Action/Observation history of the agent.
+
+    Returns:
+        Tuple[bool, Any]: Whether the prompt fits, in which case the agent can go on, or the
+        output should be forced instead, and the prompt.
+    """
+    prompt = build_prompt()
+    if not isinstance(llm, BudgetedLLM):
+        return True, prompt
+
+    budget = llm.budget
+    tokens = llm.count_tokens(prompt)
+    if budget.fits(2 * tokens, calls=2):
+        return True, prompt
+
+    remaining = budget.remaining_prompt_tokens
+    if remaining is not None:
+        history_tokens = llm.count_tokens("\n".join(history))
+        fixed_tokens = tokens - history_tokens
+        target = max(0, remaining // 2 - fixed_tokens)
+        if target < history_tokens:
+            logging.info(
+                f"Compacting the history from {history_tokens} "
+                f"to {target} tokens to fit the token budget."
+            )
+            # A budget of 0 would disable the compaction of the scratchpad.
+            history.token_budget = max(1, min(history.token_budget or target, target))
+            prompt = build_prompt()
+            tokens = llm.count_tokens(prompt)
+            if budget.fits(2 * tokens, calls=2):
+                return True, prompt
+    return False, prompt
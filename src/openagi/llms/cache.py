@@ -0,0 +1,278 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import Field, PrivateAttr
+
+from openagi.llms.middleware import LLMMiddleware, request_key
+
+
+class CachedLLM(LLMMiddleware):
+    """LLM middleware caching the responses of the wrapped LLM.
+
+    Responses are keyed on the provider, model and parameters of the wrapped LLM along with the
+    prompt. They are kept in an in-memory LRU and, when `cache_path` is set, in a SQLite database
+    so that they are reused across runs.
+
+    Example:
+        llm = CachedLLM(wrapped=OpenAIModel(config=config), cache_path=".cache/llm.sqlite")
+    """
+
+    max_entries: int = Field(
+        default=1024, description="Maximum number of responses kept in memory."
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Path of the SQLite database persisting the "
+            "responses. None keeps them in memory only."
+        ),
+    )
+    max_disk_entries: Optional[int] = Field(
+        default=100000,
+        description=(
+            "Maximum number of responses kept in the SQLite database, the least recently used "
+            "are evicted first."
+        ),
+    )
+    ttl: Optional[float] = Field(
+        default=None,
+        description="Number of seconds a response is valid for. None never expires them.",
+    )
+    bypass: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the cache is neither read "
+            "nor written and every call reaches the LLM."
+        ),
+    )
+
+    _memory: "OrderedDict[str, Tuple[float, Any]]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _disk_entries: int = PrivateAttr(default=0)
+    _stats: Dict[str, int] = PrivateAttr(
+        default_factory=lambda: dict.fromkeys(
+            [
+                "hits",
+                "misses",
+                "memory_hits",
+                "disk_hits",
+                "memory_evictions",
+                "disk_evictions",
+                "expirations",
+            ],
+            0,
+        )
+    )
+
+    def cache_key(self, input_data: Any) -> str:
+        """Returns the key of the response of the wrapped LLM to the given input."""
+        return request_key(self.wrapped, input_data)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.cache_path and self._conn is None:
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+            if self.ttl is not None:
+                conn.execute("DELETE FROM llm_cache WHERE created < ?", (time.time() - self.ttl,))
+            conn.commit()
+            self._disk_entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            self._conn = conn
+            logging.info(
+                f"Using LLM cache at {self.cache_path} with {self._disk_entries} responses."
+            )
+        return self._conn
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and created < time.time() - self.ttl
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Looks up a response, first in memory and then on disk.
+
+        Returns:
+            Tuple[bool, Any]: Whether the response was found and the response.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return True, value
+                del self._memory[key]
+                self._stats["expirations"] += 1
+
+            conn = self._connect()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT value, created FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = json.loads(row[0]), row[1]
+                    if not self._expired(created):
+                        conn.execute(
+                            "UPDATE llm_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+                        )
+                        conn.commit()
+                        self._put_memory(key, created, value)
+                        self._stats["hits"] += 1
+                        self._stats["disk_hits"] += 1
+                        return True, value
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    self._disk_entries -= 1
+                    self._stats["expirations"] += 1
+
+            self._stats["misses"] += 1
+            return False, None
+
+    def _put_memory(self, key: str, created: float, value: Any):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def set(self, key: str, value: Any):
+        """Stores a response in memory and, if enabled, on disk."""
+        try:
+            serialized = json.dumps(value)
+        except (TypeError, ValueError):
+            logging.debug(
+                f"Not caching the response of {self.wrapped.__class__.__name__}, "
+                "it is not JSON serializable."
+            )
+            return
+
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, now, value)
+
+            conn = self._connect()
+            if conn is None:
+                return
+            exists = conn.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, "
+                "created, accessed) VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now),
+            )
+            self._disk_entries += 0 if exists else 1
+
+            if self.max_disk_entries is not None and self._disk_entries > self.max_disk_entries:
+                # Evict down to 90% of the limit, so that eviction does not run on every write.
+                evict = self._disk_entries - int(self.max_disk_entries * 0.9)
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY accessed LIMIT ?)",
+                    (evict,),
+                )
+                self._disk_entries -= evict
+                self._stats["disk_evictions"] += evict
+            conn.commit()
+
+    def run(self, input_data: Any):
+        if self.bypass:
+            return self.wrapped.run(input_data)
+
+        key = self.cache_key(input_data)
+        found, value = self.get(key)
+        if found:
+            logging.debug(f"LLM cache hit for {self.wrapped.__class__.__name__}.")
+            return value
+
+        value = self.wrapped.run(input_data)
+        self.set(key, value)
+        return value
+
+    async def arun(self, input_data: Any):
+        if self.bypass:
+            return await self.wrapped.arun(input_data)
+
+        key = self.cache_key(input_data)
+        found, value = self.get(key)
+        if found:
+            logging.debug(f"LLM cache hit for {self.wrapped.__class__.__name__}.")
+            return value
+
+        value = await self.wrapped.arun(input_data)
+        self.set(key, value)
+        return value
+
+    def stream(self, input_data: Any):
+        if self.bypass:
+            yield from self.wrapped.stream(input_data)
+            return
+
+        key = self.cache_key(input_data)
+        found, value = self.get(key)
+        if found:
+            yield value
+            return
+
+        # A stream stopped early by the consumer yields a partial response, which is not cached.
+        chunks = []
+        for chunk in self.wrapped.stream(input_data):
+            chunks.append(chunk)
+            yield chunk
+        self.set(key, "".join(chunks))
+
+    async def astream(self, input_data: Any):
+        if self.bypass:
+            async for chunk in self.wrapped.astream(input_data):
+                yield chunk
+            return
+
+        key = self.cache_key(input_data)
+        found, value = self.get(key)
+        if found:
+            yield value
+            return
+
+        chunks = []
+        async for chunk in self.wrapped.astream(input_data):
+            chunks.append(chunk)
+            yield chunk
+        self.set(key, "".join(chunks))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters of the cache, along with its hit rate and size."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = self._disk_entries
+        return stats
+
+    def clear(self):
+        """Removes all the cached responses, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM llm_cache")
+                conn.commit()
+                self._disk_entries = 0
+
+    def close(self):
+        """Closes the SQLite database, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,7 +1,8 @@
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
 from openagi.utils.yamlParse import read_from_env
 
 try:
@@ -11,7 +12,7 @@ except ImportError:
 
 class CerebrasConfigModel(LLMConfigModel):
     
-     """
+    """
     Configuration model for Cerebras.
     Reference: https://cloud.cerebras.ai
     
@@ -31,11 +32,13 @@ class CerebrasConfigModel(LLMConfigModel):
 class CerebrasModel(LLMBaseModel):
     """Cerebras LLM implementation of the LLMBaseModel."""
 
+    supports_messages: ClassVar[bool] = True
     config: Any
 
     def load(self):
         """Initializes the Cerebras LLM instance with configurations."""
-        self.llm = ChatCerebras(
+        self.llm = get_shared_client(
+            ChatCerebras,
             api_key=self.config.cerebras_api_key,
             model_name=self.config.model_name,
             temperature=self.config.temperature
@@ -48,10 +51,40 @@ class CerebrasModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        response = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        response = self.llm(messages)
         return response.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Cerebras model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        response = await self.llm.ainvoke(messages)
+        return response.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the Cerebras model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Cerebras model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> CerebrasConfigModel:
         """Loads the Cerebras configurations from environment variables."""
@@ -1,8 +1,10 @@
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
-from typing import Any
+from typing import Any, ClassVar
 
-from langchain_core.messages import HumanMessage
 
 from openagi.exception import OpenAGIException
 try:
@@ -22,11 +24,15 @@ class ChatAnthropicModel(LLMBaseModel):
     """
     Define the Claude LLM from Anthropic using Langchain LLM integration
     """
+
+    supports_messages: ClassVar[bool] = True
+    supports_tools: ClassVar[bool] = binds_tools(ChatAnthropic)
     config: Any
 
     def load(self):
         """Initializes the ChatAnthropic instance with configurations."""
-        self.llm = ChatAnthropic(
+        self.llm = get_shared_client(
+            ChatAnthropic,
             model_name = self.config.model_name,
             api_key = self.config.anthropic_api_key,
             temperature = self.config.temperature
@@ -47,10 +53,41 @@ class ChatAnthropicModel(LLMBaseModel):
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
         
-        message = HumanMessage(content=input_data)
-        response = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        response = self.llm(messages)
         return response.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Chat Anthropic model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        
+        messages = to_langchain_messages(input_data)
+        response = await self.llm.ainvoke(messages)
+        return response.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the Chat Anthropic model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Chat Anthropic model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> ChatAnthropicConfigModel:
         """Loads the ChatAnthropic configurations from a env file.
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+import httpx
+from pydantic import BaseModel, Field
+
+
+class ClientPoolConfig(BaseModel):
+    """Configuration of the HTTP connection pool shared by the LLM clients of the process."""
+
+    max_connections: int = Field(
+        default=int(os.environ.get("OPENAGI_HTTP_MAX_CONNECTIONS", 100)),
+        description="Maximum number of concurrent connections per client.",
+    )
+    max_keepalive_connections: int = Field(
+        default=int(os.environ.get("OPENAGI_HTTP_MAX_KEEPALIVE", 20)),
+        description="Maximum number of idle connections kept alive per client.",
+    )
+    keepalive_expiry: float = Field(
+        default=float(os.environ.get("OPENAGI_HTTP_KEEPALIVE_EXPIRY", 30.0)),
+        description="Number of seconds an idle connection is kept alive.",
+    )
+    timeout: float = Field(
+        default=float(os.environ.get("OPENAGI_HTTP_TIMEOUT", 600.0)),
+        description="Timeout of the requests, in seconds.",
+    )
+    http2: bool = Field(
+        default=os.environ.get("OPENAGI_HTTP2", "true").lower()
+        not in ("0", "false", "no", "off"),
+        description="Whether to negotiate HTTP/2, only used when the `h2` package is installed.",
+    )
+
+
+_pool_config = ClientPoolConfig()
+_clients: Dict[Tuple[str, str], Any] = {}
+_http_clients: Dict[str, Any] = {}
+# Async connections are bound to the event loop they were opened on, hence one client per loop.
+_async_http_clients: "weakref.WeakKeyDictionary[Any, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+# Async LLM clients use the pooled `httpx.AsyncClient` of a loop, hence one client per loop too.
+_async_clients: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.RLock()
+
+
+def _http2_enabled() -> bool:
+    return _pool_config.http2 and importlib.util.find_spec("h2") is not None
+
+
+def configure_client_pool(**kwargs):
+    """
+    Configures the HTTP connection pool of the LLM clients, see `ClientPoolConfig` for options.
+
+    The clients created before are dropped, so that the new configuration applies to the next
+    `load()` of the LLMs.
+    """
+    global _pool_config
+    with _lock:
+        _pool_config = _pool_config.model_copy(update=kwargs)
+        clear_clients()
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=_pool_config.max_connections,
+            max_keepalive_connections=_pool_config.max_keepalive_connections,
+            keepalive_expiry=_pool_config.keepalive_expiry,
+        ),
+        "timeout": _pool_config.timeout,
+        "http2": _http2_enabled(),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the pooled `httpx.Client` shared by the LLM clients of the process."""
+    with _lock:
+        if "sync" not in _http_clients:
+            _http_clients["sync"] = httpx.Client(**_client_kwargs())
+        return _http_clients["sync"]
+
+
+def _running_loop() -> Any:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the pooled `httpx.AsyncClient` shared by the LLM clients of the running loop."""
+    loop = _running_loop()
+    with _lock:
+        if loop is None:
+            if "async" not in _http_clients:
+                _http_clients["async"] = httpx.AsyncClient(**_client_kwargs())
+            return _http_clients["async"]
+        client = _async_http_clients.get(loop)
+        if client is None:
+            client = _async_http_clients[loop] = httpx.AsyncClient(**_client_kwargs())
+        return client
+
+
+def openai_http_clients(client_cls: Any) -> Dict[str, Any]:
+    """
+    Returns the pooled HTTP client to pass to a langchain OpenAI chat model.
+
+    Older langchain-openai releases only accept a single `http_client`, also handed to the async
+    OpenAI client, so the pooled client is only passed when the async one is set apart. This
+    excludes the pinned langchain-openai 0.0.6: its OpenAI and Azure chat models get nothing and
+    keep the HTTP clients of their OpenAI clients, which are still shared by `get_shared_client`.
+    The async client is left to the chat model: it is created once with the model, shared across
+    the calls, while the pooled async clients are bound to the event loop they were created on.
+    """
+    fields = getattr(client_cls, "model_fields", None) or getattr(client_cls, "__fields__", {})
+    if "http_async_client" not in fields:
+        return {}
+    return {"http_client": get_http_client()}
+
+
+def _client_key(factory: Callable[..., Any], kwargs: Dict[str, Any]) -> Tuple[str, str]:
+    # Credentials are part of the key, they are hashed rather than kept around in clear.
+    payload = json.dumps(kwargs, sort_keys=True, default=repr)
+    return (
+        f"{factory.__module__}.{factory.__qualname__}",
+        hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+    )
+
+
+def get_shared_client(factory: Callable[..., Any], **kwargs) -> Any:
+    """
+    Returns the client built by `factory(**kwargs)`, shared by all the LLMs of the process created
+    with the same provider, endpoint, credentials and parameters.
+
+    Example:
+        self.llm = get_shared_client(ChatOpenAI, openai_api_key=key, model_name="gpt-4o")
+    """
+    key = _client_key(factory, kwargs)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            logging.debug(f"Creating shared client {key[0]}")
+            client = _clients[key] = factory(**kwargs)
+        return client
+
+
+def get_shared_async_client(factory: Callable[..., Any], **kwargs) -> Any:
+    """
+    Async counterpart of `get_shared_client`, for the clients taking an `http_client`, e.g. the
+    `AsyncOpenAI` clients. The clients are shared per running event loop and use its pooled
+    `httpx.AsyncClient`, so they are to be resolved on each call rather than kept around.
+    """
+    loop = _running_loop()
+    if loop is None:
+        return get_shared_client(factory, http_client=get_async_http_client(), **kwargs)
+
+    key = _client_key(factory, kwargs)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            logging.debug(f"Creating shared async client {key[0]}")
+            client = clients[key] = factory(http_client=get_async_http_client(), **kwargs)
+        return client
+
+
+def clear_clients():
+    """
+    Drops the shared clients, the next `load()` of the LLMs creates new ones. The HTTP clients are
+    not closed, as LLMs loaded before may still be using them.
+    """
+    with _lock:
+        _clients.clear()
+        _http_clients.clear()
+        _async_http_clients.clear()
+        _async_clients.clear()
@@ -1,7 +1,8 @@
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
 from openagi.utils.yamlParse import read_from_env
 
 try:
@@ -21,11 +22,13 @@ class CohereModel(LLMBaseModel):
     This class implements the specific logic required to work with Cohere LLM that runs model locally on CPU.
     """
 
+    supports_messages: ClassVar[bool] = True
     config: Any
 
     def load(self):
         """Initializes the Cohere instance with configurations."""
-        self.llm = ChatCohere(
+        self.llm = get_shared_client(
+            ChatCohere,
             model = self.config.model_name,
             cohere_api_key = self.config.cohere_api_key,
             temperature = 0.1
@@ -45,10 +48,40 @@ class CohereModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Cohere model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the Cohere model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Cohere model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> CohereConfigModel:
         """Loads the Cohere configurations from a YAML file.
@@ -1,13 +1,22 @@
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
+
+
+def _chat_gemini_cls():
+    """Imports the chat model on first use, so that the provider can be imported without it."""
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError:
+        raise OpenAGIException(
+            "Install langchain Google Gemini with cmd `pip install langchain-google-genai==0.0.3`"
+        )
+    return ChatGoogleGenerativeAI
 
-try:
-   from langchain_google_genai import ChatGoogleGenerativeAI
-except ImportError:
-  raise OpenAGIException("Install langchain Google Gemini with cmd `pip install langchain-google-genai==0.0.3`")
 
 class GeminiConfigModel(LLMConfigModel):
     """Configuration model for Gemini Chat model."""
@@ -22,11 +31,17 @@ class GeminiModel(LLMBaseModel):
     This class implements the specific logic required to work with Chat Google Generative - Gemini Model.
     """
 
+    supports_messages: ClassVar[bool] = True
     config: Any
 
+    @property
+    def supports_tools(self) -> bool:
+        return binds_tools(_chat_gemini_cls())
+
     def load(self):
         """Initializes the GeminiModel instance with configurations."""
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = get_shared_client(
+            _chat_gemini_cls(),
             google_api_key = self.config.google_api_key,
             model = self.config.model_name,
             temperature= self.config.temperature
@@ -46,10 +61,40 @@ class GeminiModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
+        return resp.content
+
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Chat Gemini model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
         return resp.content
     
+    def stream(self, input_data: str):
+        """Streams the response of the Chat Gemini model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Chat Gemini model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> GeminiConfigModel:
         """Loads the GeminiModel configurations from a env file.
@@ -1,7 +1,9 @@
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
 
 try:
@@ -22,11 +24,14 @@ class GroqModel(LLMBaseModel):
     This class implements the specific logic required to work with Chat Groq Model.
     """
 
+    supports_messages: ClassVar[bool] = True
+    supports_tools: ClassVar[bool] = binds_tools(ChatGroq)
     config: Any
 
     def load(self):
         """Initializes the GroqModel instance with configurations."""
-        self.llm = ChatGroq(
+        self.llm = get_shared_client(
+            ChatGroq,
             model_name = self.config.model_name,
             groq_api_key = self.config.groq_api_key,
             temperature = self.config.temperature
@@ -46,10 +51,40 @@ class GroqModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
+        return resp.content
+
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Chat Groq model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
         return resp.content
     
+    def stream(self, input_data: str):
+        """Streams the response of the Chat Groq model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Chat Groq model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> GroqConfigModel:
         """Loads the GroqModel configurations from a env file.
@@ -1,7 +1,8 @@
 from typing import Any
-from langchain_core.messages import HumanMessage
 from langchain_community.llms import HuggingFaceHub
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
 from openagi.utils.yamlParse import read_from_env
 
 class HuggingFaceConfigModel(LLMConfigModel):
@@ -21,7 +22,8 @@ class HuggingFaceModel(LLMBaseModel):
 
     def load(self):
         """Initializes the GroqModel instance with configurations."""
-        self.llm = HuggingFaceHub(
+        self.llm = get_shared_client(
+            HuggingFaceHub,
             huggingfacehub_api_token = self.config.api_token,
             repo_id= self.config.model_name, 
             model_kwargs={"temperature": self.config.temperature,
@@ -43,10 +45,40 @@ class HuggingFaceModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the HuggingFace model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the HuggingFace model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the HuggingFace model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> HuggingFaceConfigModel:
         """Loads the Hugging Face configurations from a YAML file.
@@ -0,0 +1,61 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+# A chat message, e.g. {"role": "system", "content": "You are ..."}.
+Message = Dict[str, str]
+
+ROLES = ("system", "user", "assistant")
+
+
+def is_messages(input_data: Any) -> bool:
+    """Whether the input of an LLM is a list of role-tagged messages rather than a prompt."""
+    return isinstance(input_data, list) and all(
+        isinstance(message, dict) and "role" in message for message in input_data
+    )
+
+
+def to_messages(input_data: Any) -> List[Message]:
+    """Returns the input of an LLM as role-tagged messages, a prompt being one user message."""
+    if is_messages(input_data):
+        for message in input_data:
+            if message["role"] not in ROLES:
+                raise ValueError(
+                    f"Unsupported message role {message['role']!r}, expected one of {ROLES}."
+                )
+        return input_data
+    return [{"role": "user", "content": f"{input_data}"}]
+
+
+def merge_messages(messages: Iterable[Message]) -> List[Message]:
+    """Merges the consecutive messages of the same role, which some chat APIs reject."""
+    merged: List[Message] = []
+    for message in messages:
+        if merged and merged[-1]["role"] == message["role"]:
+            merged[-1] = {
+                "role": message["role"],
+                "content": f"{merged[-1]['content']}\n{message['content']}",
+            }
+        else:
+            merged.append(dict(message))
+    return merged
+
+
+def to_langchain_messages(input_data: Any) -> List["BaseMessage"]:
+    """Converts a prompt or a list of role-tagged messages to langchain chat messages."""
+    # Imported here so that importing openagi does not import langchain.
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+    classes = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+    return [
+        classes[message["role"]](content=message["content"])
+        for message in to_messages(input_data)
+    ]
+
+
+def messages_to_text(input_data: Any) -> str:
+    """Flattens a prompt or a list of role-tagged messages into a single prompt."""
+    if not is_messages(input_data):
+        return input_data
+    return "\n".join(message["content"] for message in input_data)
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+
+from pydantic import Field
+
+from openagi.llms.base import LLMBaseModel
+from openagi.llms.messages import Message
+from openagi.llms.tools import Tool, ToolResponse
+
+
+def request_key(llm: LLMBaseModel, input_data: Any) -> str:
+    """
+    Returns a key identifying a request, from the provider, model and parameters of the LLM and
+    its input.
+    """
+    payload = json.dumps(
+        {"llm": llm.identity(), "input": input_data}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMMiddleware(LLMBaseModel):
+    """Base class of the LLMs wrapping another LLM to add a behaviour around its calls.
+
+    A middleware can be used wherever an LLM is expected, and middlewares can be stacked.
+    By default every call is forwarded to the wrapped LLM.
+
+    Attributes:
+        wrapped: The LLM whose calls are wrapped.
+    """
+
+    config: Any = None
+    wrapped: LLMBaseModel = Field(description="LLM whose calls are wrapped.")
+
+    @property
+    def supports_messages(self) -> bool:
+        return self.wrapped.supports_messages
+
+    @property
+    def supports_tools(self) -> bool:
+        return self.wrapped.supports_tools
+
+    def load(self):
+        """Initializes the wrapped LLM."""
+        return self.wrapped.load()
+
+    def run(self, input_data: Any):
+        return self.wrapped.run(input_data)
+
+    async def arun(self, input_data: Any):
+        return await self.wrapped.arun(input_data)
+
+    def run_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        return self.wrapped.run_tools(messages, tools)
+
+    async def arun_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        return await self.wrapped.arun_tools(messages, tools)
+
+    def stream(self, input_data: Any):
+        yield from self.wrapped.stream(input_data)
+
+    async def astream(self, input_data: Any):
+        async for chunk in self.wrapped.astream(input_data):
+            yield chunk
+
+    def count_tokens(self, input_data: Any) -> int:
+        return self.wrapped.count_tokens(input_data)
+
+    def identity(self) -> Dict[str, Any]:
+        return self.wrapped.identity()
+
+    @staticmethod
+    def load_from_env_config():
+        """Middlewares have no configuration of their own, the wrapped LLM carries it."""
+        return None
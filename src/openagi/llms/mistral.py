@@ -1,10 +1,12 @@
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
 
 import logging
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 
 try:
    from langchain_mistralai import ChatMistralAI
@@ -25,11 +27,14 @@ class MistralModel(LLMBaseModel):
     This class implements the specific logic required to work with Mistral service.
     """
 
+    supports_messages: ClassVar[bool] = True
+    supports_tools: ClassVar[bool] = binds_tools(ChatMistralAI)
     config: Any
 
     def load(self):
         """Initializes the Mistral instance with configurations."""
-        self.llm = ChatMistralAI(
+        self.llm = get_shared_client(
+            ChatMistralAI,
            model = self.config.model_name,
            temperature = self.config.temperature,
            api_key = self.config.mistral_api_key
@@ -50,10 +55,43 @@ class MistralModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_text)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_text)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_text: str):
+        """Asynchronously runs the Mistral model with the provided input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_text: str):
+        """Streams the response of the Mistral model to the input text, chunk by chunk."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_text: str):
+        """Asynchronously streams the response of the Mistral model to the input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> MistralConfigModel:
         """Loads the Mistral configurations from a YAML file.
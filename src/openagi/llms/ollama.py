@@ -1,13 +1,18 @@
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
 from openagi.utils.yamlParse import read_from_env
 
-try:
-   from langchain_ollama.chat_models import ChatOllama
-except ImportError:
-  raise OpenAGIException("Install langchain groq with cmd `pip install langchain-ollama`")
+
+def _chat_ollama_cls():
+    """Imports the chat model on first use, so that the provider can be imported without it."""
+    try:
+        from langchain_ollama.chat_models import ChatOllama
+    except ImportError:
+        raise OpenAGIException("Install langchain groq with cmd `pip install langchain-ollama`")
+    return ChatOllama
 
 
 class OllamaConfigModel(LLMConfigModel):
@@ -21,11 +26,13 @@ class OllamaModel(LLMBaseModel):
     This class implements the specific logic required to work with Ollama LLM that runs model locally on CPU.
     """
 
+    supports_messages: ClassVar[bool] = True
     config: Any
 
     def load(self):
         """Initializes the Ollama instance with configurations."""
-        self.llm = ChatOllama(
+        self.llm = get_shared_client(
+            _chat_ollama_cls(),
             model = self.config.model_name,
             temperature=0   
         )
@@ -44,10 +51,40 @@ class OllamaModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_data: str):
+        """Asynchronously runs the Ollama model with the provided input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_data: str):
+        """Streams the response of the Ollama model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the Ollama model to the input text."""
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> OllamaConfigModel:
         """Loads the Ollama configurations from a YAML file.
@@ -1,9 +1,11 @@
 import logging
-from typing import Any
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar
 from langchain_openai import ChatOpenAI
 
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client, openai_http_clients
+from openagi.llms.messages import to_langchain_messages
+from openagi.llms.tools import binds_tools
 from openagi.utils.yamlParse import read_from_env
 
 
@@ -20,13 +22,17 @@ class OpenAIModel(LLMBaseModel):
     This class implements the specific logic required to work with OpenAI service.
     """
 
+    supports_messages: ClassVar[bool] = True
+    supports_tools: ClassVar[bool] = binds_tools(ChatOpenAI)
     config: Any
 
     def load(self):
         """Initializes the OpenAI instance with configurations."""
-        self.llm = ChatOpenAI(
+        self.llm = get_shared_client(
+            ChatOpenAI,
             openai_api_key=self.config.openai_api_key,
             model_name=self.config.model_name,
+            **openai_http_clients(ChatOpenAI),
         )
         return self.llm
 
@@ -44,10 +50,43 @@ class OpenAIModel(LLMBaseModel):
             self.load()
         if not self.llm:
             raise ValueError("`llm` attribute not set.")
-        message = HumanMessage(content=input_text)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_text)
+        resp = self.llm(messages)
         return resp.content
 
+    async def arun(self, input_text: str):
+        """Asynchronously runs the OpenAI model with the provided input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        resp = await self.llm.ainvoke(messages)
+        return resp.content
+
+    def stream(self, input_text: str):
+        """Streams the response of the OpenAI model to the input text, chunk by chunk."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_text: str):
+        """Asynchronously streams the response of the OpenAI model to the input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        messages = to_langchain_messages(input_text)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> OpenAIConfigModel:
         """Loads the OpenAI configurations from a YAML file.
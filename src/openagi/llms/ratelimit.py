@@ -0,0 +1,321 @@
+import asyncio
+import email.utils
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import Field, PrivateAttr
+
+from openagi.llms.base import LLMBaseModel
+from openagi.llms.messages import Message
+from openagi.llms.middleware import LLMMiddleware
+from openagi.llms.tools import Tool, ToolResponse
+
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+RETRYABLE_ERROR_NAMES = (
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "OverloadedError",
+    "TooManyRequestsError",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "TimeoutException",
+    "ConnectError",
+)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `capacity` per `period` seconds.
+
+    Amounts are reserved up front: the bucket may go into debt, and the caller waits for the
+    returned delay, so that concurrent callers are served in order without busy waiting.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Takes `amount` from the bucket.
+
+        Returns:
+            float: The number of seconds to wait before the amount is available.
+        """
+        # A single request larger than the bucket would otherwise never be served.
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def consume(self, amount: float):
+        """Takes `amount` from the bucket without waiting, e.g. once the completion is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+
+
+_buckets: Dict[Tuple[Any, ...], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(key: str, capacity: float, period: float = 60.0) -> TokenBucket:
+    """Returns the token bucket shared by the rate limited LLMs with the same key and limit."""
+    with _buckets_lock:
+        bucket = _buckets.get((key, capacity, period))
+        if bucket is None:
+            bucket = _buckets[(key, capacity, period)] = TokenBucket(capacity, period)
+        return bucket
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None) or getattr(exc, "http_status", None)
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether the error is a throttling, server or connection error worth retrying."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(klass.__name__ in RETRYABLE_ERROR_NAMES for klass in type(exc).__mro__)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Returns the delay requested by the `Retry-After` header of the error response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            date = email.utils.parsedate_to_datetime(value)
+            return max(0.0, date.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedLLM(LLMMiddleware):
+    """LLM middleware throttling the calls of the wrapped LLM and retrying the failed ones.
+
+    Requests and tokens per minute are limited with token buckets shared by all the rate limited
+    LLMs of the process using the same provider and API key, so that every agent draws from the
+    same budget. Throttling, server and connection errors are retried with a jittered exponential
+    backoff, waiting at least as long as requested by the `Retry-After` header of the response.
+
+    Example:
+        llm = RateLimitedLLM(
+            wrapped=OpenAIModel(config=config), requests_per_minute=500, tokens_per_minute=200000
+        )
+    """
+
+    requests_per_minute: Optional[float] = Field(
+        default=None, description="Maximum number of requests per minute."
+    )
+    tokens_per_minute: Optional[float] = Field(
+        default=None, description="Maximum number of prompt and completion tokens per minute."
+    )
+    max_retries: int = Field(default=5, description="Number of times a failed call is retried.")
+    initial_backoff: float = Field(
+        default=1.0, description="Seconds waited before the first retry."
+    )
+    max_backoff: float = Field(
+        default=60.0, description="Maximum number of seconds waited before a retry."
+    )
+    bucket_key: Optional[str] = Field(
+        default=None,
+        description=(
+            "Key of the shared budget. Defaults to the provider and a hash of its API key."
+        ),
+    )
+
+    _stats: Dict[str, float] = PrivateAttr(
+        default_factory=lambda: dict.fromkeys(
+            ["requests", "retries", "failures", "throttle_wait", "backoff_wait"], 0
+        )
+    )
+    _stats_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _bucket_key(self) -> str:
+        if self.bucket_key:
+            return self.bucket_key
+        llm: LLMBaseModel = self.wrapped
+        while isinstance(llm, LLMMiddleware):
+            llm = llm.wrapped
+        config = llm.config.model_dump() if hasattr(llm.config, "model_dump") else {}
+        secrets = sorted(
+            f"{key}={value}" for key, value in config.items()
+            if any(secret in key for secret in self.secret_fields)
+        )
+        digest = hashlib.sha256("|".join(secrets).encode("utf-8")).hexdigest()[:16]
+        return f"{llm.__class__.__name__}:{digest}"
+
+    def _count(self, key: str, value: float = 1):
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def _throttle_delay(self, input_data: Any) -> float:
+        key = self._bucket_key()
+        delay = 0.0
+        if self.requests_per_minute:
+            delay = max(delay, get_bucket(f"{key}:requests", self.requests_per_minute).reserve(1))
+        if self.tokens_per_minute:
+            bucket = get_bucket(f"{key}:tokens", self.tokens_per_minute)
+            delay = max(delay, bucket.reserve(self.count_tokens(input_data)))
+        if delay:
+            logging.debug(f"Rate limit of {key} reached, waiting {delay:.2f}s.")
+            self._count("throttle_wait", delay)
+        self._count("requests")
+        return delay
+
+    def _record_response(self, response: Any):
+        if self.tokens_per_minute and response is not None:
+            get_bucket(f"{self._bucket_key()}:tokens", self.tokens_per_minute).consume(
+                self.count_tokens(response)
+            )
+
+    def _backoff_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Returns the delay before retrying the call, or None if it should not be retried."""
+        if attempt >= self.max_retries or not is_retryable(exc):
+            self._count("failures")
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.initial_backoff * 2**attempt))
+        delay = max(delay, retry_after(exc) or 0.0)
+        logging.warning(
+            f"{self.wrapped.__class__.__name__} call failed with {exc!r}, "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s."
+        )
+        self._count("retries")
+        self._count("backoff_wait", delay)
+        return delay
+
+    def _stream_backoff_delay(
+        self, exc: BaseException, attempt: int, chunks: List[Any]
+    ) -> Optional[float]:
+        """Like `_backoff_delay`, a stream failing after its first chunk being a failure."""
+        if not chunks:
+            return self._backoff_delay(exc, attempt)
+        logging.warning(
+            f"{self.wrapped.__class__.__name__} stream failed with {exc!r} after "
+            f"{len(chunks)} chunks, not retried."
+        )
+        self._count("failures")
+        return None
+
+    def _call(self, call: Callable[[], Any], input_data: Any):
+        attempt = 0
+        while True:
+            time.sleep(self._throttle_delay(input_data))
+            try:
+                response = call()
+            except Exception as exc:
+                delay = self._backoff_delay(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._record_response(response)
+            return response
+
+    async def _acall(self, call: Callable[[], Awaitable[Any]], input_data: Any):
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._throttle_delay(input_data))
+            try:
+                response = await call()
+            except Exception as exc:
+                delay = self._backoff_delay(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._record_response(response)
+            return response
+
+    def run(self, input_data: Any):
+        return self._call(lambda: self.wrapped.run(input_data), input_data)
+
+    async def arun(self, input_data: Any):
+        return await self._acall(lambda: self.wrapped.arun(input_data), input_data)
+
+    def run_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        return self._call(lambda: self.wrapped.run_tools(messages, tools), messages)
+
+    async def arun_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        return await self._acall(lambda: self.wrapped.arun_tools(messages, tools), messages)
+
+    def stream(self, input_data: Any):
+        # Only the failures before the first chunk are retried, the consumer has the other chunks.
+        attempt = 0
+        while True:
+            time.sleep(self._throttle_delay(input_data))
+            chunks = []
+            try:
+                for chunk in self.wrapped.stream(input_data):
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as exc:
+                delay = self._stream_backoff_delay(exc, attempt, chunks)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            finally:
+                self._record_response("".join(chunks))
+            return
+
+    async def astream(self, input_data: Any):
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._throttle_delay(input_data))
+            chunks = []
+            try:
+                async for chunk in self.wrapped.astream(input_data):
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as exc:
+                delay = self._stream_backoff_delay(exc, attempt, chunks)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            finally:
+                self._record_response("".join(chunks))
+            return
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Number of requests, retries and failures, and the seconds spent waiting on the limits and
+        backoffs.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
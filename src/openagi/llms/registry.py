@@ -0,0 +1,77 @@
+import importlib
+import threading
+from typing import Any, Dict, Optional, Type, Union
+
+from openagi.exception import OpenAGIException
+from openagi.llms.base import LLMBaseModel
+
+# Providers by name, as "module:Class" paths so that their SDK is only imported on first use.
+PROVIDERS: Dict[str, str] = {
+    "openai": "openagi.llms.openai:OpenAIModel",
+    "azure": "openagi.llms.azure:AzureChatOpenAIModel",
+    "groq": "openagi.llms.groq:GroqModel",
+    "gemini": "openagi.llms.gemini:GeminiModel",
+    "ollama": "openagi.llms.ollama:OllamaModel",
+    "claude": "openagi.llms.claude:ChatAnthropicModel",
+    "cohere": "openagi.llms.cohere:CohereModel",
+    "mistral": "openagi.llms.mistral:MistralModel",
+    "hf": "openagi.llms.hf:HuggingFaceModel",
+    "xai": "openagi.llms.xai:XAIModel",
+    "sambanova": "openagi.llms.sambanova:SambaNovaModel",
+    "cerebras": "openagi.llms.cerebras:CerebrasModel",
+}
+
+_classes: Dict[str, Type[LLMBaseModel]] = {}
+_lock = threading.Lock()
+
+
+def register_llm(name: str, provider: Union[str, Type[LLMBaseModel]]):
+    """
+    Registers a provider under a name, either as its class or as a "module:Class" path imported
+    on first use.
+
+    Example:
+        register_llm("local", "my_package.llms:LocalModel")
+    """
+    name = name.lower()
+    with _lock:
+        _classes.pop(name, None)
+        if isinstance(provider, str):
+            PROVIDERS[name] = provider
+        else:
+            PROVIDERS[name] = f"{provider.__module__}:{provider.__qualname__}"
+            _classes[name] = provider
+
+
+def get_llm_class(name: str) -> Type[LLMBaseModel]:
+    """Returns the class of the provider registered under the name, importing it on first use."""
+    name = name.lower()
+    with _lock:
+        klass = _classes.get(name)
+        if klass is not None:
+            return klass
+        if name not in PROVIDERS:
+            raise OpenAGIException(
+                f"Unknown LLM provider {name!r}, expected one of {sorted(PROVIDERS)}."
+            )
+        module_name, _, class_name = PROVIDERS[name].partition(":")
+        klass = _classes[name] = getattr(importlib.import_module(module_name), class_name)
+        return klass
+
+
+def get_llm(name: str, config: Optional[Any] = None, **kwargs) -> LLMBaseModel:
+    """
+    Returns an LLM of the provider registered under the name.
+
+    Args:
+        name (str): Name of the provider, e.g. "openai" or "groq".
+        config: Configuration of the provider. Defaults to the one loaded from the environment.
+        **kwargs: Other fields of the LLM.
+
+    Returns:
+        LLMBaseModel: The LLM, whose client is created on its first call.
+    """
+    klass = get_llm_class(name)
+    if config is None:
+        config = klass.load_from_env_config()
+    return klass(config=config, **kwargs)
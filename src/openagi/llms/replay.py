@@ -0,0 +1,293 @@
+import asyncio
+import difflib
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import Field, PrivateAttr
+
+from openagi.exception import OpenAGIException
+from openagi.llms.base import LLMBaseModel
+from openagi.llms.middleware import LLMMiddleware
+
+# Values changing from run to run, e.g. the session and worker ids, masked for the fuzzy match.
+VOLATILE_PATTERNS = (
+    re.compile(
+        r"\b[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\b", re.IGNORECASE
+    ),
+    re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?\b"),
+    re.compile(r"\b\d{4}-\d{2}-\d{2}\b"),
+    re.compile(r"\b[0-9a-f]{16,}\b", re.IGNORECASE),
+    re.compile(r"\b\d{9,}(\.\d+)?\b"),
+)
+
+
+def _serialize(input_data: Any) -> str:
+    return json.dumps(input_data, sort_keys=True, default=str)
+
+
+def normalize_input(input_data: Any) -> str:
+    """Masks the values changing from one run to another in the serialized input."""
+    text = _serialize(input_data)
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub("<*>", text)
+    return text
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class RecordingLLM(LLMMiddleware):
+    """LLM middleware recording every call of the wrapped LLM into a cassette file.
+
+    The cassette is a JSON lines file with the input, the response and the latency of each call,
+    to be served back by `ReplayLLM`. Calls are appended, so that a cassette can be recorded over
+    several runs.
+
+    Example:
+        llm = RecordingLLM(
+            wrapped=AzureChatOpenAIModel(config=config), cassette_path="cassettes/hotpotqa.jsonl"
+        )
+    """
+
+    cassette_path: str = Field(description="Path of the cassette the calls are appended to.")
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def supports_tools(self) -> bool:
+        # Cassettes hold text responses, so that the agents record and replay the same calls.
+        return False
+
+    def _record(
+        self,
+        input_data: Any,
+        response: Any,
+        latency: float,
+        first_chunk_latency: Optional[float] = None,
+    ):
+        record = {
+            "key": _hash(_serialize(input_data)),
+            "fuzzy_key": _hash(normalize_input(input_data)),
+            "input": input_data,
+            "response": response,
+            "latency": latency,
+            "recorded_at": time.time(),
+        }
+        if first_chunk_latency is not None:
+            record["first_chunk_latency"] = first_chunk_latency
+        line = json.dumps(record, default=str)
+        with self._lock:
+            path = Path(self.cassette_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def run(self, input_data: Any):
+        start = time.perf_counter()
+        response = self.wrapped.run(input_data)
+        self._record(input_data, response, time.perf_counter() - start)
+        return response
+
+    async def arun(self, input_data: Any):
+        start = time.perf_counter()
+        response = await self.wrapped.arun(input_data)
+        self._record(input_data, response, time.perf_counter() - start)
+        return response
+
+    def stream(self, input_data: Any):
+        start = time.perf_counter()
+        first_chunk_latency = None
+        chunks = []
+        for chunk in self.wrapped.stream(input_data):
+            if first_chunk_latency is None:
+                first_chunk_latency = time.perf_counter() - start
+            chunks.append(chunk or "")
+            yield chunk
+        # A stream stopped early by the consumer is partial, and is not recorded.
+        self._record(
+            input_data, "".join(chunks), time.perf_counter() - start, first_chunk_latency
+        )
+
+    async def astream(self, input_data: Any):
+        start = time.perf_counter()
+        first_chunk_latency = None
+        chunks = []
+        async for chunk in self.wrapped.astream(input_data):
+            if first_chunk_latency is None:
+                first_chunk_latency = time.perf_counter() - start
+            chunks.append(chunk or "")
+            yield chunk
+        self._record(
+            input_data, "".join(chunks), time.perf_counter() - start, first_chunk_latency
+        )
+
+
+class ReplayLLM(LLMBaseModel):
+    """LLM serving back the responses recorded in a cassette by `RecordingLLM`, offline.
+
+    Inputs are matched on their hash first. When an input was not recorded as is, it is matched
+    with the volatile values, such as session ids, uuids and timestamps, masked and, failing
+    that, with the most similar recorded input above `similarity_threshold`. Inputs recorded
+    several times are served their responses in the recorded order.
+
+    The latency of the provider can be simulated with `latency`: `recorded` waits for the latency
+    recorded with each response, `sampled` draws it from the recorded latencies and `fixed` waits
+    for `fixed_latency` seconds. All are multiplied by `latency_scale`.
+
+    Example:
+        llm = ReplayLLM(cassette_path="cassettes/hotpotqa.jsonl", latency="sampled", seed=0)
+    """
+
+    config: Any = None
+    cassette_path: str = Field(description="Path of the cassette recorded by `RecordingLLM`.")
+    latency: Literal["none", "recorded", "sampled", "fixed"] = Field(
+        default="none", description="How the latency of the provider is simulated."
+    )
+    latency_scale: float = Field(
+        default=1.0, description="Factor applied to the simulated latencies."
+    )
+    fixed_latency: float = Field(
+        default=0.0, description="Latency of the `fixed` mode, in seconds."
+    )
+    similarity_threshold: Optional[float] = Field(
+        default=0.9,
+        description=(
+            "Minimum similarity of the closest recorded "
+            "input when no input matches. None disables it."
+        ),
+    )
+    seed: Optional[int] = Field(default=None, description="Seed of the sampled latencies.")
+
+    _records: List[Dict[str, Any]] = PrivateAttr(default_factory=list)
+    _by_key: Dict[str, List[int]] = PrivateAttr(default_factory=dict)
+    _by_fuzzy_key: Dict[str, List[int]] = PrivateAttr(default_factory=dict)
+    _served: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _stats: Dict[str, int] = PrivateAttr(
+        default_factory=lambda: {"exact": 0, "fuzzy": 0, "similar": 0, "misses": 0}
+    )
+    _random: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any):
+        self._random = random.Random(self.seed)
+        self.load()
+
+    def load(self):
+        """Loads the cassette."""
+        self._records, self._by_key, self._by_fuzzy_key, self._served = [], {}, {}, {}
+        with open(self.cassette_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(
+                        f"Skipping incomplete record in cassette {self.cassette_path}."
+                    )
+                    continue
+                indx = len(self._records)
+                self._records.append(record)
+                self._by_key.setdefault(record["key"], []).append(indx)
+                self._by_fuzzy_key.setdefault(record["fuzzy_key"], []).append(indx)
+        logging.info(f"Loaded {len(self._records)} recorded calls from {self.cassette_path}.")
+        return self
+
+    @property
+    def supports_messages(self) -> bool:
+        # Prompts are laid out as they were for the recorded LLM, so that they match.
+        return any(isinstance(record["input"], list) for record in self._records)
+
+    def _next(self, group: str, indexes: List[int]) -> Dict[str, Any]:
+        # Cycles through the responses recorded for the same input.
+        served = self._served.get(group, 0)
+        self._served[group] = served + 1
+        return self._records[indexes[served % len(indexes)]]
+
+    def _most_similar(self, normalized: str) -> Optional[int]:
+        best, best_ratio = None, self.similarity_threshold
+        for indx, record in enumerate(self._records):
+            matcher = difflib.SequenceMatcher(
+                None, normalized, normalize_input(record["input"]), autojunk=False
+            )
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = indx, ratio
+        return best
+
+    def match(self, input_data: Any) -> Dict[str, Any]:
+        """Returns the record served for the input, raising `OpenAGIException` if none matches."""
+        with self._lock:
+            key = _hash(_serialize(input_data))
+            if key in self._by_key:
+                self._stats["exact"] += 1
+                return self._next(f"exact:{key}", self._by_key[key])
+
+            normalized = normalize_input(input_data)
+            fuzzy_key = _hash(normalized)
+            if fuzzy_key in self._by_fuzzy_key:
+                self._stats["fuzzy"] += 1
+                return self._next(f"fuzzy:{fuzzy_key}", self._by_fuzzy_key[fuzzy_key])
+
+            if self.similarity_threshold is not None:
+                indx = self._most_similar(normalized)
+                if indx is not None:
+                    self._stats["similar"] += 1
+                    return self._records[indx]
+
+            self._stats["misses"] += 1
+        raise OpenAGIException(
+            f"No response recorded in {self.cassette_path} for the input: "
+            f"{_serialize(input_data)[:200]}"
+        )
+
+    def _latency(self, record: Dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            latency = record.get("latency", 0.0)
+        elif self.latency == "sampled":
+            with self._lock:
+                latency = (
+                    self._random.choice(self._records).get("latency", 0.0)
+                    if self._records
+                    else 0.0
+                )
+        elif self.latency == "fixed":
+            latency = self.fixed_latency
+        else:
+            latency = 0.0
+        return latency * self.latency_scale
+
+    def run(self, input_data: Any):
+        record = self.match(input_data)
+        time.sleep(self._latency(record))
+        return record["response"]
+
+    async def arun(self, input_data: Any):
+        record = self.match(input_data)
+        await asyncio.sleep(self._latency(record))
+        return record["response"]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of inputs matched exactly, with the volatile values masked, by similarity, and
+        missed.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    @staticmethod
+    def load_from_env_config():
+        """The replay LLM is configured with its cassette, it has no provider configuration."""
+        return None
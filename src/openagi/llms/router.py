@@ -0,0 +1,448 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+from openagi.exception import OpenAGIException
+from openagi.llms.base import LLMBaseModel
+from openagi.llms.messages import Message
+from openagi.llms.tools import Tool, ToolResponse
+
+
+class Backend(BaseModel):
+    """An LLM the router can send calls to.
+
+    Attributes:
+        llm: The LLM of the backend.
+        cost: Relative cost of a call, e.g. the price per million tokens.
+        name: Name of the backend in the logs and stats, defaults to the LLM class name.
+    """
+
+    llm: LLMBaseModel
+    cost: float = 0.0
+    name: Optional[str] = None
+
+
+class BackendStats:
+    """Live latency and error statistics of a backend."""
+
+    def __init__(self, alpha: float, window: int) -> None:
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        # Time to the first chunk of the streamed calls, which is not comparable to the latency.
+        self.first_chunk_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.latencies: "deque[float]" = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def _ewma(self, average: Optional[float], value: float) -> float:
+        return value if average is None else average + self.alpha * (value - average)
+
+    def _count(self, error: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.error_rate += self.alpha * (float(error) - self.error_rate)
+
+    def record(self, latency: float, error: bool):
+        with self.lock:
+            self._count(error)
+            if not error:
+                self.latencies.append(latency)
+                self.latency = self._ewma(self.latency, latency)
+
+    def record_stream(self, first_chunk_latency: Optional[float], error: bool):
+        """Records a streamed call, along with its time to the first chunk, if any."""
+        with self.lock:
+            self._count(error)
+            if first_chunk_latency is not None:
+                self.first_chunk_latency = self._ewma(
+                    self.first_chunk_latency, first_chunk_latency
+                )
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self.lock:
+            if not self.latencies:
+                return None
+            latencies = sorted(self.latencies)
+        return latencies[int(q * (len(latencies) - 1))]
+
+
+class RoutedLLM(LLMBaseModel):
+    """LLM routing each call to one of several backends.
+
+    The backends are ranked on their live EWMA latency, their error rate and their cost, and a
+    call failing on one backend fails over to the next. With `hedge=True`, a call still pending
+    after the p95 latency of its backend is duplicated to the next backend and the first response
+    wins, which cuts the tail latency of a single provider. `close` shuts down the threads of the
+    hedged calls. Streamed calls are ranked on their time to the first chunk instead.
+
+    Example:
+        llm = RoutedLLM(
+            backends=[
+                Backend(llm=GroqModel(config=groq_config), cost=0.6),
+                Backend(llm=OpenAIModel(config=openai_config), cost=2.5),
+            ],
+            hedge=True,
+        )
+    """
+
+    config: Any = None
+    backends: List[Backend] = Field(description="Backends the calls are routed to.")
+    alpha: float = Field(
+        default=0.2, description="Smoothing factor of the latency and error rate EWMAs."
+    )
+    error_penalty: float = Field(
+        default=10.0,
+        description="Factor by which an error rate of 1 multiplies the latency of a backend.",
+    )
+    cost_weight: float = Field(
+        default=0.0,
+        description="Seconds of latency a unit of cost is worth when ranking the backends.",
+    )
+    hedge: bool = Field(
+        default=False, description="Whether to duplicate slow calls to a second backend."
+    )
+    hedge_after: Optional[float] = Field(
+        default=None,
+        description=(
+            "Seconds after which a call is hedged. Defaults to the p95 latency of its backend."
+        ),
+    )
+    hedge_quantile: float = Field(
+        default=0.95, description="Latency quantile after which a call is hedged."
+    )
+    min_samples: int = Field(
+        default=10,
+        description="Number of calls to a backend before its latency quantile is used to hedge.",
+    )
+    window: int = Field(
+        default=200, description="Number of latencies kept per backend for the quantiles."
+    )
+
+    _stats: Dict[int, BackendStats] = PrivateAttr(default_factory=dict)
+    _counters: Dict[str, int] = PrivateAttr(default_factory=lambda: {"failovers": 0, "hedges": 0})
+    _executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @field_validator("backends", mode="before")
+    @classmethod
+    def _wrap_llms(cls, backends):
+        return [
+            Backend(llm=backend) if isinstance(backend, LLMBaseModel) else backend
+            for backend in backends
+        ]
+
+    def model_post_init(self, __context: Any):
+        if not self.backends:
+            raise ValueError("RoutedLLM needs at least one backend.")
+        for indx, backend in enumerate(self.backends):
+            backend.name = backend.name or f"{backend.llm.__class__.__name__}-{indx}"
+            self._stats[indx] = BackendStats(self.alpha, self.window)
+
+    @property
+    def supports_messages(self) -> bool:
+        return all(backend.llm.supports_messages for backend in self.backends)
+
+    @property
+    def supports_tools(self) -> bool:
+        return all(backend.llm.supports_tools for backend in self.backends)
+
+    def load(self):
+        """Initializes the LLMs of all the backends."""
+        for backend in self.backends:
+            backend.llm.load()
+
+    def close(self):
+        """Shuts down the threads of the hedged calls, without waiting for the losing calls."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def __del__(self):
+        """Shuts down the threads of the hedged calls once the router is garbage collected."""
+        if getattr(self, "__pydantic_private__", None) is not None:
+            self.close()
+
+    def identity(self) -> Dict[str, Any]:
+        return {
+            "provider": self.__class__.__name__,
+            "backends": [b.llm.identity() for b in self.backends],
+        }
+
+    @staticmethod
+    def _latency(stats: BackendStats, streaming: bool) -> Optional[float]:
+        return stats.first_chunk_latency if streaming else stats.latency
+
+    def _score(self, indx: int, default_latency: float = 1.0, streaming: bool = False) -> float:
+        stats = self._stats[indx]
+        latency = self._latency(stats, streaming)
+        if latency is None:
+            # Backends never called rank first so that they get measured, the failing ones are
+            # assumed as slow as the average backend.
+            latency = default_latency if stats.errors else 0.0
+        return (
+            latency * (1 + self.error_penalty * stats.error_rate)
+            + self.cost_weight * self.backends[indx].cost
+        )
+
+    def _default_latency(self, streaming: bool = False) -> float:
+        latencies = [
+            latency
+            for latency in (self._latency(stats, streaming) for stats in self._stats.values())
+            if latency is not None
+        ]
+        return sum(latencies) / len(latencies) if latencies else 1.0
+
+    def ranked(self, streaming: bool = False) -> List[int]:
+        """
+        Returns the indexes of the backends, the best one first. The streamed calls rank them on
+        their time to the first chunk instead of their latency.
+        """
+        default_latency = self._default_latency(streaming)
+        return sorted(
+            range(len(self.backends)),
+            key=lambda indx: self._score(indx, default_latency, streaming),
+        )
+
+    def _hedge_delay(self, indx: int) -> Optional[float]:
+        if not self.hedge:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        stats = self._stats[indx]
+        if len(stats.latencies) < self.min_samples:
+            return None
+        return stats.percentile(self.hedge_quantile)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _call(self, indx: int, input_data: Any):
+        start = time.monotonic()
+        try:
+            response = self.backends[indx].llm.run(input_data)
+        except Exception:
+            self._stats[indx].record(time.monotonic() - start, error=True)
+            raise
+        self._stats[indx].record(time.monotonic() - start, error=False)
+        return response
+
+    async def _acall(self, indx: int, input_data: Any):
+        start = time.monotonic()
+        try:
+            response = await self.backends[indx].llm.arun(input_data)
+        except Exception:
+            self._stats[indx].record(time.monotonic() - start, error=True)
+            raise
+        self._stats[indx].record(time.monotonic() - start, error=False)
+        return response
+
+    def _failed(self, indx: int, exc: BaseException, remaining: bool):
+        logging.warning(f"Backend {self.backends[indx].name} failed with {exc!r}.")
+        if remaining:
+            self._count("failovers")
+
+    def _all_failed(self, exc: Optional[BaseException]) -> OpenAGIException:
+        return OpenAGIException(
+            f"All the backends of {self.__class__.__name__} failed, last error: {exc!r}"
+        )
+
+    def run(self, input_data: Any):
+        order = self.ranked()
+        if not self.hedge:
+            last_exc = None
+            for position, indx in enumerate(order):
+                try:
+                    return self._call(indx, input_data)
+                except Exception as exc:
+                    last_exc = exc
+                    self._failed(indx, exc, position + 1 < len(order))
+            raise self._all_failed(last_exc) from last_exc
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="openagi-router")
+        pending = {}
+        hedged = False
+        last_exc = None
+        while True:
+            if not pending:
+                if not order:
+                    raise self._all_failed(last_exc) from last_exc
+                indx = order.pop(0)
+                pending[self._executor.submit(self._call, indx, input_data)] = indx
+                primary = indx
+
+            delay = self._hedge_delay(primary) if not hedged and order else None
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                indx = order.pop(0)
+                logging.debug(
+                    f"Hedging the call to {self.backends[primary].name} on "
+                    f"{self.backends[indx].name}."
+                )
+                self._count("hedges")
+                pending[self._executor.submit(self._call, indx, input_data)] = indx
+                hedged = True
+                continue
+
+            for future in done:
+                indx = pending.pop(future)
+                try:
+                    # The losing call cannot be interrupted, it completes in the background.
+                    return future.result()
+                except Exception as exc:
+                    last_exc = exc
+                    self._failed(indx, exc, bool(order or pending))
+
+    async def arun(self, input_data: Any):
+        order = self.ranked()
+        pending = {}
+        hedged = False
+        last_exc = None
+        try:
+            while True:
+                if not pending:
+                    if not order:
+                        raise self._all_failed(last_exc) from last_exc
+                    indx = order.pop(0)
+                    pending[asyncio.ensure_future(self._acall(indx, input_data))] = indx
+                    primary = indx
+
+                delay = self._hedge_delay(primary) if not hedged and order else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    indx = order.pop(0)
+                    logging.debug(
+                        f"Hedging the call to {self.backends[primary].name} on "
+                        f"{self.backends[indx].name}."
+                    )
+                    self._count("hedges")
+                    pending[asyncio.ensure_future(self._acall(indx, input_data))] = indx
+                    hedged = True
+                    continue
+
+                for task in done:
+                    indx = pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as exc:
+                        last_exc = exc
+                        self._failed(indx, exc, bool(order or pending))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def run_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        # Tool calls fail over from one backend to the next, without hedging.
+        order = self.ranked()
+        last_exc = None
+        for position, indx in enumerate(order):
+            start = time.monotonic()
+            try:
+                response = self.backends[indx].llm.run_tools(messages, tools)
+            except Exception as exc:
+                self._stats[indx].record(time.monotonic() - start, error=True)
+                last_exc = exc
+                self._failed(indx, exc, position + 1 < len(order))
+                continue
+            self._stats[indx].record(time.monotonic() - start, error=False)
+            return response
+        raise self._all_failed(last_exc) from last_exc
+
+    async def arun_tools(self, messages: List[Message], tools: List[Tool]) -> ToolResponse:
+        order = self.ranked()
+        last_exc = None
+        for position, indx in enumerate(order):
+            start = time.monotonic()
+            try:
+                response = await self.backends[indx].llm.arun_tools(messages, tools)
+            except Exception as exc:
+                self._stats[indx].record(time.monotonic() - start, error=True)
+                last_exc = exc
+                self._failed(indx, exc, position + 1 < len(order))
+                continue
+            self._stats[indx].record(time.monotonic() - start, error=False)
+            return response
+        raise self._all_failed(last_exc) from last_exc
+
+    def stream(self, input_data: Any):
+        # Only the failures before the first chunk fail over, the consumer already has the others.
+        # A streamed call is recorded once it ends, failed or not, with its time to first chunk.
+        order = self.ranked(streaming=True)
+        last_exc = None
+        for position, indx in enumerate(order):
+            start = time.monotonic()
+            first_chunk, failed = None, False
+            try:
+                for chunk in self.backends[indx].llm.stream(input_data):
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - start
+                    yield chunk
+                return
+            except Exception as exc:
+                failed = True
+                if first_chunk is not None:
+                    raise
+                last_exc = exc
+                self._failed(indx, exc, position + 1 < len(order))
+            finally:
+                self._stats[indx].record_stream(first_chunk, error=failed)
+        raise self._all_failed(last_exc) from last_exc
+
+    async def astream(self, input_data: Any):
+        order = self.ranked(streaming=True)
+        last_exc = None
+        for position, indx in enumerate(order):
+            start = time.monotonic()
+            first_chunk, failed = None, False
+            try:
+                async for chunk in self.backends[indx].llm.astream(input_data):
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - start
+                    yield chunk
+                return
+            except Exception as exc:
+                failed = True
+                if first_chunk is not None:
+                    raise
+                last_exc = exc
+                self._failed(indx, exc, position + 1 < len(order))
+            finally:
+                self._stats[indx].record_stream(first_chunk, error=failed)
+        raise self._all_failed(last_exc) from last_exc
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Latency, error rate and calls of each backend, along with the failovers and hedges."""
+        backends = {}
+        default_latency = self._default_latency()
+        for indx, backend in enumerate(self.backends):
+            stats = self._stats[indx]
+            backends[backend.name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "latency": stats.latency,
+                "first_chunk_latency": stats.first_chunk_latency,
+                "error_rate": stats.error_rate,
+                "p95": stats.percentile(0.95),
+                "score": self._score(indx, default_latency),
+            }
+        with self._lock:
+            return {"backends": backends, **self._counters}
+
+    @staticmethod
+    def load_from_env_config():
+        """The router has no configuration of its own, its backends carry it."""
+        return None
@@ -1,8 +1,9 @@
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_shared_client
+from openagi.llms.messages import to_langchain_messages
 from openagi.utils.yamlParse import read_from_env
-from typing import Any, Optional
-from langchain_core.messages import HumanMessage
+from typing import Any, ClassVar, Optional
 
 try:
     from langchain_sambanova import ChatSambaNovaCloud
@@ -23,12 +24,15 @@ class SambaNovaConfigModel(LLMConfigModel):
 
 class SambaNovaModel(LLMBaseModel):
     """SambaNova implementation of the LLMBaseModel."""
+
+    supports_messages: ClassVar[bool] = True
     
     config: Any
 
     def load(self):
         """Initializes the SambaNova client with configurations."""
-        self.llm = ChatSambaNovaCloud(
+        self.llm = get_shared_client(
+            ChatSambaNovaCloud,
             base_url=self.config.base_url,
             project_id=self.config.project_id,
             api_key=self.config.sambanova_api_key,
@@ -44,10 +48,34 @@ class SambaNovaModel(LLMBaseModel):
         """Processes input using SambaNova model."""
         if not self.llm:
             self.load()
-        message = HumanMessage(content=input_data)
-        resp = self.llm([message])
+        messages = to_langchain_messages(input_data)
+        resp = self.llm(messages)
+        return resp.content
+
+    async def arun(self, input_data: str):
+        """Asynchronously processes input using SambaNova model."""
+        if not self.llm:
+            self.load()
+        messages = to_langchain_messages(input_data)
+        resp = await self.llm.ainvoke(messages)
         return resp.content
 
+    def stream(self, input_data: str):
+        """Streams the response of the SambaNova model to the input text, chunk by chunk."""
+        if not self.llm:
+            self.load()
+        messages = to_langchain_messages(input_data)
+        for chunk in self.llm.stream(messages):
+            yield chunk.content
+
+    async def astream(self, input_data: str):
+        """Asynchronously streams the response of the SambaNova model to the input text."""
+        if not self.llm:
+            self.load()
+        messages = to_langchain_messages(input_data)
+        async for chunk in self.llm.astream(messages):
+            yield chunk.content
+
     @staticmethod
     def load_from_env_config() -> SambaNovaConfigModel:
         """Loads configurations from environment variables."""
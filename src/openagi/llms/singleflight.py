@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Tuple
+
+from pydantic import PrivateAttr
+
+from openagi.llms.middleware import LLMMiddleware, request_key
+
+# Calls in flight, shared by all the single-flight LLMs of the process.
+_in_flight: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def _join(key: str) -> Tuple[Future, bool]:
+    """Returns the future of the call in flight for the key, and whether the caller leads it."""
+    with _lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future, False
+        future = _in_flight[key] = Future()
+        return future, True
+
+
+def _leave(key: str, future: Future):
+    with _lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+class SingleFlightLLM(LLMMiddleware):
+    """LLM middleware coalescing identical calls in flight.
+
+    While a call is in flight, identical calls, i.e. with the same provider, model, parameters
+    and input, from any single-flight LLM of the process wait for its response instead of
+    reaching the provider. Unlike `CachedLLM`, nothing is kept once the call completes. Streams
+    are not coalesced.
+
+    Example:
+        llm = SingleFlightLLM(wrapped=OpenAIModel(config=config))
+    """
+
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {"calls": 0, "coalesced": 0})
+    _stats_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _count(self, coalesced: bool):
+        with self._stats_lock:
+            self._stats["calls"] += 1
+            self._stats["coalesced"] += int(coalesced)
+
+    def run(self, input_data: Any):
+        key = request_key(self.wrapped, input_data)
+        future, leader = _join(key)
+        self._count(not leader)
+        if not leader:
+            logging.debug(
+                f"Waiting for the identical call in flight to {self.wrapped.__class__.__name__}."
+            )
+            return future.result()
+
+        try:
+            response = self.wrapped.run(input_data)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            _leave(key, future)
+
+    async def arun(self, input_data: Any):
+        key = request_key(self.wrapped, input_data)
+        future, leader = _join(key)
+        self._count(not leader)
+        if not leader:
+            logging.debug(
+                f"Waiting for the identical call in flight to {self.wrapped.__class__.__name__}."
+            )
+            # Shielded, so that a cancelled follower does not cancel the call of the others.
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            response = await self.wrapped.arun(input_data)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            _leave(key, future)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of calls, and of calls that waited for an identical call in flight."""
+        with self._stats_lock:
+            return dict(self._stats)
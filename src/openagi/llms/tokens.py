@@ -0,0 +1,97 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# Tokens taken by the role and delimiters of each chat message.
+MESSAGE_OVERHEAD = 4
+
+# Providers whose models are tokenized by tiktoken.
+TIKTOKEN_PROVIDERS = ("OpenAIModel", "AzureChatOpenAIModel", "XAIModel")
+
+
+def approximate_tokens(text: str) -> int:
+    """Approximates the number of tokens of a text, assuming ~4 characters per token."""
+    return math.ceil(len(text) / 4)
+
+
+class BaseTokenizer:
+    """Counts the tokens of the prompts and responses of an LLM."""
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def count_input(self, input_data: Any) -> int:
+        """Counts the tokens of a prompt or of a list of role-tagged messages."""
+        if isinstance(input_data, list):
+            return sum(
+                self.count(f"{message.get('content', '')}") + MESSAGE_OVERHEAD
+                if isinstance(message, dict)
+                else self.count(f"{message}")
+                for message in input_data
+            )
+        return self.count(f"{input_data}" if input_data is not None else "")
+
+
+class ApproximateTokenizer(BaseTokenizer):
+    """Fast local approximation of the number of tokens, for models without a local tokenizer."""
+
+    def count(self, text: str) -> int:
+        return approximate_tokens(text)
+
+
+class TiktokenTokenizer(BaseTokenizer):
+    """Exact tokenizer of the OpenAI models, using `tiktoken`."""
+
+    def __init__(self, model_name: Optional[str] = None) -> None:
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model_name or "")
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=None)
+def _tokenizer(provider: str, model_name: Optional[str]) -> BaseTokenizer:
+    if provider in TIKTOKEN_PROVIDERS:
+        try:
+            return TiktokenTokenizer(model_name)
+        except Exception as e:
+            logging.debug(f"Falling back to approximate token counts for {provider}: {e!r}")
+    return ApproximateTokenizer()
+
+
+def get_tokenizer(llm: Any) -> BaseTokenizer:
+    """Returns the tokenizer of the provider of the LLM, unwrapping the middlewares."""
+    while getattr(llm, "wrapped", None) is not None:
+        llm = llm.wrapped
+    config = getattr(llm, "config", None)
+    model_name = getattr(config, "model_name", None) or getattr(config, "model", None)
+    return _tokenizer(llm.__class__.__name__, model_name)
+
+
+class TokenUsage(BaseModel):
+    """Tokens and cost of one or more LLM calls."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    calls: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cost=self.cost + other.cost,
+            calls=self.calls + other.calls,
+        )
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# A function tool in the OpenAI format, which the langchain chat models of the other providers
+# also accept.
+Tool = Dict[str, Any]
+
+
+class ToolCall(NamedTuple):
+    """A call of a tool requested by the LLM."""
+
+    name: str
+    arguments: Dict[str, Any]
+    id: Optional[str] = None
+
+
+class ToolResponse(NamedTuple):
+    """The response of an LLM given tools: its text and the tool calls it requested, if any."""
+
+    content: str
+    tool_calls: Tuple[ToolCall, ...] = ()
+
+
+def function_tool(name: str, description: str, parameters: Dict[str, Any]) -> Tool:
+    """Returns a function tool, `parameters` being the JSON schema of its arguments."""
+    return {
+        "type": "function",
+        "function": {"name": name, "description": description, "parameters": parameters},
+    }
+
+
+def binds_tools(chat_model_cls: type) -> bool:
+    """Whether a langchain chat model class implements `bind_tools`, older integrations do not."""
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+    return getattr(chat_model_cls, "bind_tools", None) not in (None, BaseChatModel.bind_tools)
+
+
+def _text(content: Any) -> str:
+    # Some providers return a list of content blocks alongside the tool calls.
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else f"{block}" for block in content
+        )
+    return content or ""
+
+
+def to_tool_response(message: Any) -> ToolResponse:
+    """Converts the langchain message returned by a chat model bound to tools."""
+    calls: List[ToolCall] = [
+        ToolCall(name=call["name"], arguments=call.get("args") or {}, id=call.get("id"))
+        for call in getattr(message, "tool_calls", None) or []
+    ]
+    return ToolResponse(content=_text(message.content), tool_calls=tuple(calls))
@@ -1,10 +1,12 @@
 import logging
-from typing import Any
-from openai import OpenAI
+from typing import Any, ClassVar
+from openai import AsyncOpenAI, OpenAI
 from openai._exceptions import AuthenticationError
 
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel, LLMConfigModel
+from openagi.llms.clients import get_http_client, get_shared_async_client, get_shared_client
+from openagi.llms.messages import to_messages
 from openagi.utils.yamlParse import read_from_env
 
 
@@ -23,17 +25,36 @@ class XAIModel(LLMBaseModel):
     This class implements the specific logic required to work with XAI service.
     """
 
+    supports_messages: ClassVar[bool] = True
     config: Any
     system_prompt: str = "You are an AI assistant"
+    async_llm: Any = None
 
     def load(self):
         """Initializes the XAI instance with configurations."""
-        self.llm = OpenAI(
+        self.llm = get_shared_client(
+            OpenAI,
             api_key = self.config.xai_api_key,
-            base_url = self.config.base_url
+            base_url = self.config.base_url,
+            http_client = get_http_client()
         )
         return self.llm
 
+    def aload(self):
+        """Returns the async XAI client of the running loop, its connections being bound to it."""
+        self.async_llm = get_shared_async_client(
+            AsyncOpenAI,
+            api_key = self.config.xai_api_key,
+            base_url = self.config.base_url,
+        )
+        return self.async_llm
+
+    def _get_messages(self, prompt: Any):
+        messages = to_messages(prompt)
+        if messages[0]["role"] == "system":
+            return messages
+        return [{"role": "system", "content": f"{self.system_prompt}"}, *messages]
+
     def run(self, prompt : Any):
         """Runs the XAI model with the provided input text.
 
@@ -50,22 +71,68 @@ class XAIModel(LLMBaseModel):
             raise ValueError("`llm` attribute not set.")
         try:
             chat_completion = self.llm.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"{self.system_prompt}",
-                },
-                {
-                    "role": "user",
-                    "content": f"{prompt}",
-                },
-                       ],
-            model=self.config.model_name
+                messages=self._get_messages(prompt),
+                model=self.config.model_name
             )
         except AuthenticationError:
             raise OpenAGIException("Authentication failed. Please check your XAI_API_KEY.")
         return chat_completion.choices[0].message.content
 
+    async def arun(self, prompt: Any):
+        """Asynchronously runs the XAI model with the provided input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        async_llm = self.aload()
+        try:
+            chat_completion = await async_llm.chat.completions.create(
+                messages=self._get_messages(prompt),
+                model=self.config.model_name
+            )
+        except AuthenticationError:
+            raise OpenAGIException("Authentication failed. Please check your XAI_API_KEY.")
+        return chat_completion.choices[0].message.content
+
+    def stream(self, prompt: Any):
+        """Streams the response of the XAI model to the input text, chunk by chunk."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        if not self.llm:
+            self.load()
+        if not self.llm:
+            raise ValueError("`llm` attribute not set.")
+        try:
+            chat_stream = self.llm.chat.completions.create(
+                messages=self._get_messages(prompt),
+                model=self.config.model_name,
+                stream=True,
+            )
+        except AuthenticationError:
+            raise OpenAGIException("Authentication failed. Please check your XAI_API_KEY.")
+        try:
+            for chunk in chat_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Closing the response stops the generation when the consumer stops early.
+            chat_stream.close()
+
+    async def astream(self, prompt: Any):
+        """Asynchronously streams the response of the XAI model to the input text."""
+        logging.info(f"Running LLM - {self.__class__.__name__}")
+        async_llm = self.aload()
+        try:
+            chat_stream = await async_llm.chat.completions.create(
+                messages=self._get_messages(prompt),
+                model=self.config.model_name,
+                stream=True,
+            )
+        except AuthenticationError:
+            raise OpenAGIException("Authentication failed. Please check your XAI_API_KEY.")
+        try:
+            async for chunk in chat_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await chat_stream.close()
+
     @staticmethod
     def load_from_env_config() -> XAIConfigModel:
         """Loads the XAI configurations from a YAML file.
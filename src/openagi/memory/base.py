@@ -56,6 +56,14 @@ class BaseMemory(BaseModel):
         if self.long_term:
             logging.info(f"Long-term memory enabled. Using directory: {self.long_term_dir}")
 
+    def new_session(self) -> "BaseMemory":
+        """Returns a memory for a new session, sharing the storage clients and the settings."""
+        session_id = uuid4().hex
+        logging.info(f"Session ID initialized: {session_id}")
+        return self.model_copy(
+            update={"session_id": session_id, "storage": self.storage.with_collection(session_id)}
+        )
+
     @staticmethod
     def clear_long_term_memory(directory: str):
         """Clears all data from the specified long-term memory directory."""
@@ -0,0 +1,190 @@
+import logging
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from openagi.llms.messages import Message, merge_messages
+from openagi.llms.tokens import approximate_tokens
+
+
+def extractive_summary(text: str, num_sentences: int = 3) -> str:
+    """Creates a simple summary of the text by selecting its top scoring sentences."""
+    sentences = [
+        s.strip()
+        for s in re.split(r"(?<=[.!?])\s+", re.sub(r"\s+", " ", text))
+        if len(s.strip()) > 10
+    ]
+    if len(sentences) <= num_sentences:
+        return " ".join(sentences)
+
+    word_freq = Counter(" ".join(sentences).lower().split())
+
+    def score(sentence):
+        words = sentence.lower().split()
+        return sum(word_freq[word] for word in words) / (len(words) + 1)
+
+    top_sentences = sorted(
+        range(len(sentences)), key=lambda indx: score(sentences[indx]), reverse=True
+    )[:num_sentences]
+    return " ".join(sentences[indx] for indx in sorted(top_sentences))
+
+
+class Scratchpad:
+    """
+    Thought/Action/Observation history of an agent loop, kept within a token budget.
+
+    Iterating over the scratchpad yields the entries to be put in the prompt, and
+    `render_messages` returns them as chat messages tagged with the role of each entry, e.g.
+    the actions of the agent as `assistant` messages. The `pinned` first entries are always
+    kept as is. When the entries exceed `token_budget`, the ones older
+    than the `keep_recent` last entries are replaced by an extractive summary and, if that is
+    not enough, elided. The recent entries are compacted only as a last resort. Without a
+    `token_budget` the entries are returned unchanged.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        keep_recent: int = 6,
+        pinned: int = 0,
+        count_tokens: Callable[[str], int] = approximate_tokens,
+        compact_threshold: int = 64,
+        head_chars: int = 200,
+        summary_sentences: int = 3,
+    ) -> None:
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.pinned = pinned
+        self.count_tokens = count_tokens
+        self.compact_threshold = compact_threshold
+        self.head_chars = head_chars
+        self.summary_sentences = summary_sentences
+        self.entries: List[str] = []
+        self.roles: List[str] = []
+        self.tokens_saved = 0
+        self._sizes: List[int] = []
+        self._compacted: Dict[int, str] = {}
+        # Last rendering, keyed by the number of entries and the token budget it was computed for.
+        self._rendered: Optional[
+            Tuple[Tuple[int, Optional[int]], List[Optional[str]], Optional[int]]
+        ] = None
+        # Tokens saved by the last rendering of the current entries, counted once in tokens_saved.
+        self._saved: Tuple[int, int] = (0, 0)
+
+    def append(self, entry, role: str = "user") -> None:
+        entry = str(entry)
+        self.entries.append(entry)
+        self.roles.append(role)
+        self._sizes.append(self.count_tokens(entry))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.render_entries())
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens of the entries before compaction."""
+        return sum(self._sizes)
+
+    def _compact(self, indx: int) -> str:
+        """Keeps the head of an entry and replaces the rest with an extractive summary."""
+        if indx not in self._compacted:
+            entry = self.entries[indx]
+            compacted = entry
+            if self._sizes[indx] > self.compact_threshold:
+                summary = extractive_summary(entry[self.head_chars:], self.summary_sentences)
+                candidate = f"{entry[:self.head_chars]} ... [compacted] {summary}"
+                if self.count_tokens(candidate) < self._sizes[indx]:
+                    compacted = candidate
+            self._compacted[indx] = compacted
+        return self._compacted[indx]
+
+    def render_entries(self) -> List[str]:
+        """Returns the entries to be put in the prompt, compacted to fit the token budget."""
+        rendered, _ = self._render()
+        return [entry for entry in rendered if entry is not None]
+
+    def render_messages(self) -> List[Message]:
+        """
+        Returns the entries as chat messages, compacted to fit the token budget. Consecutive
+        entries of the same role make up a single message.
+        """
+        roles = list(self.roles)
+        rendered, marker_indx = self._render()
+        if marker_indx is not None:
+            roles[marker_indx] = "user"
+        return merge_messages(
+            {"role": role, "content": entry}
+            for role, entry in zip(roles, rendered)
+            if entry is not None
+        )
+
+    def _render(self) -> Tuple[List[Optional[str]], Optional[int]]:
+        """
+        Returns the entries compacted to fit the token budget, the elided ones being None, and
+        the index of the marker replacing the first elided entry, if any. The rendering is
+        computed again only once the entries or the token budget change, and the tokens it saves
+        are counted once per entries, whatever the number of renderings.
+        """
+        key = (len(self.entries), self.token_budget)
+        if self._rendered is None or self._rendered[0] != key:
+            rendered, marker_indx, saved = self._compute_render()
+            count, previous = self._saved
+            self.tokens_saved += saved - (previous if count == len(self.entries) else 0)
+            self._saved = (len(self.entries), saved)
+            self._rendered = (key, rendered, marker_indx)
+        _, rendered, marker_indx = self._rendered
+        return list(rendered), marker_indx
+
+    def _compute_render(self) -> Tuple[List[Optional[str]], Optional[int], int]:
+        rendered: List[Optional[str]] = list(self.entries)
+        if not self.token_budget:
+            return rendered, None, 0
+
+        sizes = list(self._sizes)
+        original_total = total = sum(sizes)
+        if total <= self.token_budget:
+            return rendered, None, 0
+
+        compressible = range(self.pinned, max(self.pinned, len(rendered) - self.keep_recent))
+        for indx in compressible:
+            if total <= self.token_budget:
+                break
+            rendered[indx] = self._compact(indx)
+            size = self.count_tokens(rendered[indx])
+            total -= sizes[indx] - size
+            sizes[indx] = size
+
+        elided = []
+        for indx in compressible:
+            if total <= self.token_budget:
+                break
+            total -= sizes[indx]
+            rendered[indx] = None
+            elided.append(indx)
+
+        if elided:
+            marker = f"[{len(elided)} earlier entries were elided to fit the token budget]"
+            rendered[elided[0]] = marker
+            total += self.count_tokens(marker)
+
+        # Recent entries are only compacted when eliding the older ones was not enough.
+        for indx in range(max(self.pinned, len(rendered) - self.keep_recent), len(rendered)):
+            if total <= self.token_budget:
+                break
+            rendered[indx] = self._compact(indx)
+            size = self.count_tokens(rendered[indx])
+            total -= sizes[indx] - size
+            sizes[indx] = size
+
+        if total > self.token_budget:
+            logging.warning(
+                f"Scratchpad exceeds the token budget of {self.token_budget} with {total} tokens."
+            )
+
+        return rendered, elided[0] if elided else None, original_total - total
+
+    def render(self) -> str:
+        return "\n".join(self)
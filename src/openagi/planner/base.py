@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Optional, List
 
 from pydantic import BaseModel, Field
@@ -26,3 +27,17 @@ class BasePlanner(BaseModel):
     def plan(self, query: str, description: str, long_term_context: str, supported_actions: List[BaseAction],*args,
         **kwargs,) -> Dict:
         raise NotImplementedError("Subclasses must implement this method.")
+
+    async def aplan(
+        self,
+        query: str,
+        description: str,
+        long_term_context: str,
+        supported_actions: List[BaseAction],
+        *args,
+        **kwargs,
+    ) -> Dict:
+        """Plans the tasks asynchronously. Defaults to running `plan` in a worker thread."""
+        return await asyncio.to_thread(
+            self.plan, query, description, long_term_context, supported_actions, *args, **kwargs
+        )
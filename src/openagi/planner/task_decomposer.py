@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re
@@ -8,7 +9,7 @@ from pydantic import Field
 from openagi.actions.base import BaseAction
 from openagi.actions.human_input import HumanCLIInput
 from openagi.exception import LLMResponseError
-from openagi.llms.azure import LLMBaseModel
+from openagi.llms.base import LLMBaseModel
 from openagi.planner.base import BasePlanner
 from openagi.prompts.base import BasePrompt
 from openagi.prompts.constants import CLARIFIYING_VARS
@@ -205,6 +206,47 @@ class TaskPlanner(BasePlanner):
         print(f"\n\nTasks: {tasks}\n\n")
         return tasks
 
+    async def aplan(
+        self,
+        query: str,
+        description: str,
+        long_term_context : str,
+        supported_actions: List[Dict],
+        *args,
+        **kwargs,
+    ) -> Dict:
+        """
+        Async counterpart of `plan`. Human clarification, when enabled, waits for the
+        user input in a worker thread.
+        """
+        planner_vars = dict(
+            objective=query,
+            task_descriptions=description,
+            supported_actions=supported_actions,
+            previous_context=long_term_context,
+            *args,
+            **kwargs,
+        )
+
+        if self.human_intervene:
+            planner_vars = await asyncio.to_thread(self.human_clarification, planner_vars)
+
+        prompt_template = self.get_prompt()
+
+        prompt: str = prompt_template.from_template(variables=planner_vars)
+        resp = await self.llm.arun(prompt)
+
+        tasks = await self._aextract_task_with_retry(resp, prompt)
+
+        if not tasks:
+            raise LLMResponseError(
+                "Note: This not a error => No tasks was planned in the Planner "
+                "response. Tweak the prompt and actions, then try again"
+            )
+
+        logging.debug(f"Tasks: {tasks}")
+        return tasks
+
     def _extract_task_with_retry(self, llm_response: str, prompt: str) -> Dict:
         """
         Attempts to extract a task from the given LLM response, retrying up to a specified threshold if the response is not valid JSON.
@@ -233,3 +275,23 @@ class TaskPlanner(BasePlanner):
                 llm_response = self.llm.run(prompt)
 
         raise LLMResponseError("Failed to extract tasks after multiple retries.")
+
+    async def _aextract_task_with_retry(self, llm_response: str, prompt: str) -> Dict:
+        """
+        Async counterpart of `_extract_task_with_retry`.
+        """
+        retries = 0
+        while retries < self.retry_threshold:
+            try:
+                resp = self._extract_task_from_response(llm_response=llm_response)
+                logging.debug(f"\n\nExtracted Task: {resp}\n\n")
+                return resp
+            except json.JSONDecodeError:
+                retries += 1
+                logging.info(
+                    f"Retrying task extraction {retries}/{self.retry_threshold} "
+                    "due to an error parsing the JSON response."
+                )
+                llm_response = await self.llm.arun(prompt)
+
+        raise LLMResponseError("Failed to extract tasks after multiple retries.")
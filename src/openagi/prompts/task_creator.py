@@ -59,6 +59,9 @@ You are a task-creator AI for OpenAGI. Your job is to decompose tasks into the s
 - Consider the previous context provided when creating tasks, using relevant information to improve task planning and execution.
 - Carefully review the feedback from previous interactions and ensure that past mistakes are not repeated.
 - Incorporate lessons learned from previous attempts to improve the current task creation and worker assignment process.
+- List in "depends_on" only the earlier tasks whose results are needed to execute the task, so \
+that independent tasks can be executed in parallel. Use an empty list when the task does not \
+need the result of any other task.
 
 **Inputs**
 - Task_Objectives: {objective}
@@ -68,13 +71,16 @@ You are a task-creator AI for OpenAGI. Your job is to decompose tasks into the s
     - This includes a 'feedback' field containing user comments on previous task executions.
 
 **Output Format**
-Return the tasks in JSON format with the keys "task_name", "description", and "worker_id" and nothing else. Ensure the JSON format is suitable for utilization with `JSON.parse()`, enclosed in triple backticks.
+Return the tasks in JSON format with the keys "task_name", "description", "worker_id" and \
+"depends_on" and nothing else. Ensure the JSON format is suitable for utilization with \
+`JSON.parse()`, enclosed in triple backticks.
 ```json
 [
     {
         "task_name": "<name of the task of type string>",
         "description": "<description of the task of type string>",
-        "worker_id": "<id of the worker from Supported_Workers relevant to the task>"
+        "worker_id": "<id of the worker from Supported_Workers relevant to the task>",
+        "depends_on": ["<task_name of the earlier tasks whose results are required by this task>"]
     }
 ]
 ```
@@ -109,7 +115,9 @@ Your expertise lies in comprehending the nuances of `Task_Objectives` and `Task_
 **Core Requirements:**
 1. Atomic Task Decomposition: Break down tasks to their most fundamental, indivisible units.
 2. Action Alignment: Each micro-task must correspond to exactly one supported action.
-3. Sequential Logic: Ensure a clear, logical progression from one micro-task to the next.
+3. Sequential Logic: Ensure a clear, logical progression from one micro-task to the next. List \
+in "depends_on" only the task_ids of the earlier tasks whose output is needed, so that \
+independent tasks can run in parallel.
 4. Worker Specialization: Assign tasks to Workers based on their expertise and the required actions. Be clever to not assign more workers, for relevant task one worker should do.
 5. Goal Orientation: Every micro-task must directly contribute to the overarching objective.
 6. Context Utilization: Leverage the provided previous context to inform task creation and worker assignment.
@@ -134,7 +142,9 @@ Your expertise lies in comprehending the nuances of `Task_Objectives` and `Task_
     - This includes a 'feedback' field containing user comments on previous task executions.
 
 **Output Specification:**
-Generate a JSON-parseable array of Workers and their assigned tasks, each containing "worker_name", "role", "instruction", "task_id", "description", and "supported_actions" keys. Enclose the output in triple backticks.
+Generate a JSON-parseable array of Workers and their assigned tasks, each containing \
+"worker_name", "role", "instruction", "task_id", "description", "supported_actions" and \
+"depends_on" keys. Enclose the output in triple backticks.
 
 **Important Note on task_id:**
 The task_id should be a sequential number for the task (i.e., 1, 2, 3, 4) represented as a string.
@@ -148,7 +158,9 @@ The task_id should be a sequential number for the task (i.e., 1, 2, 3, 4) repres
         "task_id": "<sequential number as string, e.g., "1", "2", "3">",
         "task_name": "<concise, action-oriented name that includes supported actions information>",
         "description": "<detailed, step-by-step instructions including error handling>",
-        "supported_actions": ["<list of required actions in str for this Worker>"]
+        "supported_actions": ["<list of required actions in str for this Worker>"],
+        "depends_on": ["<task_id of the earlier tasks whose output is required, \
+empty list if none>"]
     },
     {
         "worker_name": "ExpertWorker2",
@@ -24,3 +24,7 @@ class BaseStorage(BaseModel):
     @classmethod
     def from_kwargs(cls, **kwargs):
         raise NotImplementedError("Subclasses must implement this method.")
+
+    def with_collection(self, collection_name: str) -> "BaseStorage":
+        """Returns a storage for another collection, sharing the client of this storage."""
+        raise NotImplementedError("Subclasses must implement this method.")
@@ -32,6 +32,11 @@ class ChromaStorage(BaseStorage):
         logging.debug(f"Collection: Name - {_collection.name}, ID - {_collection.id}")
         return cls(client=_client, collection=_collection)
 
+    def with_collection(self, collection_name: str) -> "ChromaStorage":
+        """Returns a storage for another collection, sharing the client of this storage."""
+        _collection = self.client.get_or_create_collection(collection_name)
+        return self.model_copy(update={"collection": _collection})
+
     def save_document(self, id, document, metadata):
         """Create a new document in the ChromaDB collection."""
 
@@ -1,2 +1,3 @@
 from openagi.tasks.task import Task
 from openagi.tasks.lists import TaskLists
+from openagi.tasks.graph import TaskGraph
@@ -0,0 +1,81 @@
+from typing import Dict, List, Set
+
+from openagi.exception import OpenAGIException
+from openagi.tasks.task import Task
+
+
+class TaskGraph:
+    """Dependency graph of the planned tasks, used to find the tasks that are ready to run.
+
+    When none of the tasks carry `depends_on`, every task depends on the one planned
+    before it, which keeps the sequential execution order of plans without dependencies.
+    """
+
+    def __init__(self, tasks: List[Task]) -> None:
+        self.order: List[str] = [task.id for task in tasks]
+        self.tasks: Dict[str, Task] = {task.id: task for task in tasks}
+        self.upstream: Dict[str, List[str]] = {}
+        self.running: Set[str] = set()
+        self.completed: Set[str] = set()
+
+        has_dependencies = any(task.depends_on is not None for task in tasks)
+        for indx, task in enumerate(tasks):
+            if has_dependencies:
+                deps = [dep for dep in task.depends_on or [] if dep in self.tasks]
+            else:
+                deps = [tasks[indx - 1].id] if indx else []
+            self.upstream[task.id] = deps
+
+        self._validate()
+
+    def _validate(self):
+        """Raises if the dependencies contain a cycle, since such a plan can never complete."""
+        visiting, visited = set(), set()
+
+        def visit(task_id: str):
+            if task_id in visited:
+                return
+            if task_id in visiting:
+                raise OpenAGIException(
+                    f"Cyclic dependency found for task {self.tasks[task_id].name}."
+                )
+            visiting.add(task_id)
+            for dep in self.upstream[task_id]:
+                visit(dep)
+            visiting.remove(task_id)
+            visited.add(task_id)
+
+        for task_id in self.order:
+            visit(task_id)
+
+    def ready_tasks(self) -> List[Task]:
+        """Returns the tasks, in planned order, whose upstream tasks are all completed."""
+        return [
+            self.tasks[task_id]
+            for task_id in self.order
+            if task_id not in self.running
+            and task_id not in self.completed
+            and all(dep in self.completed for dep in self.upstream[task_id])
+        ]
+
+    def mark_running(self, task_id: str):
+        self.running.add(task_id)
+
+    def mark_completed(self, task_id: str):
+        self.running.discard(task_id)
+        self.completed.add(task_id)
+
+    @property
+    def all_tasks_completed(self) -> bool:
+        return len(self.completed) == len(self.order)
+
+    def ancestors(self, task_id: str) -> List[Task]:
+        """Returns all the direct and transitive upstream tasks of a task, in planned order."""
+        found = set()
+        stack = list(self.upstream[task_id])
+        while stack:
+            dep = stack.pop()
+            if dep not in found:
+                found.add(dep)
+                stack.extend(self.upstream[dep])
+        return [self.tasks[tid] for tid in self.order if tid in found]
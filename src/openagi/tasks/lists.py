@@ -1,3 +1,4 @@
+import logging
 from queue import Queue
 from typing import Dict, List, Optional
 from openagi.tasks.task import Task
@@ -13,10 +14,12 @@ class TaskLists:
         self.tasks.put(task)
 
     def add_tasks(self, tasks: List[Dict[str, str]]):
-        for task in tasks:
+        planned_tasks = []
+        task_refs: Dict[str, str] = {}
+        for indx, task in enumerate(tasks):
             task["name"] = task["task_name"]
             worker_config: Optional[Dict[str, str]] = None
-            
+
             if all(key in task for key in ["role", "instruction", "worker_name", "supported_actions"]):
                 worker_config = {
                     "role": task["role"],
@@ -25,7 +28,36 @@ class TaskLists:
                     "supported_actions": task["supported_actions"]
                 }
             task["worker_config"] = worker_config
-            self.add_task(Task(**task))
+            depends_on = task.pop("depends_on", None)
+            cur_task = Task(**task)
+            planned_tasks.append((cur_task, depends_on))
+
+            # Planner may refer to an earlier task by its task_id, position or name.
+            task_refs.setdefault(str(indx + 1), cur_task.id)
+            task_refs.setdefault(cur_task.name, cur_task.id)
+            if task.get("task_id") is not None:
+                task_refs[str(task["task_id"])] = cur_task.id
+
+        for cur_task, depends_on in planned_tasks:
+            if depends_on is not None:
+                cur_task.depends_on = self._resolve_dependencies(cur_task, depends_on, task_refs)
+            self.add_task(cur_task)
+
+    @staticmethod
+    def _resolve_dependencies(task: Task, depends_on, task_refs: Dict[str, str]) -> List[str]:
+        """Maps the dependency references given by the planner to the ids of the planned tasks."""
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+
+        resolved = []
+        for ref in depends_on:
+            task_id = task_refs.get(str(ref).strip())
+            if not task_id or task_id == task.id:
+                logging.warning(f"Ignoring unknown dependency `{ref}` for task {task.name}.")
+                continue
+            if task_id not in resolved:
+                resolved.append(task_id)
+        return resolved
 
     def get_tasks_queue(self) -> List:
         return self.tasks
@@ -39,6 +71,13 @@ class TaskLists:
             return self.tasks.get_nowait()
         return None
 
+    def get_unprocessed_tasks(self) -> List[Task]:
+        """Retrieves all the unprocessed tasks from the queue, in the planned order."""
+        tasks = []
+        while not self.tasks.empty():
+            tasks.append(self.tasks.get_nowait())
+        return tasks
+
     @property
     def all_tasks_completed(self) -> bool:
         """Checks if all tasks in the queue have been processed."""
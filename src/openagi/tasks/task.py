@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +22,14 @@ class Task(BaseModel):
     worker_config: Optional[Dict[str, Any]] = Field(
         description="Stores workers configuration values"
     )
+    depends_on: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Ids of the tasks whose results are required before this task "
+            "can run. None when the plan has no dependency information."
+        ),
+    )
+
     @property
     def is_done(self):
         return bool(self.result)
@@ -0,0 +1,80 @@
+import atexit
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from openagi import BASE_PATH
+from openagi.tracing.base import BaseTraceSink, NullTraceSink
+from openagi.tracing.jsonl import JSONLTraceSink
+from openagi.tracing.reader import read_trace, replay_prompts
+
+_config = {
+    "enabled": os.environ.get("OPENAGI_TRACE", "true").lower() not in ("0", "false", "no", "off"),
+    "trace_dir": os.environ.get("OPENAGI_TRACE_DIR", str(Path(BASE_PATH) / "traces")),
+}
+_sinks: Dict[str, BaseTraceSink] = {}
+_lock = threading.Lock()
+_null_sink = NullTraceSink()
+
+
+def configure(enabled: Optional[bool] = None, trace_dir: Optional[str] = None):
+    """
+    Configures the traces of the LLM prompts, one `{trace_dir}/{session_id}.jsonl.gz` file per
+    session.
+
+    Defaults to the `OPENAGI_TRACE` and `OPENAGI_TRACE_DIR` environment variables. The sinks that
+    are already open are closed, so that the new configuration applies to the next events.
+    """
+    if enabled is not None:
+        _config["enabled"] = enabled
+    if trace_dir is not None:
+        _config["trace_dir"] = trace_dir
+    close_all()
+
+
+def get_trace_sink(session_id: str) -> BaseTraceSink:
+    """Returns the trace sink of the session, shared by all the workers of the session."""
+    if not _config["enabled"]:
+        return _null_sink
+
+    with _lock:
+        sink = _sinks.get(session_id)
+        if sink is None:
+            path = Path(_config["trace_dir"]) / f"{session_id}.jsonl.gz"
+            logging.debug(f"Writing traces of session {session_id} to {path}")
+            sink = _sinks[session_id] = JSONLTraceSink(str(path))
+        return sink
+
+
+def close_trace_sink(session_id: str):
+    """Closes the trace sink of the session, if open, writing its buffered events."""
+    with _lock:
+        sink = _sinks.pop(session_id, None)
+    if sink is not None:
+        sink.close()
+
+
+def close_all():
+    """Closes all the open trace sinks, writing their buffered events."""
+    with _lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
+
+
+atexit.register(close_all)
+
+__all__ = [
+    "BaseTraceSink",
+    "NullTraceSink",
+    "JSONLTraceSink",
+    "configure",
+    "get_trace_sink",
+    "close_trace_sink",
+    "close_all",
+    "read_trace",
+    "replay_prompts",
+]
@@ -0,0 +1,52 @@
+import os
+import time
+from typing import Any, Dict
+
+
+class BaseTraceSink:
+    """
+    Base Trace Sink class to be inherited by other trace sinks.
+
+    Prompts are recorded as deltas: only the part of a prompt that differs from the previous
+    prompt of the same stream is emitted, along with the length of the prefix they share.
+    """
+
+    def __init__(self) -> None:
+        self._last_prompts: Dict[str, str] = {}
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Records a single trace event."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def record_prompt(self, stream: str, iteration: int, prompt: str, **metadata) -> None:
+        """Records the prompt sent to the LLM at the given iteration of a stream, e.g. a task."""
+        previous = self._last_prompts.get(stream, "")
+        prefix = len(os.path.commonprefix([previous, prompt]))
+        self._last_prompts[stream] = prompt
+        self.emit(
+            {
+                "type": "prompt",
+                "ts": time.time(),
+                "stream": stream,
+                "iteration": iteration,
+                "prefix": prefix,
+                "delta": prompt[prefix:],
+                **metadata,
+            }
+        )
+
+    def flush(self) -> None:
+        """Writes the buffered events."""
+
+    def close(self) -> None:
+        """Writes the buffered events and releases the sink."""
+
+
+class NullTraceSink(BaseTraceSink):
+    """Trace sink used when tracing is disabled, dropping every event."""
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def record_prompt(self, stream: str, iteration: int, prompt: str, **metadata) -> None:
+        pass
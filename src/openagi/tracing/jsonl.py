@@ -0,0 +1,74 @@
+import gzip
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from openagi.tracing.base import BaseTraceSink
+
+_CLOSE = object()
+
+
+class JSONLTraceSink(BaseTraceSink):
+    """
+    Trace sink appending the events to a gzip compressed JSONL file.
+
+    Events are queued by the caller and written by a background thread, so recording them never
+    waits on the disk. The file is flushed whenever no event was queued for `flush_interval`
+    seconds.
+    """
+
+    def __init__(
+        self, path: str, flush_interval: float = 1.0, max_queue_size: int = 10000
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._write_events, name=f"trace-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            logging.warning(f"Trace queue for {self.path} is full, dropping event.")
+
+    def _write_events(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Appending to a gzip file adds a new member, which readers concatenate transparently.
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            while True:
+                try:
+                    event = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    f.flush()
+                    continue
+
+                if event is _CLOSE:
+                    self._queue.task_done()
+                    break
+                try:
+                    f.write(json.dumps(event, default=str) + "\n")
+                except Exception as e:
+                    logging.error(f"Unable to write trace event to {self.path}: {e}")
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Waits until the queued events are handed over to the file."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
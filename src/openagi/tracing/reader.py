@@ -0,0 +1,77 @@
+import argparse
+import gzip
+import json
+import logging
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads the events of a trace file written by `JSONLTraceSink`.
+
+    A file that was not closed properly, e.g. when the process was killed, is read up to its
+    last complete event.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping incomplete trace event in {path}.")
+        except (EOFError, zlib.error):
+            logging.warning(
+                f"Trace file {path} is truncated, stopping at the last complete event."
+            )
+
+
+def replay_prompts(path: str, stream: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Reconstructs the full prompts recorded in a trace file.
+
+    Args:
+        path (str): Path of the trace file.
+        stream (Optional[str]): Only replay the prompts of this stream.
+
+    Yields:
+        Dict[str, Any]: The prompt events, with the full prompt under `prompt` instead of the
+            delta.
+    """
+    last_prompts: Dict[str, str] = {}
+    for event in read_trace(path):
+        if event.get("type") != "prompt":
+            continue
+        previous = last_prompts.get(event["stream"], "")
+        prompt = previous[: event["prefix"]] + event["delta"]
+        last_prompts[event["stream"]] = prompt
+
+        if stream is None or event["stream"] == stream:
+            event = {key: value for key, value in event.items() if key not in ("prefix", "delta")}
+            event["prompt"] = prompt
+            yield event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay OpenAGI trace files.")
+    parser.add_argument("path", help="Path of the trace file.")
+    parser.add_argument("--stream", help="Only show the prompts of this stream.")
+    parser.add_argument("--iteration", type=int, help="Print the full prompt of this iteration.")
+    args = parser.parse_args()
+
+    for event in replay_prompts(args.path, stream=args.stream):
+        if args.iteration is None:
+            print(
+                f"{event['stream']}\titeration={event['iteration']}\tchars={len(event['prompt'])}"
+            )
+        elif event["iteration"] == args.iteration:
+            print(f"{'=' * 20} {event['stream']} - iteration {event['iteration']} {'=' * 20}")
+            print(event["prompt"])
+
+
+if __name__ == "__main__":
+    main()
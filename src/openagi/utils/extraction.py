@@ -1,18 +1,16 @@
+import copy
 import importlib
-import json
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from openagi.exception import OpenAGIException
 from openagi.llms.base import LLMBaseModel
+from openagi.utils.json_blocks import parse_json_blocks
+from openagi.utils.json_repair import MIN_REPAIR_CONFIDENCE, count_repair, repair_json
 
 
-def force_json_output(resp_txt: str, llm) -> str:
-    """
-    Forces proper JSON output format in first attempt.
-    """
-    prompt = """
+JSON_FORMATTING_PROMPT = """
         You are a JSON formatting expert. Your task is to process the input and provide a valid JSON output.
         
         FOLLOW THESE INSTRUCTIONS to convert:
@@ -24,57 +22,194 @@ def force_json_output(resp_txt: str, llm) -> str:
         Output only the JSON:
         """.strip()
 
-    prompt = prompt.replace("{resp_txt}", resp_txt)
+
+def force_json_output(resp_txt: str, llm) -> str:
+    """
+    Forces proper JSON output format in first attempt.
+    """
+    prompt = JSON_FORMATTING_PROMPT.replace("{resp_txt}", resp_txt)
     return llm.run(prompt)
 
 
+async def aforce_json_output(resp_txt: str, llm) -> str:
+    """
+    Async counterpart of `force_json_output`.
+    """
+    prompt = JSON_FORMATTING_PROMPT.replace("{resp_txt}", resp_txt)
+    return await llm.arun(prompt)
+
+
+def force_json_outputs(resp_txts: List[str], llm) -> List[str]:
+    """
+    Forces proper JSON output format for several responses with a single batch of LLM calls.
+    """
+    return llm.run_batch(
+        [JSON_FORMATTING_PROMPT.replace("{resp_txt}", resp_txt) for resp_txt in resp_txts]
+    )
+
+
+async def aforce_json_outputs(resp_txts: List[str], llm) -> List[str]:
+    """
+    Async counterpart of `force_json_outputs`.
+    """
+    return await llm.arun_batch(
+        [JSON_FORMATTING_PROMPT.replace("{resp_txt}", resp_txt) for resp_txt in resp_txts]
+    )
+
+
+def _parse_last_json_block(text: str) -> Tuple[bool, Optional[Any], Optional[str]]:
+    """
+    Parses the last ```json block of the text, or the last JSON object of the text when it has no
+    ```json block.
+
+    Returns:
+        Tuple[bool, Optional[Any], Optional[str]]: Whether the block was parsed, the parsed
+        JSON and the raw block, which is used to request a reformat when it is malformed.
+    """
+    blocks = parse_json_blocks(text)
+    fenced = [block for block in blocks if block.fenced]
+    candidates = fenced or [
+        block for block in blocks if block.valid and isinstance(block.value, dict)
+    ]
+    if not candidates:
+        return False, None, None
+
+    last = candidates[-1]
+    if not last.valid:
+        logging.info(f"JSON parsing failed: {last.error}")
+        return False, None, last.text
+    # The parsed blocks are memoized, the caller gets its own copy.
+    return True, copy.deepcopy(last.value), last.text
+
+
+def _extract_last_json(
+    text: str, min_confidence: float
+) -> Tuple[bool, Optional[Any], Optional[str]]:
+    """
+    Extracts the last JSON block of the text, repairing it locally when it is malformed.
+
+    Returns:
+        Tuple[bool, Optional[Any], Optional[str]]: Whether the JSON was extracted, the JSON and
+        the raw block, which is sent to the LLM when the local repair is not confident enough.
+    """
+    parsed, output, last_json = _parse_last_json_block(text)
+    if parsed:
+        count_repair("parsed")
+        return True, output, last_json
+
+    # Only a malformed block, or a response made of a bare object, is worth repairing. The prose
+    # around a JSON object, e.g. citations like [1], repairs into arrays the agents cannot use.
+    candidate = last_json or (text if text.lstrip().startswith("{") else None)
+    if candidate is None:
+        return False, None, None
+    repaired = repair_json(candidate)
+    if repaired is not None and not isinstance(repaired.value, dict):
+        logging.info(f"Locally repaired JSON is not an object: {type(repaired.value).__name__}.")
+        repaired = None
+    if repaired is not None and repaired.confidence >= min_confidence:
+        logging.info(
+            f"Repaired JSON locally with {', '.join(repaired.fixes)} "
+            f"(confidence {repaired.confidence})."
+        )
+        count_repair("repaired")
+        return True, repaired.value, last_json
+    if repaired is not None:
+        logging.info(
+            f"Local JSON repair not confident enough ({repaired.confidence}): "
+            f"{', '.join(repaired.fixes)}."
+        )
+    return False, None, last_json
+
+
+def _reparse_json(text: str) -> Optional[Any]:
+    """Parses the JSON reformatted by the LLM, which is not repaired again."""
+    parsed, output, _ = _parse_last_json_block(text)
+    count_repair("llm" if parsed else "failed")
+    return output
+
+
 def get_last_json(
-    text: str, llm: Optional[LLMBaseModel] = None, max_iterations: int = 5
+    text: str,
+    llm: Optional[LLMBaseModel] = None,
+    max_iterations: int = 5,
+    min_confidence: float = MIN_REPAIR_CONFIDENCE,
 ) -> Optional[Dict]:
     """
-    Extracts valid JSON from text with improved reliability.
+    Extracts the last JSON object or array of the text, preferring the ```json blocks. Malformed
+    JSON is repaired locally first, and only reformatted by the `llm`, if given, when the repair
+    fails or its confidence is below `min_confidence`.
     """
-    # More precise JSON block pattern
-    pattern = r"```json\s*(\{[\s\S]*?\})\s*```"
-    matches = re.findall(pattern, text, re.MULTILINE)
-    
-    if matches:
-        try:
-            last_json = matches[-1].strip()
-            last_json = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', last_json)
-            last_json = re.sub(r'\s+', ' ', last_json)
-            return json.loads(last_json)
-        except json.JSONDecodeError as e:
-            logging.error(f"JSON parsing failed: {str(e)}", exc_info=True)
-            if llm:
-                text = force_json_output(last_json, llm)
-                return get_last_json(text, None, max_iterations)
-    
+    extracted, output, last_json = _extract_last_json(text, min_confidence)
+    if extracted:
+        return output
+
+    if last_json and llm:
+        text = force_json_output(last_json, llm)
+        return _reparse_json(text)
+
     if llm:
         for iteration in range(1, max_iterations + 1):
             try:
                 text = force_json_output(text, llm)
-                return get_last_json(text, None, max_iterations)
+                return _reparse_json(text)
             except Exception as e:
                 logging.error(f"Attempt {iteration} failed: {str(e)}", exc_info=True)
                 if iteration == max_iterations:
                     raise OpenAGIException(
                         f"Failed to extract valid JSON after {max_iterations} attempts. Last error: {str(e)}"
                     )
+    count_repair("failed")
     return None
 
 
+async def aget_last_json(
+    text: str,
+    llm: Optional[LLMBaseModel] = None,
+    max_iterations: int = 5,
+    min_confidence: float = MIN_REPAIR_CONFIDENCE,
+) -> Optional[Dict]:
+    """
+    Async counterpart of `get_last_json`, reformatting malformed JSON with `llm.arun`.
+    """
+    extracted, output, last_json = _extract_last_json(text, min_confidence)
+    if extracted:
+        return output
+
+    if last_json and llm:
+        text = await aforce_json_output(last_json, llm)
+        return _reparse_json(text)
+
+    if llm:
+        for iteration in range(1, max_iterations + 1):
+            try:
+                text = await aforce_json_output(text, llm)
+                return _reparse_json(text)
+            except Exception as e:
+                logging.error(f"Attempt {iteration} failed: {str(e)}", exc_info=True)
+                if iteration == max_iterations:
+                    raise OpenAGIException(
+                        f"Failed to extract valid JSON after {max_iterations} attempts. "
+                        f"Last error: {str(e)}"
+                    )
+    count_repair("failed")
+    return None
+
 
-def get_act_classes_from_json(json_data) -> List[Tuple[str, Optional[Dict]]]:
+def get_act_classes_from_json(json_data, registry=None) -> List[Tuple[type, Optional[Dict]]]:
     """
     Extracts the Action class names and parameters from a JSON block.
 
     Args:
         json_data (List[Dict]): A list of dictionaries containing the class and parameter information.
+        registry (Optional[ActionRegistry]): The actions that can be run. When given, the classes
+            are looked up in it and unregistered actions are rejected, instead of being imported.
 
     Returns:
         List[Tuple[type, Optional[Dict]]]: A list of tuples containing the Action class and its initialization parameters.
     """
+    if registry is not None:
+        return registry.resolve(json_data)
+
     actions = []
 
     for item in json_data:
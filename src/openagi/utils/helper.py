@@ -1,10 +1,9 @@
 from uuid import uuid4
-from openagi.llms.openai import OpenAIModel
+from openagi.llms.registry import get_llm
 
 
 def get_default_llm():
-    config = OpenAIModel.load_from_env_config()
-    return OpenAIModel(config=config)
+    return get_llm("openai")
 
 
 def get_default_id():
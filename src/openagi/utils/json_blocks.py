@@ -0,0 +1,145 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# What the scanner looks for outside of a block, inside a ```json fence, inside a block and in a
+# string.
+_FENCE = r"```(?:json\b)?"
+_PROSE = re.compile(_FENCE + r"|\{", re.IGNORECASE)
+_FENCED = re.compile(_FENCE + r"|[{\[]", re.IGNORECASE)
+_BLOCK = re.compile(_FENCE + r"|[{}\[\]\"]", re.IGNORECASE)
+_STRING = re.compile(r'["\\]')
+_OBJECT_START = re.compile(r'\s*["}]')
+
+_OPEN = {"{": "}", "[": "]"}
+
+
+class JSONBlock(NamedTuple):
+    """A JSON object or array found in a text, parsed or not."""
+
+    start: int
+    end: int
+    text: str
+    fenced: bool
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+
+def loads_block(text: str) -> Any:
+    """
+    Parses a JSON block as written by an LLM. Raw newlines and tabs are allowed in the strings,
+    and ANSI escape codes are stripped if the block does not parse as is.
+    """
+    try:
+        return json.loads(text, strict=False)
+    except json.JSONDecodeError:
+        cleaned = ANSI_ESCAPE.sub("", text)
+        if cleaned == text:
+            raise
+        return json.loads(cleaned, strict=False)
+
+
+def _block(text: str, start: int, end: int, fenced: bool) -> JSONBlock:
+    raw = text[start:end]
+    try:
+        return JSONBlock(start, end, raw, fenced, loads_block(raw))
+    except json.JSONDecodeError as e:
+        return JSONBlock(start, end, raw, fenced, error=str(e))
+
+
+@lru_cache(maxsize=256)
+def parse_json_blocks(text: str) -> Tuple[JSONBlock, ...]:
+    """
+    Finds and parses the top level JSON objects and arrays of a text in a single pass.
+
+    Blocks inside ```json fences are marked as `fenced`. Outside of the fences only objects are
+    considered, prose being full of brackets. A fence closing before its block is complete, e.g.
+    a truncated response, yields the incomplete block with an error, so that it can be repaired.
+
+    Results are memoized per text, so parsing the same response again is free. The parsed values
+    are shared between the callers and must not be modified.
+
+    Returns:
+        Tuple[JSONBlock, ...]: The blocks in the order of the text, with their offsets.
+    """
+    return tuple(_scan(text, 0, len(text), None))
+
+
+def _scan(text: str, pos: int, end: int, fence: Optional[str]) -> List[JSONBlock]:
+    blocks: List[JSONBlock] = []
+    stack: List[str] = []
+    start = pos
+    # A brace of the prose left open is abandoned: the text after it, up to where the block was
+    # given up, is scanned again without it. The scans left for later, with their end and fence.
+    resumed: List[Tuple[int, Optional[str]]] = []
+
+    while True:
+        match = None
+        if pos < end and not stack:
+            match = (_FENCED if fence == "json" else _PROSE).search(text, pos, end)
+        elif pos < end:
+            match = _BLOCK.search(text, pos, end)
+        if match is None:
+            if stack and fence == "json":
+                # A truncated response ends in the middle of a fenced block.
+                blocks.append(_block(text, start, end, fenced=True))
+            elif stack:
+                resumed.append((end, fence))
+                pos, stack = start + 1, []
+                continue
+            if not resumed:
+                return blocks
+            # Back to the scan the block was abandoned in, where it was given up.
+            pos, stack = end, []
+            end, fence = resumed.pop()
+            continue
+        token = match.group()
+
+        if token.startswith("```") and stack and fence != "json":
+            resumed.append((end, fence))
+            pos, end, stack = start + 1, match.start(), []
+            continue
+        pos = match.end()
+
+        if token.startswith("```"):
+            if stack:
+                # The fence closes before the block does.
+                blocks.append(_block(text, start, match.start(), fenced=True))
+            stack = []
+            if token != "```":
+                fence = "json"
+            else:
+                fence = None if fence else "other"
+        elif not stack:
+            if fence != "json" and not _OBJECT_START.match(text, pos, end):
+                # Braces of the prose, e.g. a template placeholder, are not JSON objects.
+                continue
+            stack.append(_OPEN[token])
+            start = match.start()
+        elif token == '"':
+            # Skips the string, whatever it holds.
+            while True:
+                match = _STRING.search(text, pos, end)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end() + (1 if match.group() == "\\" else 0)
+                if match.group() == '"':
+                    break
+        elif token in _OPEN:
+            stack.append(_OPEN[token])
+        elif token == stack[-1]:
+            stack.pop()
+            if not stack:
+                blocks.append(_block(text, start, pos, fenced=fence == "json"))
+        else:
+            # Mismatched bracket, the block is malformed.
+            blocks.append(_block(text, start, pos, fenced=fence == "json"))
+            stack = []
@@ -0,0 +1,233 @@
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# Minimum confidence of a local repair to be used instead of asking the LLM to reformat the JSON.
+MIN_REPAIR_CONFIDENCE = 0.5
+
+# Confidence lost by each kind of fix. Fixes that may change the meaning of the JSON cost more.
+FIX_PENALTIES: Dict[str, float] = {
+    "trailing_commas": 0.02,
+    "python_literals": 0.05,
+    "comments": 0.05,
+    "single_quotes": 0.1,
+    "unquoted_keys": 0.1,
+    "stray_prose": 0.1,
+    "missing_commas": 0.15,
+    "unquoted_values": 0.25,
+    "stray_characters": 0.25,
+    "truncated": 0.3,
+}
+
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+JSON_LITERALS = ("true", "false", "null")
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$\-]*")
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_ARRAY_START = re.compile(r"\[\s*[\[{\"'\d\-\]tfnTFN]")
+
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+class RepairResult(NamedTuple):
+    """
+    A JSON value repaired locally, with the fixes applied and the confidence that it is what was
+    meant.
+    """
+
+    value: Any
+    text: str
+    confidence: float
+    fixes: Tuple[str, ...]
+
+
+def count_repair(path: str):
+    """Counts the path taken to extract the JSON of a response: parsed, repaired, llm, failed."""
+    with _stats_lock:
+        _stats[path] += 1
+
+
+def repair_stats() -> Dict[str, int]:
+    """
+    Number of responses whose JSON was parsed as is, repaired locally, reformatted by the LLM or
+    not found.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_repair_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _json_start(text: str) -> int:
+    """Returns the index of the JSON value in the text, skipping the prose around it."""
+    obj = text.find("{")
+    match = _ARRAY_START.search(text, 0, obj + 1 if obj != -1 else len(text))
+    return match.start() if match else obj
+
+
+def _read_string(text: str, indx: int, fixes: Set[str]) -> Tuple[str, int]:
+    """Reads the string starting at `indx`, returning it as JSON and the index after it."""
+    quote = text[indx]
+    chars: List[str] = []
+    indx += 1
+    while indx < len(text):
+        char = text[indx]
+        if char == "\\" and indx + 1 < len(text):
+            escaped = text[indx + 1]
+            # \' is not a JSON escape.
+            chars.append("'" if escaped == "'" else char + escaped)
+            indx += 2
+            continue
+        if char == quote:
+            break
+        chars.append('\\"' if char == '"' else char)
+        indx += 1
+    else:
+        fixes.add("truncated")
+    if quote == "'":
+        fixes.add("single_quotes")
+    return '"' + "".join(chars) + '"', indx + 1
+
+
+def _repair(text: str, fixes: Set[str]) -> str:
+    out: List[str] = []
+    stack: List[str] = []
+    last = ""  # Last significant character written.
+    indx = 0
+
+    def value_start():
+        nonlocal last
+        if stack and last and (last in '"}]' or last.isalnum()):
+            out.append(",")
+            fixes.add("missing_commas")
+
+    def drop_trailing_comma():
+        for back in range(len(out) - 1, -1, -1):
+            if out[back].strip():
+                if out[back] == ",":
+                    del out[back]
+                    fixes.add("trailing_commas")
+                return
+
+    while indx < len(text):
+        char = text[indx]
+        if char in "\"'":
+            value_start()
+            string, indx = _read_string(text, indx, fixes)
+            out.append(string)
+            last = '"'
+            continue
+        if char in "{[":
+            value_start()
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+            last = char
+        elif char in "}]":
+            drop_trailing_comma()
+            if char not in stack:
+                fixes.add("stray_characters")
+                indx += 1
+                continue
+            while stack[-1] != char:
+                # A container left open inside this one.
+                out.append(stack.pop())
+                fixes.add("truncated")
+            out.append(stack.pop())
+            last = char
+            if not stack:
+                if text[indx + 1:].strip():
+                    fixes.add("stray_prose")
+                return "".join(out)
+        elif char in ",:":
+            if char == "," and last and last in ",[{":
+                fixes.add("trailing_commas")
+            else:
+                out.append(char)
+                last = char
+        elif char.isspace():
+            out.append(char)
+        elif text.startswith("//", indx) or text.startswith("#", indx):
+            end = text.find("\n", indx)
+            indx = len(text) if end == -1 else end
+            fixes.add("comments")
+            continue
+        elif text.startswith("/*", indx):
+            end = text.find("*/", indx + 2)
+            indx = len(text) if end == -1 else end + 2
+            fixes.add("comments")
+            continue
+        elif (match := _NUMBER.match(text, indx)) is not None:
+            value_start()
+            out.append(match.group())
+            last = "0"
+            indx = match.end()
+            continue
+        elif (match := _IDENTIFIER.match(text, indx)) is not None:
+            word = match.group()
+            indx = match.end()
+            value_start()
+            if word in JSON_LITERALS:
+                out.append(word)
+            elif word in PYTHON_LITERALS:
+                out.append(PYTHON_LITERALS[word])
+                fixes.add("python_literals")
+            elif text[indx:].lstrip().startswith(":"):
+                out.append(json.dumps(word))
+                fixes.add("unquoted_keys")
+            else:
+                out.append(json.dumps(word))
+                fixes.add("unquoted_values")
+            last = "a"
+            continue
+        else:
+            fixes.add("stray_characters")
+        indx += 1
+
+    # The text ended before the value did.
+    if stack:
+        fixes.add("truncated")
+        drop_trailing_comma()
+        if last == ":":
+            out.append("null")
+        out.extend(reversed(stack))
+    return "".join(out)
+
+
+def repair_json(text: str) -> Optional[RepairResult]:
+    """
+    Repairs malformed JSON locally: trailing or missing commas, single quotes, unquoted keys,
+    Python literals such as `True` and `None`, comments, truncated strings and containers, and
+    the prose around the JSON.
+
+    Returns:
+        Optional[RepairResult]: The repaired value, with a confidence between 0 and 1 that lowers
+        with each kind of fix, or None if the text could not be repaired.
+    """
+    if not text:
+        return None
+    start = _json_start(text)
+    if start == -1:
+        return None
+
+    fixes: Set[str] = set()
+    if text[:start].strip():
+        fixes.add("stray_prose")
+    repaired = _repair(text[start:], fixes)
+    try:
+        value = json.loads(repaired, strict=False)
+    except json.JSONDecodeError as e:
+        logging.debug(f"Local JSON repair failed: {e}")
+        return None
+    if not isinstance(value, (dict, list)):
+        return None
+    confidence = max(0.0, 1.0 - sum(FIX_PENALTIES[fix] for fix in fixes))
+    return RepairResult(
+        value=value, text=repaired, confidence=round(confidence, 2), fixes=tuple(sorted(fixes))
+    )
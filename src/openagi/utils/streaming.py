@@ -0,0 +1,183 @@
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from openagi.llms.base import LLMBaseModel
+from openagi.utils.json_blocks import loads_block
+
+JSON_FENCE = "```json"
+
+
+class JSONStreamDetector:
+    """
+    Incrementally detects the JSON objects of the ```json blocks of a streamed LLM response.
+
+    The text is scanned once, chunk by chunk, tracking the depth of the braces outside of the
+    JSON strings. Detection completes on the first object that holds one of `keys`, or on the
+    first object at all when no keys are given.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()) -> None:
+        self.keys = tuple(keys)
+        self.text = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self.end: Optional[int] = None
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def completed(self) -> bool:
+        return self.result is not None
+
+    def _find_object_start(self) -> bool:
+        """Moves to the opening brace of the next ```json block, if already streamed."""
+        text = self.text
+        while True:
+            fence = text.find(JSON_FENCE, self._pos)
+            if fence == -1:
+                # The end of the text may be the beginning of a fence.
+                self._pos = max(self._pos, len(text) - len(JSON_FENCE) + 1)
+                return False
+
+            indx = fence + len(JSON_FENCE)
+            while indx < len(text) and text[indx].isspace():
+                indx += 1
+            if indx == len(text):
+                self._pos = fence
+                return False
+            if text[indx] == "{":
+                self._start = indx
+                self._pos = indx
+                self._depth = 0
+                self._in_string = False
+                self._escape = False
+                return True
+            self._pos = indx
+
+    def _matches(self, obj: Any) -> bool:
+        return isinstance(obj, dict) and (not self.keys or any(key in obj for key in self.keys))
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """
+        Adds the next chunk of the response.
+
+        Returns:
+            Optional[Dict[str, Any]]: The detected JSON object, once complete.
+        """
+        if self.completed:
+            return self.result
+
+        self.text += chunk
+        while True:
+            if self._start is None and not self._find_object_start():
+                return None
+
+            text = self.text
+            indx = self._pos
+            while indx < len(text):
+                char = text[indx]
+                indx += 1
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif char == "\\":
+                        self._escape = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char == "{":
+                    self._depth += 1
+                elif char == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        break
+            self._pos = indx
+            if self._depth:
+                return None
+
+            candidate = text[self._start:indx]
+            self._start = None
+            try:
+                obj = loads_block(candidate)
+            except json.JSONDecodeError:
+                continue
+            if self._matches(obj):
+                self.result = obj
+                self.end = indx
+                return obj
+
+    def truncated_text(self) -> str:
+        """Returns the response up to the detected JSON object, with its ```json block closed."""
+        if not self.completed:
+            return self.text
+        return f"{self.text[:self.end]}\n```"
+
+
+def stream_until_json(llm: LLMBaseModel, prompt: Any, keys: Iterable[str] = ()) -> str:
+    """
+    Streams the response of the LLM and stops the generation as soon as a JSON object holding one
+    of `keys` is complete.
+
+    Returns:
+        str: The response up to the detected JSON object, or the whole response if there was none.
+    """
+    detector = JSONStreamDetector(keys)
+    stream = llm.stream(prompt)
+    try:
+        for chunk in stream:
+            if detector.feed(chunk or "") is not None:
+                logging.debug("JSON block complete, stopping the LLM generation.")
+                return detector.truncated_text()
+    finally:
+        stream.close()
+    return detector.text
+
+
+async def astream_until_json(llm: LLMBaseModel, prompt: Any, keys: Iterable[str] = ()) -> str:
+    """Async counterpart of `stream_until_json`."""
+    detector = JSONStreamDetector(keys)
+    stream = llm.astream(prompt)
+    try:
+        async for chunk in stream:
+            if detector.feed(chunk or "") is not None:
+                logging.debug("JSON block complete, stopping the LLM generation.")
+                return detector.truncated_text()
+    finally:
+        await stream.aclose()
+    return detector.text
+
+
+def stream_with_json_callback(
+    llm: LLMBaseModel, prompt: Any, keys: Iterable[str], callback: Callable[[Dict[str, Any]], Any]
+) -> str:
+    """
+    Streams the whole response of the LLM, calling `callback` with the first JSON object holding
+    one of `keys` as soon as it is complete, while the generation goes on.
+
+    Returns:
+        str: The whole response.
+    """
+    detector = JSONStreamDetector(keys)
+    for chunk in llm.stream(prompt):
+        if not detector.completed and detector.feed(chunk or "") is not None:
+            callback(detector.result)
+        elif detector.completed:
+            detector.text += chunk or ""
+    return detector.text
+
+
+async def astream_with_json_callback(
+    llm: LLMBaseModel, prompt: Any, keys: Iterable[str], callback: Callable[[Dict[str, Any]], Any]
+) -> str:
+    """Async counterpart of `stream_with_json_callback`."""
+    detector = JSONStreamDetector(keys)
+    async for chunk in llm.astream(prompt):
+        if not detector.completed and detector.feed(chunk or "") is not None:
+            callback(detector.result)
+        elif detector.completed:
+            detector.text += chunk or ""
+    return detector.text
@@ -1,32 +1,22 @@
+import importlib
 import inspect
-from openagi.actions.tools import (
-    ddg_search,
-    document_loader,
-    searchapi_search,
-    serp_search,
-    serper_search,
-    webloader,
-    youtubesearch,
-    exasearch,
-)
-from openagi.actions import files, formatter, human_input, compressor, console, obs_rag
 
-# List of modules to inspect
+# Modules to inspect, imported on the first call since some tools pull in heavy SDKs.
 modules = [
-    document_loader,
-    ddg_search,
-    searchapi_search,
-    serp_search,
-    serper_search,
-    webloader,
-    youtubesearch,
-    exasearch,
-    files,
-    formatter,
-    human_input,
-    compressor,
-    console,
-    obs_rag
+    "openagi.actions.tools.document_loader",
+    "openagi.actions.tools.ddg_search",
+    "openagi.actions.tools.searchapi_search",
+    "openagi.actions.tools.serp_search",
+    "openagi.actions.tools.serper_search",
+    "openagi.actions.tools.webloader",
+    "openagi.actions.tools.youtubesearch",
+    "openagi.actions.tools.exasearch",
+    "openagi.actions.files",
+    "openagi.actions.formatter",
+    "openagi.actions.human_input",
+    "openagi.actions.compressor",
+    "openagi.actions.console",
+    "openagi.actions.obs_rag",
 ]
 
 
@@ -39,7 +29,8 @@ def get_tool_list():
     """
     class_list = []
 
-    for module in modules:
+    for module_name in modules:
+        module = importlib.import_module(module_name)
         # Inspect the module for classes
         for name, obj in inspect.getmembers(module, inspect.isclass):
             # Optionally, filter by a specific base class, e.g., BaseAction
@@ -1,20 +1,36 @@
-import functools
 from concurrent.futures import ThreadPoolExecutor
+import json
 import logging
-from pathlib import Path
 import re
-from typing import Any, Dict, List, Optional, Union
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
-from openagi.actions.utils import run_action
-from openagi.exception import OpenAGIException
+from openagi.actions.registry import ActionRegistry
+from openagi.actions.utils import SpeculativeActions, arun_actions, run_actions
+from openagi.exception import InvalidActionError, OpenAGIException
 from openagi.llms.base import LLMBaseModel
+from openagi.llms.budget import fit_prompt
+from openagi.llms.messages import Message, messages_to_text
+from openagi.llms.tools import Tool, ToolResponse, function_tool
 from openagi.memory.memory import Memory
-from openagi.prompts.worker_task_execution import WorkerAgentTaskExecution
+from openagi.memory.scratchpad import Scratchpad
+from openagi.prompts.worker_task_execution import (
+    WorkerAgentTaskInstructions,
+    WorkerAgentTaskQuestion,
+    WorkerAgentToolCallingInstructions,
+)
 from openagi.tasks.task import Task
-from openagi.utils.extraction import get_act_classes_from_json, get_last_json
+from openagi.tracing import get_trace_sink
+from openagi.utils.extraction import aget_last_json, get_act_classes_from_json, get_last_json
 from openagi.utils.helper import get_default_id
+from openagi.utils.streaming import (
+    astream_until_json,
+    astream_with_json_callback,
+    stream_until_json,
+    stream_with_json_callback,
+)
 
 
 class Worker(BaseModel):
@@ -47,7 +63,63 @@ class Worker(BaseModel):
         default=True,
         description="If set to True, the output will be overwritten even if it exists.",
     )
-    
+    parallel_actions: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the actions requested in a "
+            "single LLM response are run concurrently."
+        ),
+    )
+    action_timeout: Optional[float] = Field(
+        default=None,
+        description=(
+            "Maximum number of seconds each action is allowed "
+            "to run. None waits for the action to complete."
+        ),
+    )
+    streaming: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the LLM output is streamed and the generation "
+            "stops as soon as the action or output JSON is complete."
+        ),
+    )
+    speculative_actions: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the LLM output is streamed and side effect free actions are "
+            "started as soon as their JSON is complete, while the LLM is still generating."
+        ),
+    )
+    compact_action_docs: bool = Field(
+        default=False,
+        description=(
+            "If set to True, the actions are described to the LLM in a compact "
+            "encoding: a line of minified JSON with short keys per action, the "
+            "parameters shared by all of them being described once."
+        ),
+    )
+    tool_calling: bool = Field(
+        default=False,
+        description=(
+            "If set to True and the LLM supports it, the actions are requested "
+            "as native tool calls instead of JSON blocks in the response, "
+            "which remain the fallback. Takes precedence over streaming."
+        ),
+    )
+    scratchpad_token_budget: Optional[int] = Field(
+        default=None,
+        description=(
+            "Token budget of the Thought/Action/Observation history sent to the LLM. Older "
+            "observations are compacted once it is exceeded. None keeps the whole history."
+        ),
+    )
+    _registry: Optional[ActionRegistry] = PrivateAttr(default=None)
+    # Tasks waiting to be written to the memory. Tasks of the worker may run concurrently.
+    _memory_buffer: List[Task] = PrivateAttr(default_factory=list)
+    _memory_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _worker_doc: Optional[Tuple[Tuple, Dict]] = PrivateAttr(default=None)
+
     # Validate output_key. Should contain only alphabets and only underscore are allowed. Not alphanumeric
     @field_validator("output_key")
     @classmethod
@@ -61,14 +133,24 @@ class Worker(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    def action_registry(self) -> ActionRegistry:
+        """Returns the registry of the actions of the worker, built again when they change."""
+        if self._registry is None or self._registry.actions != tuple(self.actions):
+            self._registry = ActionRegistry(self.actions)
+        return self._registry
+
     def worker_doc(self):
         """Returns a dictionary containing information about the worker, including its ID, role, description, and the supported actions."""
-        return {
-            "worker_id": self.id,
-            "role": self.role,
-            "description": self.instructions,
-            "supported_actions": [action.cls_doc() for action in self.actions],
-        }
+        registry = self.action_registry()
+        key = (self.id, self.role, self.instructions, id(registry))
+        if self._worker_doc is None or self._worker_doc[0] != key:
+            self._worker_doc = key, {
+                "worker_id": self.id,
+                "role": self.role,
+                "description": self.instructions,
+                "supported_actions": registry.docs,
+            }
+        return dict(self._worker_doc[1])
 
     def provoke_thought_obs(self, observation):
         thoughts = f"""Observation: {observation}""".strip()
@@ -76,94 +158,336 @@ class Worker(BaseModel):
 
     def should_continue(self, llm_resp: str) -> Union[bool, Optional[Dict]]:
         output: Dict = get_last_json(llm_resp, llm=self.llm, max_iterations=self.max_iterations)
+        if not isinstance(output, dict):
+            output = None
         output_key_exists = bool(output and output.get(self.output_key))
         return (not output_key_exists, output)
 
-    def _force_output(
-        self, llm_resp: str, all_thoughts_and_obs: List[str]
-    ) -> Union[bool, Optional[str]]:
-        """Force the output once the max iterations are reached."""
-        prompt = (
-            "\n".join(all_thoughts_and_obs)
-            + "Based on the previous action and observation, force and give me the output."
+    async def ashould_continue(self, llm_resp: str) -> Union[bool, Optional[Dict]]:
+        output: Dict = await aget_last_json(
+            llm_resp, llm=self.llm, max_iterations=self.max_iterations
+        )
+        if not isinstance(output, dict):
+            output = None
+        output_key_exists = bool(output and output.get(self.output_key))
+        return (not output_key_exists, output)
+
+    def _use_tools(self) -> bool:
+        """Whether the actions are requested as native tool calls."""
+        return self.tool_calling and bool(getattr(self.llm, "supports_tools", False))
+
+    def _tools(self, output_only: bool = False) -> List[Tool]:
+        """Returns the actions of the worker as tools, and the tool returning the task output."""
+        output_tool = function_tool(
+            self.output_key,
+            "Returns the final output of the task, once it is complete.",
+            {
+                "type": "object",
+                "properties": {
+                    "output": {"type": "string", "description": "The answer to the question."}
+                },
+                "required": ["output"],
+            },
+        )
+        return [output_tool] if output_only else self.action_registry().tools + [output_tool]
+
+    def _tool_response_text(self, response: ToolResponse) -> str:
+        """
+        Writes the tool calls of the LLM as the action or output JSON of a text response, so that
+        the rest of the loop is the same in both modes. A response without tool calls is returned
+        as is, its JSON, if any, being extracted as usual.
+        """
+        for call in response.tool_calls:
+            if call.name == self.output_key:
+                output = call.arguments.get("output", call.arguments)
+                return f"```json\n{json.dumps({self.output_key: output}, default=str)}\n```"
+        if not response.tool_calls:
+            return response.content
+        actions = [
+            {"cls": {"kls": call.name}, "params": call.arguments} for call in response.tool_calls
+        ]
+        return (
+            f"{response.content}\n```json\n{json.dumps({'action': actions}, default=str)}\n```"
+        ).lstrip()
+
+    def _run_llm(
+        self, messages: List[Message], speculation: Optional[SpeculativeActions] = None
+    ) -> str:
+        """
+        Runs the LLM, stopping the generation at the action or output JSON when streaming, or
+        starting the action speculatively while the generation goes on.
+        """
+        if self._use_tools():
+            return self._tool_response_text(self.llm.run_tools(messages, self._tools()))
+        prompt = self.llm.messages_input(messages)
+        if self.streaming:
+            return stream_until_json(self.llm, prompt, keys=("action", self.output_key))
+        if speculation is not None:
+            return stream_with_json_callback(
+                self.llm,
+                prompt,
+                keys=("action",),
+                callback=lambda resp: speculation.start(resp["action"]),
+            )
+        return self.llm.run_messages(messages)
+
+    async def _arun_llm(
+        self, messages: List[Message], speculation: Optional[SpeculativeActions] = None
+    ) -> str:
+        """Async counterpart of `_run_llm`."""
+        if self._use_tools():
+            return self._tool_response_text(await self.llm.arun_tools(messages, self._tools()))
+        prompt = self.llm.messages_input(messages)
+        if self.streaming:
+            return await astream_until_json(self.llm, prompt, keys=("action", self.output_key))
+        if speculation is not None:
+            return await astream_with_json_callback(
+                self.llm,
+                prompt,
+                keys=("action",),
+                callback=lambda resp: speculation.astart(resp["action"]),
+            )
+        return await self.llm.arun_messages(messages)
+
+    def _run_output_llm(self, messages: List[Message]) -> str:
+        """
+        Runs the LLM to get the output of the task, offering it only the output tool when calling
+        tools.
+        """
+        if self._use_tools():
+            return self._tool_response_text(
+                self.llm.run_tools(messages, self._tools(output_only=True))
+            )
+        return self.llm.run_messages(messages)
+
+    async def _arun_output_llm(self, messages: List[Message]) -> str:
+        """Async counterpart of `_run_output_llm`."""
+        if self._use_tools():
+            return self._tool_response_text(
+                await self.llm.arun_tools(messages, self._tools(output_only=True))
+            )
+        return await self.llm.arun_messages(messages)
+
+    def _get_speculation(self) -> Optional[SpeculativeActions]:
+        if not self.speculative_actions or self._use_tools():
+            return None
+        return SpeculativeActions(
+            memory=self.memory,
+            llm=self.llm,
+            concurrent=self.parallel_actions,
+            timeout=self.action_timeout,
+            registry=self.action_registry(),
+        )
+
+    def _force_output_steps(self, all_thoughts_and_obs: Scratchpad, instructions: str):
+        """Steps forcing the output once the max iterations are reached, see `_task_steps`."""
+        prompt = self._llm_messages(
+            instructions,
+            all_thoughts_and_obs,
+            "Based on the previous action and observation, force and give me the output.",
         )
-        output = self.llm.run(prompt)
-        cont, final_output = self.should_continue(output)
+        output = yield ("output_llm", prompt)
+        cont, final_output = yield ("should_continue", output)
         if cont:
-            prompt = (
-                "\n".join(all_thoughts_and_obs)
-                + f"Based on the previous action and observation, give me the output. {final_output}"
+            prompt = self._llm_messages(
+                instructions,
+                all_thoughts_and_obs,
+                "Based on the previous action and observation, "
+                f"give me the output. {final_output}",
             )
-            output = self.llm.run(prompt)
-            cont, final_output = self.should_continue(output)
+            output = yield ("output_llm", prompt)
+            cont, final_output = yield ("should_continue", output)
         if cont:
             raise OpenAGIException(
                 f"LLM did not produce the expected output after {self.max_iterations} iterations."
             )
         return (cont, final_output)
 
-    @functools.lru_cache(maxsize=100)
-    def _cached_llm_run(self, prompt: str) -> str:
-        """Cache LLM responses for identical prompts"""
-        return self.llm.run(prompt)
+    def _force_output(
+        self, llm_resp: str, all_thoughts_and_obs: Scratchpad, instructions: str
+    ) -> Union[bool, Optional[str]]:
+        """Force the output once the max iterations are reached."""
+        return self._drive(self._force_output_steps(all_thoughts_and_obs, instructions))
 
     def save_to_memory(self, task: Task):
         """Optimized memory update"""
-        if not hasattr(self, '_memory_buffer'):
-            self._memory_buffer = []
-        self._memory_buffer.append(task)
-        
-        # Batch update memory when buffer reaches certain size
-        if len(self._memory_buffer) >= 5:
-            for buffered_task in self._memory_buffer:
-                self.memory.update_task(buffered_task)
+        with self._memory_lock:
+            self._memory_buffer.append(task)
+
+            # Batch update memory when buffer reaches certain size
+            if len(self._memory_buffer) < 5:
+                return True
+            buffered_tasks = list(self._memory_buffer)
             self._memory_buffer.clear()
+        for buffered_task in buffered_tasks:
+            self.memory.update_task(buffered_task)
         return True
 
-    def execute_task(self, task: Task, context: Any = None) -> Any:
-        """Optimized task execution"""
-        logging.info(f"{'>'*20} Executing Task - {task.name}[{task.id}] with worker - {self.role}[{self.id}] {'<'*20}")
-        
-        # Pre-compute common values
-        iteration = 1
-        task_to_execute = f"{task.description}"
-        worker_description = f"{self.role} - {self.instructions}"
-        all_thoughts_and_obs = []
-        
-        # Generate base prompt once
+    def new_session(self, memory: Optional[Memory]) -> "Worker":
+        """
+        Returns a copy of the worker using the given memory, without the tasks buffered for this
+        one.
+        """
+        worker = self.model_copy(update={"memory": memory})
+        worker._memory_buffer = []
+        worker._memory_lock = threading.Lock()
+        return worker
+
+    def _get_base_prompts(self, task: Task, context: Any = None) -> Tuple[str, str]:
+        """
+        Returns the instructions of the worker, the same for all its tasks, and the question of
+        the task.
+        """
         te_vars = dict(
-            task_to_execute=task_to_execute,
-            worker_description=worker_description,
-            supported_actions=[action.cls_doc() for action in self.actions],
+            task_to_execute=f"{task.description}",
+            worker_description=f"{self.role} - {self.instructions}",
+            supported_actions=self.action_registry().encode(compact=self.compact_action_docs),
             thought_provokes=self.provoke_thought_obs(None),
             output_key=self.output_key,
             context=context,
             max_iterations=self.max_iterations,
         )
-        base_prompt = WorkerAgentTaskExecution().from_template(te_vars)
+        instructions = (
+            WorkerAgentToolCallingInstructions
+            if self._use_tools()
+            else WorkerAgentTaskInstructions
+        )
+        return (
+            instructions().from_template(te_vars),
+            WorkerAgentTaskQuestion().from_template(te_vars),
+        )
+
+    def _llm_messages(
+        self, instructions: str, history: Scratchpad, suffix: str = ""
+    ) -> List[Message]:
+        """
+        Lays out the prompt of an iteration as a system message with the instructions, followed by
+        the append-only turns of the task: the actions of the worker as assistant messages and the
+        question and observations as user messages. Providers caching prompt prefixes then only
+        process the new turns. LLMs not supporting messages get them flattened into a single
+        prompt.
+        """
+        messages = [{"role": "system", "content": instructions}] + history.render_messages()
+        if suffix:
+            if messages[-1]["role"] == "user":
+                messages[-1] = {"role": "user", "content": messages[-1]["content"] + suffix}
+            else:
+                messages.append({"role": "user", "content": suffix})
+        return messages
+
+    def _save_task_result(self, task: Task, observations: Any):
+        task.result = observations
+        task.actions = self.action_registry().encode(compact=self.compact_action_docs)
+        self.save_to_memory(task=task)
+
+    def _write_prompt_log(self, task: Task, iteration: int, prompt: Any):
+        # Tracing must not get in the way of the execution, e.g. for a worker without a memory.
+        session_id = getattr(self.memory, "session_id", None)
+        if not session_id:
+            return
+        try:
+            get_trace_sink(session_id).record_prompt(
+                stream=f"{task.name}[{task.id}]",
+                iteration=iteration,
+                prompt=messages_to_text(prompt),
+                worker=self.role,
+            )
+        except Exception as e:
+            logging.warning(f"Unable to trace the prompt of task {task.name}: {e}")
+
+    def _run_step(self, kind: str, *args) -> Any:
+        """Performs a step of `_task_steps`, blocking on the LLM and the actions."""
+        if kind == "llm":
+            return self._run_llm(*args)
+        if kind == "output_llm":
+            return self._run_output_llm(*args)
+        if kind == "should_continue":
+            return self.should_continue(*args)
+        action, actions, speculation = args
+        results = speculation.take(action) if speculation else None
+        if results is None:
+            results = run_actions(
+                actions,
+                memory=self.memory,
+                llm=self.llm,
+                concurrent=self.parallel_actions,
+                timeout=self.action_timeout,
+            )
+        return results
+
+    async def _arun_step(self, kind: str, *args) -> Any:
+        """Async counterpart of `_run_step`."""
+        if kind == "llm":
+            return await self._arun_llm(*args)
+        if kind == "output_llm":
+            return await self._arun_output_llm(*args)
+        if kind == "should_continue":
+            return await self.ashould_continue(*args)
+        action, actions, speculation = args
+        results = await speculation.atake(action) if speculation else None
+        if results is None:
+            results = await arun_actions(
+                actions,
+                memory=self.memory,
+                llm=self.llm,
+                concurrent=self.parallel_actions,
+                timeout=self.action_timeout,
+            )
+        return results
+
+    def _drive(self, steps) -> Any:
+        """Runs the steps of a generator, sending back the result of each one."""
+        try:
+            step = next(steps)
+            while True:
+                step = steps.send(self._run_step(*step))
+        except StopIteration as done:
+            return done.value
+
+    async def _adrive(self, steps) -> Any:
+        """Async counterpart of `_drive`."""
+        try:
+            step = next(steps)
+            while True:
+                step = steps.send(await self._arun_step(*step))
+        except StopIteration as done:
+            return done.value
+
+    def _task_steps(self, task: Task, context: Any = None):
+        """
+        The execution loop of a task, shared by `execute_task` and `aexecute_task`. It yields the
+        LLM calls, the parsing of their responses and the actions to run as `(kind, *args)` steps,
+        and gets their results back, so that only performing the steps differs between the two.
+        """
+        logging.info(f"{'>'*20} Executing Task - {task.name}[{task.id}] with worker - {self.role}[{self.id}] {'<'*20}")
         
-        # Use cached LLM run
-        prompt = f"{base_prompt}\nThought:\nIteration: {iteration}\nActions:\n"
-        observations = self._cached_llm_run(prompt)
-        all_thoughts_and_obs.append(prompt)
+        iteration = 1
+        all_thoughts_and_obs = Scratchpad(token_budget=self.scratchpad_token_budget, pinned=1)
+        speculation = self._get_speculation()
+        
+        # Generate base prompts once
+        instructions, question = self._get_base_prompts(task, context)
+        
+        all_thoughts_and_obs.append(f"{question}\nThought:\nIteration: {iteration}\nActions:\n")
+        prompt = self._llm_messages(instructions, all_thoughts_and_obs)
+        self._write_prompt_log(task, iteration, prompt)
+        observations = yield ("llm", prompt, speculation)
 
         while iteration < self.max_iterations + 1:
 
             logging.info(f"---- Iteration {iteration} ----")
             logging.debug("Checking if task should continue...")
-            continue_flag, output = self.should_continue(observations)
+            continue_flag, output = yield ("should_continue", observations)
 
             logging.debug("Extracting action from output...")
             action = output.get("action") if output else None
-            if action:
+            if action and not isinstance(action, list):
                 action = [action]
 
             # Save to memory
             if output:
                 logging.debug("Saving task result and actions to memory...")
-                task.result = observations
-                task.actions = str([action.cls_doc() for action in self.actions])
-                self.save_to_memory(task=task)
+                self._save_task_result(task, observations)
 
             if not continue_flag:
                 logging.info(f"Task completed. Output: {output}")
@@ -180,37 +504,46 @@ class Worker(BaseModel):
                 action_json = f"```json\n{output}\n```\n"
                 try:
                     logging.debug("Getting action classes from JSON...")
-                    actions = get_act_classes_from_json(action)
+                    actions = get_act_classes_from_json(action, self.action_registry())
                     logging.info(
                         f"Extracted actions: {[act_cls.__name__ for act_cls, _ in actions]}"
                     )
+                except InvalidActionError as e:
+                    # Reported to the LLM as the observation, without running anything.
+                    logging.warning(f"Invalid action requested: {e}")
+                    observations = f"{e} Use one of the supported actions."
+                    all_thoughts_and_obs.append(action_json, role="assistant")
+                    all_thoughts_and_obs.append(f"Observation: {observations}\n")
+                    actions = []
                 except KeyError as e:
                     if "cls" in e or "module" in e or "kls" in e:
                         observations = f"Action: {action_json}\n{observations}"
-                        all_thoughts_and_obs.append(action_json)
+                        all_thoughts_and_obs.append(action_json, role="assistant")
                         all_thoughts_and_obs.append(observations)
                         iteration += 1
                         continue
                     else:
                         raise e
 
-                for act_cls, params in actions:
-                    params["memory"] = self.memory
-                    params["llm"] = self.llm
-                    try:
-                        logging.debug(f"Running action: {act_cls.__name__}...")
-                        res = run_action(action_cls=act_cls, **params)
-                        logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
-                    except Exception as e:
-                        logging.error(f"Error running action: {e}")
-                        observations = f"Action: {action_json}\n{observations}. {e} Try to fix the error and try again. Ignore if already tried more than twice"
-                        all_thoughts_and_obs.append(action_json)
+                logging.debug(
+                    f"Running actions: {[act_cls.__name__ for act_cls, _ in actions]}..."
+                )
+                results = yield ("actions", action, actions, speculation)
+                for (act_cls, _), res in zip(actions, results):
+                    if isinstance(res, Exception):
+                        logging.error(f"Error running action: {res}")
+                        observations = (
+                            f"Action: {action_json}\n{observations}. {res} Try to fix the "
+                            "error and try again. Ignore if already tried more than twice"
+                        )
+                        all_thoughts_and_obs.append(action_json, role="assistant")
                         all_thoughts_and_obs.append(observations)
                         iteration += 1
                         continue
 
+                    logging.info(f"Action '{act_cls.__name__}' completed. Result: {res}")
                     observation_prompt = f"Observation: {res}\n"
-                    all_thoughts_and_obs.append(action_json)
+                    all_thoughts_and_obs.append(action_json, role="assistant")
                     all_thoughts_and_obs.append(observation_prompt)
                     observations = res
 
@@ -218,41 +551,66 @@ class Worker(BaseModel):
                 thought_prompt = self.provoke_thought_obs(observations)
                 all_thoughts_and_obs.append(f"\n{thought_prompt}\nActions:\n")
 
-                prompt = f"{base_prompt}\n" + "\n".join(all_thoughts_and_obs)
-                logging.debug(f"\nSTART:{'*' * 20}\n{prompt}\n{'*' * 20}:END")
-                pth = Path(f"{self.memory.session_id}/logs/{task.name}-{iteration}.log")
-                
-                pth.parent.mkdir(parents=True, exist_ok=True)
-                with open(pth, "w", encoding="utf-8") as f:
-                    f.write(f"{prompt}\n")
+                # The first entry already holds the question.
+                fits, prompt = fit_prompt(
+                    self.llm,
+                    lambda: self._llm_messages(instructions, all_thoughts_and_obs),
+                    all_thoughts_and_obs,
+                )
+                if not fits:
+                    logging.warning(
+                        f"Token budget nearly exhausted, forcing the output of task {task.name}"
+                    )
+                    _, output = yield from self._force_output_steps(
+                        all_thoughts_and_obs, instructions
+                    )
+                    self._save_task_result(task, observations)
+                    break
+                logging.debug(f"\nSTART:{'*' * 20}\n{messages_to_text(prompt)}\n{'*' * 20}:END")
+                self._write_prompt_log(task, iteration, prompt)
                 logging.debug("Running LLM with updated prompt...")
-                observations = self.llm.run(prompt)
+                observations = yield ("llm", prompt, speculation)
             iteration += 1
         else:
             if iteration == self.max_iterations:
                 logging.info("---- Forcing Output ----")
                 if self.force_output:
                     logging.debug("Forcing output...")
-                    cont, final_output = self._force_output(observations, all_thoughts_and_obs)
+                    cont, final_output = yield from self._force_output_steps(
+                        all_thoughts_and_obs, instructions
+                    )
                     if cont:
                         raise OpenAGIException(
                             f"LLM did not produce the expected output after {iteration} iterations for task {task.name}"
                         )
                     output = final_output
                     logging.debug("Saving final task result and actions to memory...")
-                    task.result = observations
-                    task.actions = str([action.cls_doc() for action in self.actions])
-                    self.save_to_memory(task=task)
+                    self._save_task_result(task, observations)
                 else:
                     raise OpenAGIException(
                         f"LLM did not produce the expected output after {iteration} iterations for task {task.name}"
                     )
 
+        if speculation:
+            speculation.discard()
         logging.info(
             f"Task Execution Completed - {task.name} with worker - {self.role}[{self.id}] in {iteration} iterations"
         )
+        if all_thoughts_and_obs.tokens_saved:
+            logging.info(
+                f"Scratchpad compaction saved {all_thoughts_and_obs.tokens_saved} "
+                f"prompt tokens for task {task.name}"
+            )
         return output, task
 
+    def execute_task(self, task: Task, context: Any = None) -> Any:
+        """Optimized task execution"""
+        return self._drive(self._task_steps(task, context))
+
+    async def aexecute_task(self, task: Task, context: Any = None) -> Any:
+        """Async counterpart of `execute_task`, awaiting the LLM and the actions."""
+        return await self._adrive(self._task_steps(task, context))
+
     def __del__(self):
         """Cleanup thread pool on deletion"""
         if hasattr(self, '_thread_pool'):
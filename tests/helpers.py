@@ -0,0 +1,58 @@
+import json
+from typing import Any, Callable, List, Optional
+
+from openagi.llms.base import LLMBaseModel
+from openagi.memory.memory import Memory
+from openagi.storage.base import BaseStorage
+
+
+class FakeStorage(BaseStorage):
+    name: str = "fake"
+    docs: dict = {}
+
+    def save_document(self, id, document, metadata):
+        self.docs[id] = document
+
+    def update_document(self, id, document, metadata):
+        self.docs[id] = document
+
+    def query_documents(self, **kwargs):
+        return {"documents": [list(self.docs.values())]}
+
+    def with_collection(self, collection_name: str) -> "FakeStorage":
+        return FakeStorage(docs={})
+
+
+def fake_memory(session_id: str = "test-session") -> Memory:
+    """A memory backed by an in-process storage, without creating a Chroma collection."""
+    return Memory.model_construct(
+        session_id=session_id, storage=FakeStorage(docs={}), long_term=False
+    )
+
+
+class FakeLLM(LLMBaseModel):
+    """LLM answering with `fn(prompt)`, recording its prompts in `calls`."""
+
+    config: Any = None
+    fn: Optional[Callable[[Any], Any]] = None
+    calls: List[Any] = []
+
+    def load(self):
+        return self
+
+    def run(self, input_data: Any):
+        self.calls.append(input_data)
+        return self.fn(input_data)
+
+    @staticmethod
+    def load_from_env_config():
+        return None
+
+
+def final(output: Any, key: str = "final_output") -> str:
+    return "```json\n" + json.dumps({key: output}) + "\n```"
+
+
+def action(kls: str, module: str = "__main__", **params) -> str:
+    payload = {"action": {"cls": {"kls": kls, "module": module}, "params": params}}
+    return "```json\n" + json.dumps(payload) + "\n```"
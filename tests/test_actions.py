@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+import time
+from typing import ClassVar, List
+
+from helpers import FakeLLM, action
+
+from openagi.actions.base import BaseAction
+from openagi.actions.registry import ActionRegistry
+from openagi.actions.utils import SpeculativeActions, arun_actions, run_actions
+from openagi.utils.streaming import astream_with_json_callback, stream_with_json_callback
+
+
+class Sleep(BaseAction):
+    """Sleeps for `seconds` and returns them."""
+
+    seconds: float = 0.0
+
+    def execute(self):
+        time.sleep(self.seconds)
+        return self.seconds
+
+
+class Fail(BaseAction):
+    """Always fails."""
+
+    def execute(self):
+        raise ValueError("failed")
+
+
+class Wait(BaseAction):
+    """Waits until `event` is set."""
+
+    event: threading.Event
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def execute(self):
+        self.event.wait(5)
+        return "done"
+
+
+def _actions():
+    return [(Sleep, {"seconds": 0.2}), (Fail, {}), (Sleep, {"seconds": 0.0})]
+
+
+def _check_results(results):
+    assert results[0] == 0.2
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 0.0
+
+
+def test_run_actions_keeps_the_order_and_isolates_the_errors():
+    _check_results(run_actions(_actions(), None, None))
+    _check_results(run_actions(_actions(), None, None, concurrent=True))
+
+
+def test_arun_actions_keeps_the_order_and_isolates_the_errors():
+    _check_results(asyncio.run(arun_actions(_actions(), None, None)))
+    _check_results(asyncio.run(arun_actions(_actions(), None, None, concurrent=True)))
+
+
+def test_concurrent_actions_run_at_once():
+    start = time.monotonic()
+    run_actions([(Sleep, {"seconds": 0.2})] * 3, None, None, concurrent=True)
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_timed_out_actions_are_abandoned():
+    event = threading.Event()
+    start = time.monotonic()
+    try:
+        results = run_actions(
+            [(Wait, {"event": event}), (Sleep, {"seconds": 0.0})], None, None, timeout=0.1
+        )
+    finally:
+        event.set()
+
+    assert time.monotonic() - start < 1
+    assert isinstance(results[0], TimeoutError)
+    assert "Wait" in str(results[0])
+    assert results[1] == 0.0
+
+
+def test_async_timed_out_actions_are_abandoned():
+    event = threading.Event()
+
+    async def _run():
+        try:
+            return await arun_actions(
+                [(Wait, {"event": event}), (Sleep, {"seconds": 0.0})],
+                None,
+                None,
+                concurrent=True,
+                timeout=0.1,
+            )
+        finally:
+            # Lets the thread of the abandoned action finish, which the loop waits for on close.
+            event.set()
+
+    results = asyncio.run(_run())
+
+    assert isinstance(results[0], TimeoutError)
+    assert results[1] == 0.0
+
+
+class Lookup(BaseAction):
+    """Looks up `query`, without side effects."""
+
+    query: str
+    speculative: ClassVar[bool] = True
+    started: ClassVar[List[str]] = []
+    cancelled: ClassVar[List[str]] = []
+
+    def execute(self):
+        self.started.append(self.query)
+        return f"found {self.query}"
+
+    async def aexecute(self):
+        self.started.append(self.query)
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            self.cancelled.append(self.query)
+            raise
+        return f"found {self.query}"
+
+
+class Write(Lookup):
+    """Writes `query`, which cannot be undone."""
+
+    speculative: ClassVar[bool] = False
+
+
+def _speculation():
+    Lookup.started, Lookup.cancelled = [], []
+    return SpeculativeActions(None, None, registry=ActionRegistry([Lookup, Write]))
+
+
+def _action_json(kls: str, query: str):
+    return json.loads(action(kls, query=query).split("```json")[1].rsplit("```", 1)[0])["action"]
+
+
+def test_speculative_action_is_started_from_the_stream_and_reused():
+    speculation = _speculation()
+    llm = FakeLLM(fn=lambda prompt: "Thought: look it up.\n" + action("Lookup", query="a"))
+
+    stream_with_json_callback(
+        llm, "prompt", ("action",), lambda resp: speculation.start(resp["action"])
+    )
+
+    assert speculation.take(_action_json("Lookup", "a")) == ["found a"]
+    assert Lookup.started == ["a"]
+
+
+def test_speculative_action_is_discarded_when_the_final_action_differs():
+    speculation = _speculation()
+
+    assert speculation.start(_action_json("Lookup", "a"))
+    assert speculation.take(_action_json("Lookup", "b")) is None
+    assert speculation.take(_action_json("Lookup", "a")) is None
+
+
+def test_actions_with_side_effects_are_not_started():
+    speculation = _speculation()
+
+    assert not speculation.start(_action_json("Write", "a"))
+    assert speculation.take(_action_json("Write", "a")) is None
+    assert Lookup.started == []
+
+
+def test_async_speculative_action_is_reused_or_cancelled():
+    speculation = _speculation()
+    llm = FakeLLM(fn=lambda prompt: action("Lookup", query="a"))
+
+    async def _run():
+        await astream_with_json_callback(
+            llm, "prompt", ("action",), lambda resp: speculation.astart(resp["action"])
+        )
+        reused = await speculation.atake(_action_json("Lookup", "a"))
+        speculation.astart(_action_json("Lookup", "b"))
+        await asyncio.sleep(0)
+        discarded = await speculation.atake(_action_json("Lookup", "c"))
+        await asyncio.sleep(0)
+        return reused, discarded
+
+    assert asyncio.run(_run()) == (["found a"], None)
+    assert Lookup.started == ["a", "b"]
+    assert Lookup.cancelled == ["b"]
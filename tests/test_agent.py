@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import pytest
+from helpers import FakeLLM, action, fake_memory, final
+
+from openagi.agent import Admin
+from openagi.llms.budget import BudgetedLLM, TokenBudget
+from openagi.planner.task_decomposer import TaskPlanner
+from openagi.tasks.lists import TaskLists
+from openagi.tasks.task import Task
+from openagi.worker import Worker
+
+
+def make_admin(llm, workers):
+    return Admin(
+        llm=llm,
+        memory=fake_memory(),
+        workers=workers,
+        planner=TaskPlanner(workers=workers),
+        output_format="raw_text",
+    )
+
+
+def test_constructor_workers_share_admin_llm_and_memory():
+    llm = FakeLLM(fn=lambda prompt: final("done"))
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(llm, [worker])
+
+    assert worker.llm is llm
+    assert worker.memory is admin.memory
+
+
+def test_run_with_constructor_workers():
+    llm = FakeLLM(fn=lambda prompt: final("done"))
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(llm, [worker])
+    plan = [dict(task_name="A", description="a", worker_id=worker.id)]
+
+    assert admin.run("query", "description", planned_tasks=plan) == {"final_output": "done"}
+
+
+def test_concurrent_save_to_memory_keeps_every_task():
+    worker = Worker(role="researcher", instructions="Research the topic.", memory=fake_memory())
+    tasks = [Task(name=f"t{i}", description="d", worker_config={}) for i in range(100)]
+
+    threads = [
+        threading.Thread(
+            target=lambda chunk=tasks[i::4]: [worker.save_to_memory(t) for t in chunk]
+        )
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(worker.memory.storage.docs) == len(tasks)
+
+
+def test_concurrent_tasks_summarize_each_context_once():
+    summaries = []
+
+    def fn(prompt):
+        summaries.append(prompt)
+        time.sleep(0.1)
+        return "summary"
+
+    admin = make_admin(FakeLLM(fn=fn), [])
+    admin.memory.storage.docs["doc"] = "result"
+    tasks = [
+        Task(name=f"t{i}", description="d", worker_config={}, result=f"r{i}") for i in range(3)
+    ]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        contexts = list(
+            executor.map(
+                lambda _: admin.get_previous_task_contexts(TaskLists(), tasks=tasks), range(4)
+            )
+        )
+
+    assert len(summaries) == len(tasks)
+    assert len(set(contexts)) == 1
+
+
+def test_single_agent_tasks_pin_their_own_prompt():
+    responses = iter([action("MemoryRagAction", query="first"), final("done")] * 2)
+    llm = FakeLLM(fn=lambda prompt: next(responses))
+    admin = Admin(
+        llm=llm,
+        memory=fake_memory(),
+        planner=TaskPlanner(),
+        output_format="raw_text",
+        summarize_task_context=False,
+        scratchpad_token_budget=1,
+    )
+    plan = [
+        dict(task_name="First", description="first"),
+        dict(task_name="Second", description="second"),
+    ]
+    admin.run("query", "description", planned_tasks=plan)
+
+    # The prompt following the action of the second task starts with the base prompt of that task.
+    assert "Second. second" in llm.calls[3]
+    assert "First. first" not in llm.calls[3]
+
+
+def test_new_session_does_not_share_worker_state():
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(FakeLLM(fn=lambda prompt: final("done")), [worker])
+    worker.save_to_memory(Task(name="t", description="d", worker_config={}))
+
+    session_worker = admin.new_session().workers[0]
+
+    assert session_worker.memory is not worker.memory
+    assert session_worker._memory_buffer == []
+    assert session_worker._memory_lock is not worker._memory_lock
+    assert len(worker._memory_buffer) == 1
+
+
+def test_token_budget_runs_do_not_modify_the_admin():
+    llm = FakeLLM(fn=lambda prompt: final("done"))
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(llm, [worker])
+    admin.token_budget = TokenBudget(max_prompt_tokens=100000)
+    plan = [dict(task_name="A", description="a", worker_id=worker.id)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            executor.map(
+                lambda _: admin.run("query", "description", planned_tasks=plan), range(2)
+            )
+        )
+
+    assert results == [{"final_output": "done"}] * 2
+    assert admin.llm is llm and worker.llm is llm
+    assert not isinstance(admin.planner.llm, BudgetedLLM)
+    assert admin.run_usage.calls == 1
+
+
+class SlowLLM(FakeLLM):
+    """LLM answering after a second, recording its cancellations."""
+
+    cancelled: List[Any] = []
+
+    async def arun(self, input_data):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            self.cancelled.append(input_data)
+            raise
+        return final("done")
+
+
+def failing_llm(calls):
+    def fn(prompt):
+        calls.append(prompt)
+        raise ValueError("LLM failed")
+
+    return FakeLLM(fn=fn)
+
+
+def independent_plan(workers):
+    return [
+        dict(task_name=f"T{indx}", description="d", worker_id=worker.id, depends_on=[])
+        for indx, worker in enumerate(workers)
+    ]
+
+
+def test_failed_task_cancels_the_queued_tasks():
+    calls = []
+    workers = [
+        Worker(role=f"w{indx}", instructions="Research.", llm=failing_llm(calls))
+        for indx in range(3)
+    ]
+    admin = make_admin(FakeLLM(fn=lambda prompt: final("done")), workers)
+    admin.max_parallel_tasks = 1
+
+    with pytest.raises(ValueError):
+        admin.run("query", "description", planned_tasks=independent_plan(workers))
+
+    assert len(calls) == 1
+
+
+def test_failed_async_task_cancels_the_running_tasks():
+    slow = SlowLLM(cancelled=[])
+    workers = [
+        Worker(role="failing", instructions="Research.", llm=failing_llm([])),
+        Worker(role="slow", instructions="Research.", llm=slow),
+    ]
+    admin = make_admin(FakeLLM(fn=lambda prompt: final("done")), workers)
+    admin.max_parallel_tasks = 2
+
+    async def run():
+        with pytest.raises(ValueError):
+            await admin.arun("query", "description", planned_tasks=independent_plan(workers))
+        return len(slow.cancelled)
+
+    assert asyncio.run(run()) == 1
+
+
+def test_run_many_stops_the_queries_left_when_closed():
+    calls = []
+
+    def fn(prompt):
+        calls.append(prompt)
+        time.sleep(0.05)
+        return final("done")
+
+    llm = FakeLLM(fn=fn)
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(llm, [worker])
+    plan = [dict(task_name="A", description="a", worker_id=worker.id)]
+    queries = [dict(query=f"q{indx}", planned_tasks=plan) for indx in range(6)]
+
+    results = admin.run_many(queries, concurrency=1)
+    first = next(results)
+    results.close()
+
+    assert first.index == 0 and first.result == {"final_output": "done"}
+    assert len(calls) <= 2
+
+
+def test_run_many_yields_every_result():
+    llm = FakeLLM(fn=lambda prompt: final("done"))
+    worker = Worker(role="researcher", instructions="Research the topic.")
+    admin = make_admin(llm, [worker])
+    plan = [dict(task_name="A", description="a", worker_id=worker.id)]
+
+    results = list(admin.run_many([dict(query=f"q{i}", planned_tasks=plan) for i in range(3)]))
+
+    assert sorted(result.index for result in results) == [0, 1, 2]
+    assert len({result.session_id for result in results}) == 3
+    assert all(result.error is None for result in results)
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from helpers import FakeLLM
+
+
+class Tracker:
+    """Answers with the uppercased prompt after a delay, tracking the calls in flight."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if prompt == "fail":
+                raise ValueError("failed")
+            # The later prompts answer first, so that the order is not the completion order.
+            time.sleep(self.delay / (1 + int(prompt[-1])))
+            return prompt.upper()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+PROMPTS = [f"p{indx}" for indx in range(6)]
+
+
+def test_run_batch_keeps_the_order_and_bounds_the_concurrency():
+    tracker = Tracker()
+    llm = FakeLLM(fn=tracker, calls=[])
+
+    assert llm.run_batch(PROMPTS, max_concurrency=2) == [prompt.upper() for prompt in PROMPTS]
+    assert tracker.max_in_flight == 2
+
+
+def test_arun_batch_keeps_the_order_and_bounds_the_concurrency():
+    tracker = Tracker()
+    llm = FakeLLM(fn=tracker, calls=[])
+
+    responses = asyncio.run(llm.arun_batch(PROMPTS, max_concurrency=3))
+
+    assert responses == [prompt.upper() for prompt in PROMPTS]
+    assert tracker.max_in_flight == 3
+
+
+def test_run_batch_failures():
+    llm = FakeLLM(fn=Tracker(delay=0), calls=[])
+    prompts = ["p1", "fail", "p2"]
+
+    responses = llm.run_batch(prompts, return_exceptions=True)
+    assert responses[0] == "P1" and responses[2] == "P2"
+    assert isinstance(responses[1], ValueError)
+    with pytest.raises(ValueError):
+        llm.run_batch(prompts)
+
+
+def test_arun_batch_failures():
+    llm = FakeLLM(fn=Tracker(delay=0), calls=[])
+    prompts = ["p1", "fail", "p2"]
+
+    responses = asyncio.run(llm.arun_batch(prompts, return_exceptions=True))
+    assert responses[0] == "P1" and responses[2] == "P2"
+    assert isinstance(responses[1], ValueError)
+    with pytest.raises(ValueError):
+        asyncio.run(llm.arun_batch(prompts))
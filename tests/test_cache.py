@@ -0,0 +1,77 @@
+import sqlite3
+import time
+
+from helpers import FakeLLM
+
+from openagi.llms.cache import CachedLLM
+
+
+def echo_llm():
+    return FakeLLM(fn=lambda prompt: f"response to {prompt}")
+
+
+def test_responses_are_cached_in_memory():
+    wrapped = echo_llm()
+    llm = CachedLLM(wrapped=wrapped)
+
+    assert llm.run("a") == llm.run("a") == "response to a"
+    assert wrapped.calls == ["a"]
+    assert llm.stats["memory_hits"] == 1
+
+
+def test_memory_lru_eviction():
+    wrapped = echo_llm()
+    llm = CachedLLM(wrapped=wrapped, max_entries=2)
+    for prompt in ["a", "b", "a", "c", "b"]:
+        llm.run(prompt)
+
+    # "b" was the least recently used entry when "c" was added.
+    assert wrapped.calls == ["a", "b", "c", "b"]
+    assert llm.stats["memory_evictions"] == 2
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = CachedLLM(wrapped=echo_llm(), cache_path=path)
+    first.run("a")
+    first.close()
+
+    wrapped = echo_llm()
+    second = CachedLLM(wrapped=wrapped, cache_path=path)
+
+    assert second.run("a") == "response to a"
+    assert wrapped.calls == []
+    assert second.stats["disk_hits"] == 1
+
+
+def test_disk_eviction_keeps_the_recently_used(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    llm = CachedLLM(wrapped=echo_llm(), cache_path=path, max_entries=1, max_disk_entries=10)
+    for indx in range(11):
+        llm.run(f"prompt {indx}")
+    llm.close()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 9
+    assert llm.stats["disk_evictions"] == 2
+
+
+def test_expired_responses_are_not_returned(tmp_path):
+    wrapped = echo_llm()
+    llm = CachedLLM(wrapped=wrapped, cache_path=str(tmp_path / "cache.sqlite"), ttl=0.05)
+    llm.run("a")
+    time.sleep(0.1)
+    llm.run("a")
+
+    assert wrapped.calls == ["a", "a"]
+    # Expired both in memory and on disk.
+    assert llm.stats["expirations"] == 2
+
+
+def test_bypass_skips_the_cache():
+    wrapped = echo_llm()
+    llm = CachedLLM(wrapped=wrapped, bypass=True)
+    llm.run("a")
+    llm.run("a")
+
+    assert wrapped.calls == ["a", "a"]
@@ -0,0 +1,76 @@
+import asyncio
+
+from openagi.llms import azure, openai
+from openagi.llms.clients import (
+    get_async_http_client,
+    get_shared_async_client,
+    openai_http_clients,
+)
+
+
+class FakeAsyncClient:
+    def __init__(self, http_client, **kwargs):
+        self.http_client = http_client
+        self.kwargs = kwargs
+
+
+async def resolve_clients():
+    first = get_shared_async_client(FakeAsyncClient, api_key="key")
+    second = get_shared_async_client(FakeAsyncClient, api_key="key")
+    return first, second
+
+
+def test_async_clients_are_shared_per_event_loop():
+    first, second = asyncio.run(resolve_clients())
+    other_loop, _ = asyncio.run(resolve_clients())
+
+    assert first is second
+    assert first.http_client is not other_loop.http_client
+    assert other_loop is not first
+
+
+def test_async_http_client_is_per_event_loop():
+    async def client():
+        return get_async_http_client()
+
+    assert asyncio.run(client()) is not asyncio.run(client())
+
+
+def test_chat_models_keep_their_own_async_client():
+    class ChatModel:
+        model_fields = {"http_client": None, "http_async_client": None}
+
+    assert list(openai_http_clients(ChatModel)) == ["http_client"]
+
+
+def test_pinned_openai_chat_models_keep_their_own_http_client(monkeypatch):
+    created = []
+
+    def get_shared_client(factory, **kwargs):
+        created.append((factory, kwargs))
+        return factory(**kwargs)
+
+    monkeypatch.setattr(openai, "get_shared_client", get_shared_client)
+    monkeypatch.setattr(azure, "get_shared_client", get_shared_client)
+
+    openai.OpenAIModel(config=openai.OpenAIConfigModel(openai_api_key="key")).load()
+    azure.AzureChatOpenAIModel(
+        config=azure.AzureChatConfigModel(
+            base_url="https://example.openai.azure.com",
+            deployment_name="gpt-4o",
+            model_name="gpt-4o",
+            openai_api_version="2024-02-01",
+            api_key="key",
+        )
+    ).load()
+
+    (openai_cls, openai_kwargs), (azure_cls, azure_kwargs) = created
+    assert "http_async_client" not in openai_cls.__fields__
+    assert set(openai_kwargs) == {"openai_api_key", "model_name"}
+    assert set(azure_kwargs) == {
+        "azure_deployment",
+        "model_name",
+        "openai_api_version",
+        "openai_api_key",
+        "azure_endpoint",
+    }
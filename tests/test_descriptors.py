@@ -0,0 +1,54 @@
+import json
+
+from pydantic import Field
+
+from openagi.actions.base import BaseAction
+from openagi.actions.descriptors import describe_action, encode_actions, size_report
+from openagi.tasks.task import Task
+from openagi.worker import Worker
+
+
+class Search(BaseAction):
+    """Searches the web.
+
+    Returns the top results."""
+
+    query: str = Field(description="Query to search.")
+
+
+class Fetch(BaseAction):
+    """Fetches a page."""
+
+    url: str = Field(description="URL of the page.")
+
+
+def test_compact_encoding_uses_short_keys():
+    lines = encode_actions([describe_action(Search), describe_action(Fetch)]).splitlines()
+
+    assert lines[0] == "Keys of each action: n=class name, d=description, p=parameters"
+    assert lines[1].startswith("Params of every action: ")
+    assert json.loads(lines[2]) == {
+        "n": "Search",
+        "d": "Searches the web. Returns the top results.",
+        "p": {"query": "Query to search."},
+    }
+
+
+def test_full_encoding_is_the_cls_doc_list():
+    descriptors = [describe_action(Search)]
+
+    assert encode_actions(descriptors, compact=False) == str([Search.cls_doc()])
+
+
+def test_prompts_use_the_full_encoding_by_default():
+    worker = Worker(role="researcher", instructions="Research the topic.", actions=[Search])
+    instructions, _ = worker._get_base_prompts(Task(name="t", description="d", worker_config={}))
+
+    assert str([Search.cls_doc()]) in instructions
+
+
+def test_size_report_compares_both_encodings():
+    (entry,) = size_report([describe_action(Search)])
+
+    assert entry["action"] == "Search"
+    assert entry["compact_chars"] < entry["chars"]
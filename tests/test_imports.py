@@ -0,0 +1,51 @@
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from openagi.exception import OpenAGIException
+
+CHECK = """
+import sys
+import openagi.agent
+loaded = sorted(
+    name
+    for name in sys.modules
+    if name.split(".")[0].startswith("langchain") or name.split(".")[0] == "openai"
+)
+print(",".join(loaded))
+"""
+
+
+def test_importing_the_agent_does_not_load_the_llm_sdks(tmp_path):
+    # A fresh interpreter, as the other tests may have loaded the SDKs already.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env=env,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize(
+    "module, class_name, sdk",
+    [
+        ("openagi.llms.gemini", "GeminiModel", "langchain_google_genai"),
+        ("openagi.llms.ollama", "OllamaModel", "langchain_ollama"),
+    ],
+)
+def test_providers_import_without_their_sdk(module, class_name, sdk):
+    if importlib.util.find_spec(sdk) is not None:
+        pytest.skip(f"{sdk} is installed")
+    llm_cls = getattr(importlib.import_module(module), class_name)
+
+    with pytest.raises(OpenAGIException, match="pip install"):
+        llm_cls(config=None).load()
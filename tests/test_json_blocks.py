@@ -0,0 +1,38 @@
+from openagi.utils.extraction import get_last_json
+from openagi.utils.json_blocks import parse_json_blocks
+
+
+def test_fenced_and_prose_blocks():
+    text = (
+        'Thought: use {placeholder}.\n```json\n{"action": [1, 2]}\n```\n'
+        'Then {"final_output": "done"}'
+    )
+    blocks = parse_json_blocks(text)
+
+    assert [(block.fenced, block.value) for block in blocks] == [
+        (True, {"action": [1, 2]}),
+        (False, {"final_output": "done"}),
+    ]
+
+
+def test_braces_in_strings_are_skipped():
+    (block,) = parse_json_blocks('```json\n{"text": "a } and a ``` fence"}\n```')
+
+    assert block.value == {"text": "a } and a ``` fence"}
+
+
+def test_truncated_fenced_block_is_kept_for_repair():
+    (block,) = parse_json_blocks('```json\n{"final_output": "do')
+
+    assert not block.valid
+    assert block.text == '{"final_output": "do'
+
+
+def test_unclosed_prose_brace_does_not_hide_later_blocks():
+    blocks = parse_json_blocks('{"a" is not closed, but {"b": 1} is')
+
+    assert [block.value for block in blocks if block.valid] == [{"b": 1}]
+
+
+def test_many_unclosed_braces_do_not_recurse():
+    assert get_last_json('{"a' * 1000) is None
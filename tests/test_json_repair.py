@@ -0,0 +1,81 @@
+import pytest
+from helpers import FakeLLM
+
+from openagi.utils.extraction import get_last_json
+from openagi.utils.json_repair import repair_json, repair_stats, reset_repair_stats
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_repair_stats()
+    yield
+    reset_repair_stats()
+
+
+@pytest.mark.parametrize(
+    "text, value, fixes",
+    [
+        ('{"a": 1, "b": [1, 2,],}', {"a": 1, "b": [1, 2]}, ("trailing_commas",)),
+        ("{'a': 'it\\'s'}", {"a": "it's"}, ("single_quotes",)),
+        ("{a: True, b: None}", {"a": True, "b": None}, ("python_literals", "unquoted_keys")),
+        ('{"a": 1 // one\n}', {"a": 1}, ("comments",)),
+        ('{"a": 1 "b": 2}', {"a": 1, "b": 2}, ("missing_commas",)),
+        ('Here it is: {"a": 1} hope it helps', {"a": 1}, ("stray_prose",)),
+        ('{"a": {"b": "trunc', {"a": {"b": "trunc"}}, ("truncated",)),
+    ],
+)
+def test_repairs(text, value, fixes):
+    repaired = repair_json(text)
+
+    assert repaired.value == value
+    assert repaired.fixes == fixes
+    assert 0 < repaired.confidence < 1
+
+
+def test_unrepairable_text():
+    assert repair_json("") is None
+    assert repair_json("no json here") is None
+
+
+def test_truncated_fenced_block_is_repaired_without_the_llm():
+    llm = FakeLLM(fn=lambda prompt: '{"unused": true}')
+
+    output = get_last_json(
+        '```json\n{"action": [{"cls": {"kls": "Echo"}, "params": {"text": "hi', llm=llm
+    )
+
+    assert output == {"action": [{"cls": {"kls": "Echo"}, "params": {"text": "hi"}}]}
+    assert llm.calls == []
+    assert repair_stats() == {"repaired": 1}
+
+
+def test_low_confidence_repairs_are_reformatted_by_the_llm():
+    llm = FakeLLM(fn=lambda prompt: '```json\n{"a": "b"}\n```')
+
+    assert get_last_json("{a: b c d", llm=llm, min_confidence=0.9) == {"a": "b"}
+    assert len(llm.calls) == 1
+    assert repair_stats() == {"llm": 1}
+
+
+def test_valid_json_is_not_repaired():
+    assert get_last_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert get_last_json("nothing") is None
+    assert repair_stats() == {"parsed": 1, "failed": 1}
+
+
+@pytest.mark.parametrize(
+    "text", ["See reference [1] for details, the answer is Paris.", 'The list is ["a","b"]']
+)
+def test_prose_is_reformatted_by_the_llm_instead_of_repaired(text):
+    llm = FakeLLM(fn=lambda prompt: '```json\n{"output": "Paris"}\n```')
+
+    assert get_last_json(text, llm=llm) == {"output": "Paris"}
+    assert len(llm.calls) == 1
+    assert repair_stats() == {"llm": 1}
+
+
+def test_repairs_into_non_objects_are_reformatted_by_the_llm():
+    llm = FakeLLM(fn=lambda prompt: '```json\n{"a": 1}\n```')
+
+    assert get_last_json('```json\n[1, 2,\n```', llm=llm) == {"a": 1}
+    assert len(llm.calls) == 1
@@ -0,0 +1,59 @@
+import asyncio
+
+from helpers import FakeLLM
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from openagi.llms.openai import OpenAIConfigModel, OpenAIModel
+
+MESSAGES = [
+    {"role": "system", "content": "You are a researcher."},
+    {"role": "user", "content": "Find the capital of France."},
+    {"role": "assistant", "content": "Thought: search it."},
+    {"role": "user", "content": "Observation: Paris"},
+]
+
+
+class FakeChatModel:
+    """Langchain chat model recording the messages it gets."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, messages):
+        self.calls.append(messages)
+        return AIMessage(content="done")
+
+    async def ainvoke(self, messages):
+        return self(messages)
+
+
+def test_chat_models_get_the_roles_natively():
+    chat = FakeChatModel()
+    llm = OpenAIModel(config=OpenAIConfigModel(openai_api_key="key"), llm=chat)
+
+    assert llm.run_messages(MESSAGES) == "done"
+    assert asyncio.run(llm.arun_messages(MESSAGES)) == "done"
+    for messages in chat.calls:
+        assert [type(message) for message in messages] == [
+            SystemMessage,
+            HumanMessage,
+            AIMessage,
+            HumanMessage,
+        ]
+        assert [message.content for message in messages] == [m["content"] for m in MESSAGES]
+
+
+def test_other_models_get_the_messages_flattened():
+    llm = FakeLLM(fn=lambda prompt: "done", calls=[])
+
+    assert llm.run_messages(MESSAGES) == "done"
+    assert llm.calls == ["\n".join(message["content"] for message in MESSAGES)]
+
+
+def test_prompts_are_sent_as_a_user_message():
+    chat = FakeChatModel()
+    llm = OpenAIModel(config=OpenAIConfigModel(openai_api_key="key"), llm=chat)
+
+    llm.run("Find the capital of France.")
+
+    assert chat.calls == [[HumanMessage(content="Find the capital of France.")]]
@@ -0,0 +1,34 @@
+from openagi.prompts.worker_task_execution import (
+    WorkerAgentTaskExecution,
+    WorkerAgentTaskInstructions,
+    WorkerAgentTaskQuestion,
+)
+
+TE_VARS = dict(
+    task_to_execute="Find the capital of France.",
+    worker_description="Researcher",
+    supported_actions="[]",
+    thought_provokes="Observation: None",
+    output_key="final_output",
+    context=None,
+    max_iterations=5,
+)
+
+
+def test_single_agent_prompt_asks_the_question_before_the_actions():
+    prompt = WorkerAgentTaskExecution().from_template(TE_VARS)
+
+    assert prompt.index("Question: Find the capital") < prompt.index("# Actions available to you")
+    assert prompt.index("# Actions available to you") < prompt.index("# Example session:")
+    assert prompt.endswith("Begin!\nObservation: None")
+
+
+def test_worker_instructions_do_not_depend_on_the_task():
+    other_task = dict(
+        TE_VARS, task_to_execute="Find the capital of Spain.", context="Earlier results"
+    )
+
+    assert WorkerAgentTaskInstructions().from_template(
+        TE_VARS
+    ) == WorkerAgentTaskInstructions().from_template(other_task)
+    assert "Find the capital of Spain." in WorkerAgentTaskQuestion().from_template(other_task)
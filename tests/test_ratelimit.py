@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from helpers import FakeLLM
+
+from openagi.llms.ratelimit import RateLimitedLLM, TokenBucket, is_retryable, retry_after
+
+
+class ThrottledError(Exception):
+    status_code = 429
+
+    def __init__(self, headers=None):
+        super().__init__("Too many requests")
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+def flaky_llm(failures, error=ThrottledError):
+    state = {"failures": failures}
+
+    def fn(prompt):
+        if state["failures"]:
+            state["failures"] -= 1
+            raise error()
+        return "ok"
+
+    return FakeLLM(fn=fn)
+
+
+def test_token_bucket_reserves_ahead():
+    bucket = TokenBucket(capacity=2, period=1.0)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    # The third request waits for half a second, the fourth for a second.
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_token_bucket_caps_oversized_requests():
+    bucket = TokenBucket(capacity=10, period=1.0)
+
+    assert bucket.reserve(100) == 0.0
+
+
+def test_retryable_errors():
+    assert is_retryable(ThrottledError())
+    assert not is_retryable(ValueError("bad request"))
+    assert retry_after(ThrottledError({"retry-after": "3"})) == 3.0
+    assert retry_after(ThrottledError({"retry-after-ms": "250"})) == 0.25
+
+
+def test_throttling_errors_are_retried():
+    wrapped = flaky_llm(failures=2)
+    llm = RateLimitedLLM(wrapped=wrapped, initial_backoff=0.001, bucket_key="retried")
+
+    assert llm.run("prompt") == "ok"
+    assert len(wrapped.calls) == 3
+    assert llm.stats["retries"] == 2
+
+
+def test_retries_are_bounded():
+    llm = RateLimitedLLM(
+        wrapped=flaky_llm(failures=5), max_retries=1, initial_backoff=0.001, bucket_key="bounded"
+    )
+
+    with pytest.raises(ThrottledError):
+        llm.run("prompt")
+    assert llm.stats["failures"] == 1
+
+
+def test_other_errors_are_not_retried():
+    wrapped = flaky_llm(failures=1, error=ValueError)
+    llm = RateLimitedLLM(wrapped=wrapped, bucket_key="not-retried")
+
+    with pytest.raises(ValueError):
+        llm.run("prompt")
+    assert len(wrapped.calls) == 1
+
+
+def test_async_calls_are_retried():
+    llm = RateLimitedLLM(wrapped=flaky_llm(failures=1), initial_backoff=0.001, bucket_key="async")
+
+    assert asyncio.run(llm.arun("prompt")) == "ok"
+    assert llm.stats["retries"] == 1
+
+
+def test_requests_per_minute_throttle():
+    llm = RateLimitedLLM(
+        wrapped=flaky_llm(failures=0), requests_per_minute=60, bucket_key="throttled"
+    )
+
+    # The bucket holds a minute of requests, the next one waits for a second.
+    for _ in range(60):
+        assert llm._throttle_delay("prompt") == 0.0
+    assert llm._throttle_delay("prompt") == pytest.approx(1.0, abs=0.05)
+
+
+class StreamingLLM(FakeLLM):
+    """LLM streaming two chunks, failing with `error` before the first one or after it."""
+
+    error: type = ThrottledError
+    fail_before: int = 0
+    fail_after_first_chunk: bool = False
+
+    def stream(self, input_data):
+        self.calls.append(input_data)
+        if self.fail_before:
+            self.fail_before -= 1
+            raise self.error()
+        yield "first "
+        if self.fail_after_first_chunk:
+            raise self.error()
+        yield "second"
+
+    async def astream(self, input_data):
+        for chunk in self.stream(input_data):
+            yield chunk
+
+
+def test_streams_failing_before_the_first_chunk_are_retried():
+    wrapped = StreamingLLM(fail_before=1, calls=[])
+    llm = RateLimitedLLM(wrapped=wrapped, initial_backoff=0.001, bucket_key="stream-retried")
+
+    assert "".join(llm.stream("prompt")) == "first second"
+    assert len(wrapped.calls) == 2
+    assert llm.stats["retries"] == 1
+
+
+def test_streams_failing_after_the_first_chunk_count_as_failures():
+    wrapped = StreamingLLM(fail_after_first_chunk=True, calls=[])
+    llm = RateLimitedLLM(wrapped=wrapped, initial_backoff=0.001, bucket_key="stream-failed")
+    chunks = []
+
+    with pytest.raises(ThrottledError):
+        for chunk in llm.stream("prompt"):
+            chunks.append(chunk)
+
+    assert chunks == ["first "]
+    assert len(wrapped.calls) == 1
+    assert llm.stats["failures"] == 1 and llm.stats["retries"] == 0
+
+
+def test_async_streams_failing_after_the_first_chunk_count_as_failures():
+    wrapped = StreamingLLM(fail_after_first_chunk=True, calls=[])
+    llm = RateLimitedLLM(wrapped=wrapped, initial_backoff=0.001, bucket_key="astream-failed")
+
+    async def consume():
+        return [chunk async for chunk in llm.astream("prompt")]
+
+    with pytest.raises(ThrottledError):
+        asyncio.run(consume())
+    assert llm.stats["failures"] == 1
@@ -0,0 +1,86 @@
+import pytest
+from pydantic import Field
+
+from openagi.actions.base import BaseAction
+from openagi.actions.registry import ActionRegistry
+from openagi.exception import InvalidActionError
+from openagi.utils.extraction import get_act_classes_from_json
+
+
+class Echo(BaseAction):
+    """Returns the given text."""
+
+    text: str = Field(description="Text to return.")
+
+    def execute(self):
+        return self.text
+
+
+class Search(BaseAction):
+    """Searches the web."""
+
+    query: str = Field(description="Query to search.")
+
+    def execute(self):
+        return self.query
+
+
+# An action of the same name from another module.
+OtherEcho = type("Echo", (Echo,), {"__module__": "plugins.echo", "__doc__": "Echoes elsewhere."})
+
+
+def requested(kls, module=__name__, **params):
+    return {"cls": {"kls": kls, "module": module}, "params": params}
+
+
+def test_registry_indexes_actions_once():
+    registry = ActionRegistry([Echo, Search, Echo, BaseAction, "Echo"])
+
+    assert registry.actions == (Echo, Search)
+    assert "Echo" in registry and "BaseAction" not in registry
+    assert registry.docs is registry.docs
+    assert registry.select(["Search", "Unknown", "Search"]) == [Search]
+
+
+def test_get_ignores_a_misspelled_module():
+    registry = ActionRegistry([Echo])
+
+    assert registry.get("Echo", "actions.echo") is Echo
+    with pytest.raises(InvalidActionError):
+        registry.get("Shell")
+
+
+def test_module_disambiguates_actions_sharing_a_name():
+    registry = ActionRegistry([Echo, OtherEcho])
+
+    assert registry.get("Echo", "plugins.echo") is OtherEcho
+    assert registry.get("Echo", __name__) is Echo
+    assert registry.get("Echo") is Echo
+
+
+def test_resolve_requested_actions():
+    registry = ActionRegistry([Echo, Search])
+
+    assert get_act_classes_from_json(
+        [requested("Echo", text="hi"), requested("Search", query="q")], registry
+    ) == [
+        (Echo, {"text": "hi"}),
+        (Search, {"query": "q"}),
+    ]
+
+
+def test_resolve_rejects_unregistered_actions():
+    registry = ActionRegistry([Echo])
+
+    # Importable, but not registered.
+    with pytest.raises(InvalidActionError):
+        registry.resolve([requested("Search", query="q")])
+
+
+def test_resolve_rejects_malformed_actions():
+    registry = ActionRegistry([Echo])
+
+    with pytest.raises(InvalidActionError):
+        registry.resolve([{"cls": {"kls": "Echo"}, "params": "hi"}])
+    with pytest.raises(KeyError):
+        registry.resolve([{"cls": {"kls": "Echo"}}])
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+from helpers import FakeLLM
+
+from openagi.exception import OpenAGIException
+from openagi.llms.replay import RecordingLLM, ReplayLLM
+
+
+def record(tmp_path, calls):
+    cassette = tmp_path / "cassette.jsonl"
+    responses = iter(response for _, response in calls)
+    llm = RecordingLLM(
+        wrapped=FakeLLM(fn=lambda prompt: next(responses)), cassette_path=str(cassette)
+    )
+    for prompt, _ in calls:
+        llm.run(prompt)
+    return cassette
+
+
+def test_recorded_calls_are_replayed(tmp_path):
+    cassette = record(tmp_path, [("first", "one"), ("second", "two")])
+
+    llm = ReplayLLM(cassette_path=str(cassette))
+
+    assert llm.run("second") == "two"
+    assert asyncio.run(llm.arun("first")) == "one"
+    assert llm.stats["exact"] == 2
+
+
+def test_repeated_inputs_replay_in_the_recorded_order(tmp_path):
+    cassette = record(tmp_path, [("prompt", "one"), ("prompt", "two")])
+
+    llm = ReplayLLM(cassette_path=str(cassette))
+
+    assert [llm.run("prompt") for _ in range(3)] == ["one", "two", "one"]
+
+
+def test_volatile_values_are_masked(tmp_path):
+    cassette = record(
+        tmp_path, [("session 123e4567-e89b-12d3-a456-426614174000 on 2024-05-01", "ok")]
+    )
+
+    llm = ReplayLLM(cassette_path=str(cassette), similarity_threshold=None)
+
+    assert llm.run("session 9b2f1c3e-0d4a-4e8b-9f6a-1c2d3e4f5a6b on 2024-06-02") == "ok"
+    assert llm.stats["fuzzy"] == 1
+
+
+def test_similar_inputs_are_matched(tmp_path):
+    cassette = record(tmp_path, [("Summarize the history of the Roman empire.", "summary")])
+
+    llm = ReplayLLM(cassette_path=str(cassette))
+
+    assert llm.run("Summarize the history of the Roman empire!") == "summary"
+    assert llm.stats["similar"] == 1
+
+
+def test_unrecorded_inputs_raise(tmp_path):
+    cassette = record(tmp_path, [("prompt", "ok")])
+
+    llm = ReplayLLM(cassette_path=str(cassette))
+
+    with pytest.raises(OpenAGIException):
+        llm.run("something else entirely")
+    assert llm.stats["misses"] == 1
+
+
+def test_incomplete_records_are_skipped(tmp_path):
+    cassette = record(tmp_path, [("prompt", "ok")])
+    with cassette.open("a") as f:
+        f.write('{"key": "trunc')
+
+    llm = ReplayLLM(cassette_path=str(cassette))
+
+    assert llm.run("prompt") == "ok"
+    assert len(cassette.read_text().splitlines()) == 2
+    assert json.loads(cassette.read_text().splitlines()[0])["response"] == "ok"
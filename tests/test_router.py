@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+from helpers import FakeLLM
+
+from openagi.exception import OpenAGIException
+from openagi.llms.router import Backend, RoutedLLM
+
+
+def failing(prompt):
+    raise ConnectionError("backend down")
+
+
+def slow(prompt):
+    time.sleep(0.5)
+    return "slow"
+
+
+def test_failover_to_the_next_backend():
+    down, up = FakeLLM(fn=failing), FakeLLM(fn=lambda prompt: "ok")
+    llm = RoutedLLM(backends=[Backend(llm=down, name="down"), Backend(llm=up, name="up")])
+
+    assert llm.run("prompt") == "ok"
+    assert llm.stats["failovers"] == 1
+    assert llm.stats["backends"]["down"]["errors"] == 1
+    # The failing backend now ranks last.
+    assert llm.run("prompt") == "ok"
+    assert len(down.calls) == 1
+
+
+def test_all_backends_failing_raises():
+    llm = RoutedLLM(backends=[FakeLLM(fn=failing), FakeLLM(fn=failing)])
+
+    with pytest.raises(OpenAGIException):
+        llm.run("prompt")
+    with pytest.raises(OpenAGIException):
+        asyncio.run(llm.arun("prompt"))
+
+
+def test_cost_ranks_the_backends():
+    cheap, expensive = FakeLLM(fn=lambda prompt: "cheap"), FakeLLM(fn=lambda prompt: "expensive")
+    llm = RoutedLLM(
+        backends=[Backend(llm=expensive, cost=10), Backend(llm=cheap, cost=1)],
+        cost_weight=1.0,
+    )
+
+    assert llm.run("prompt") == "cheap"
+    assert expensive.calls == []
+
+
+def test_slow_calls_are_hedged():
+    fast = FakeLLM(fn=lambda prompt: "fast")
+    llm = RoutedLLM(
+        backends=[Backend(llm=FakeLLM(fn=slow), name="slow"), Backend(llm=fast, name="fast")],
+        hedge=True,
+        hedge_after=0.05,
+    )
+
+    start = time.monotonic()
+    assert llm.run("prompt") == "fast"
+    assert time.monotonic() - start < 0.4
+    assert llm.stats["hedges"] == 1
+
+
+def test_slow_async_calls_are_hedged():
+    fast = FakeLLM(fn=lambda prompt: "fast")
+    llm = RoutedLLM(backends=[FakeLLM(fn=slow), fast], hedge=True, hedge_after=0.05)
+
+    assert asyncio.run(llm.arun("prompt")) == "fast"
+    assert llm.stats["hedges"] == 1
+
+
+def test_fast_calls_are_not_hedged():
+    second = FakeLLM(fn=lambda prompt: "second")
+    llm = RoutedLLM(
+        backends=[FakeLLM(fn=lambda prompt: "first"), second],
+        hedge=True,
+        hedge_after=0.5,
+    )
+
+    assert llm.run("prompt") == "first"
+    assert llm.stats["hedges"] == 0
+    assert second.calls == []
+
+
+def test_close_shuts_down_the_hedging_threads():
+    llm = RoutedLLM(
+        backends=[FakeLLM(fn=lambda prompt: "first"), FakeLLM(fn=lambda prompt: "second")],
+        hedge=True,
+        hedge_after=0.5,
+    )
+    llm.run("prompt")
+    executor = llm._executor
+
+    llm.close()
+
+    assert executor._shutdown and llm._executor is None
+    # The router can still be used, with a new pool.
+    assert llm.run("prompt") in ("first", "second")
+    assert llm._executor is not None
+    llm.close()
+
+
+class StreamingLLM(FakeLLM):
+    """LLM streaming its response in two chunks, waiting `delay` before the first one."""
+
+    delay: float = 0.0
+    fail_after_first_chunk: bool = False
+
+    def stream(self, input_data):
+        time.sleep(self.delay)
+        yield "first "
+        if self.fail_after_first_chunk:
+            raise ConnectionError("stream broken")
+        time.sleep(0.1)
+        yield "second"
+
+
+def test_streams_track_the_time_to_the_first_chunk():
+    llm = RoutedLLM(backends=[Backend(llm=StreamingLLM(), name="stream")])
+
+    assert "".join(llm.stream("prompt")) == "first second"
+    stats = llm.stats["backends"]["stream"]
+    assert stats["calls"] == 1
+    assert stats["first_chunk_latency"] < 0.05
+    assert stats["latency"] is None
+
+
+def test_streams_are_ranked_on_the_time_to_the_first_chunk():
+    llm = RoutedLLM(backends=[StreamingLLM(), StreamingLLM()])
+    # The first backend completes calls faster, the second one starts streaming sooner.
+    llm._stats[0].record(0.5, error=False)
+    llm._stats[0].record_stream(0.3, error=False)
+    llm._stats[1].record(1.0, error=False)
+    llm._stats[1].record_stream(0.1, error=False)
+
+    assert llm.ranked() == [0, 1]
+    assert llm.ranked(streaming=True) == [1, 0]
+
+
+def test_mid_stream_failures_count_as_errors():
+    llm = RoutedLLM(
+        backends=[
+            Backend(llm=StreamingLLM(fail_after_first_chunk=True), name="broken"),
+            StreamingLLM(),
+        ]
+    )
+
+    with pytest.raises(ConnectionError):
+        list(llm.stream("prompt"))
+    assert llm.stats["backends"]["broken"]["errors"] == 1
+    assert llm.stats["failovers"] == 0
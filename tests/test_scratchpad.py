@@ -0,0 +1,39 @@
+from openagi.memory.scratchpad import Scratchpad
+
+
+def filled_scratchpad(token_budget=50):
+    scratchpad = Scratchpad(token_budget=token_budget, keep_recent=1, pinned=1, count_tokens=len)
+    scratchpad.append("Question")
+    for indx in range(4):
+        scratchpad.append(f"Observation {indx}: " + "x" * 40)
+    return scratchpad
+
+
+def test_pinned_entries_are_kept():
+    rendered = filled_scratchpad().render_entries()
+
+    assert rendered[0] == "Question"
+    assert any("elided" in entry for entry in rendered)
+
+
+def test_tokens_saved_are_counted_once_per_mutation():
+    scratchpad = filled_scratchpad(token_budget=150)
+    scratchpad.render_entries()
+    saved = scratchpad.tokens_saved
+    assert saved > 0
+
+    scratchpad.render_entries()
+    scratchpad.render_messages()
+    "\n".join(scratchpad)
+    assert scratchpad.tokens_saved == saved
+
+    # Lowering the budget replaces the savings of the same entries instead of adding to them.
+    lowered = filled_scratchpad(token_budget=100)
+    lowered.render_entries()
+    scratchpad.token_budget = 100
+    scratchpad.render_entries()
+    assert scratchpad.tokens_saved == lowered.tokens_saved > saved
+
+    scratchpad.append("Observation 4")
+    scratchpad.render_entries()
+    assert scratchpad.tokens_saved > lowered.tokens_saved
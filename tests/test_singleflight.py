@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+from helpers import FakeLLM
+
+from openagi.llms.singleflight import SingleFlightLLM
+
+
+def slow_llm(response="ok"):
+    def fn(prompt):
+        time.sleep(0.2)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return FakeLLM(fn=fn)
+
+
+def run_concurrently(fn, count=4):
+    results, errors = [], []
+
+    def target():
+        try:
+            results.append(fn())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_identical_calls_in_flight_are_coalesced():
+    wrapped = slow_llm()
+    llm = SingleFlightLLM(wrapped=wrapped)
+
+    results, _ = run_concurrently(lambda: llm.run("same prompt"))
+
+    assert results == ["ok"] * 4
+    assert len(wrapped.calls) == 1
+    assert llm.stats == {"calls": 4, "coalesced": 3}
+
+
+def test_different_calls_are_not_coalesced():
+    wrapped = slow_llm()
+    llm = SingleFlightLLM(wrapped=wrapped)
+    prompts = iter(f"prompt {i}" for i in range(4))
+
+    run_concurrently(lambda: llm.run(next(prompts)))
+
+    assert len(wrapped.calls) == 4
+    assert llm.stats["coalesced"] == 0
+
+
+def test_completed_calls_are_not_kept():
+    wrapped = FakeLLM(fn=lambda prompt: "ok")
+    llm = SingleFlightLLM(wrapped=wrapped)
+
+    llm.run("prompt")
+    llm.run("prompt")
+
+    assert len(wrapped.calls) == 2
+
+
+def test_errors_reach_every_waiting_caller():
+    llm = SingleFlightLLM(wrapped=slow_llm(ConnectionError("down")))
+
+    results, errors = run_concurrently(lambda: llm.run("failing prompt"))
+
+    assert results == []
+    assert len(errors) == 4 and all(isinstance(exc, ConnectionError) for exc in errors)
+    with pytest.raises(ConnectionError):
+        llm.run("failing prompt")
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from typing import List
+
+from helpers import FakeLLM, action, final
+
+from openagi.utils.streaming import (
+    JSONStreamDetector,
+    astream_until_json,
+    stream_until_json,
+    stream_with_json_callback,
+)
+
+KEYS = ("action", "final_output")
+
+
+class StreamingLLM(FakeLLM):
+    """LLM streaming `chunks`, recording how many of them were consumed."""
+
+    chunks: List[str] = []
+    consumed: int = 0
+    closed: bool = False
+
+    def stream(self, input_data):
+        self.calls.append(input_data)
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+    async def astream(self, input_data):
+        for chunk in self.stream(input_data):
+            yield chunk
+
+
+def _block(text: str):
+    return json.loads(text.split("```json")[1].rsplit("```", 1)[0])
+
+
+def _chunked(text: str, size: int) -> List[str]:
+    return [text[indx : indx + size] for indx in range(0, len(text), size)]
+
+
+def test_stops_on_the_first_complete_action():
+    response = "Thought: search.\n" + action("Search", query="x") + "\nObservation: made up"
+    chunks = _chunked(response, 7) + ["never streamed"] * 3
+    llm = StreamingLLM(chunks=chunks, calls=[])
+
+    text = stream_until_json(llm, "prompt", keys=KEYS)
+
+    assert text.endswith("}\n```")
+    assert "Observation" not in text
+    assert _block(text) == _block(action("Search", query="x"))
+    assert llm.consumed < len(chunks)
+    assert llm.closed
+
+
+def test_stops_on_the_final_output_asynchronously():
+    chunks = _chunked(final("Paris"), 5) + ["never streamed"]
+    llm = StreamingLLM(chunks=chunks, calls=[])
+
+    text = asyncio.run(astream_until_json(llm, "prompt", keys=KEYS))
+
+    assert _block(text) == {"final_output": "Paris"}
+    assert llm.consumed < len(chunks)
+
+
+def test_detects_a_fence_split_across_chunks():
+    detector = JSONStreamDetector(KEYS)
+
+    for chunk in ["Thought: done.\n``", "`js", "on\n", '{"final_output": "a } ', 'b"', "}"]:
+        result = detector.feed(chunk)
+
+    assert result == {"final_output": "a } b"}
+    assert detector.truncated_text() == 'Thought: done.\n```json\n{"final_output": "a } b"}\n```'
+
+
+def test_skips_the_objects_without_the_keys():
+    detector = JSONStreamDetector(KEYS)
+
+    assert detector.feed('```json\n{"thought": 1}\n```\n```json\n{"action"') is None
+    assert detector.feed(": []}") == {"action": []}
+
+
+def test_json_without_a_fence_is_streamed_in_full():
+    response = 'Sure: {"final_output": "Paris"} hope it helps'
+    llm = StreamingLLM(chunks=_chunked(response, 4), calls=[])
+
+    assert stream_until_json(llm, "prompt", keys=KEYS) == response
+    assert llm.consumed == len(llm.chunks)
+
+
+def test_llms_without_streaming_return_the_whole_response():
+    response = final("Paris") + "\ntrailing text"
+    llm = FakeLLM(fn=lambda prompt: response, calls=[])
+
+    assert stream_until_json(llm, "prompt", keys=KEYS) == final("Paris")
+    assert asyncio.run(astream_until_json(llm, "prompt", keys=KEYS)) == final("Paris")
+    assert llm.calls == ["prompt", "prompt"]
+
+
+def test_callback_gets_the_first_action_while_the_stream_goes_on():
+    response = action("Search", query="x") + "\nObservation: more text"
+    llm = StreamingLLM(chunks=_chunked(response, 6), calls=[])
+    detected = []
+
+    text = stream_with_json_callback(llm, "prompt", KEYS, detected.append)
+
+    assert text == response
+    assert detected == [_block(action("Search", query="x"))]
@@ -0,0 +1,194 @@
+import asyncio
+import threading
+from typing import ClassVar, List, Tuple
+
+from helpers import FakeLLM, action, fake_memory, final
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from pydantic import Field
+
+from openagi.actions.base import BaseAction
+from openagi.llms.tools import ToolCall, ToolResponse, binds_tools
+from openagi.memory.scratchpad import Scratchpad
+from openagi.tasks.task import Task
+from openagi.worker import Worker
+
+
+class Echo(BaseAction):
+    """Returns the given text."""
+
+    text: str = Field(description="Text to return.")
+
+    def execute(self):
+        return f"echo: {self.text}"
+
+
+class Lookup(BaseAction):
+    """Looks up the given text, without side effects."""
+
+    text: str = Field(description="Text to look up.")
+    speculative: ClassVar[bool] = True
+    # The text of each run, and whether it ran speculatively, i.e. in a background thread.
+    runs: ClassVar[List[Tuple[str, bool]]] = []
+
+    def execute(self):
+        self.runs.append((self.text, threading.current_thread() is not threading.main_thread()))
+        return f"found: {self.text}"
+
+
+class FakeToolLLM(FakeLLM):
+    """LLM calling the scripted tools, recording the messages and tools it gets."""
+
+    supports_tools: ClassVar[bool] = True
+
+    def run_tools(self, messages, tools):
+        self.calls.append((messages, tools))
+        return self.fn(messages)
+
+
+class FakeChatModel:
+    """Langchain chat model bound to tools, answering with a scripted tool call."""
+
+    def __init__(self, tool_call) -> None:
+        self.tool_call = tool_call
+        self.bound = None
+
+    def bind_tools(self, tools):
+        self.bound = tools
+        return self
+
+    def invoke(self, messages):
+        return AIMessage(content="Thought: echo it.", tool_calls=[self.tool_call])
+
+
+def scripted_llm(responses):
+    responses = iter(responses)
+    return FakeLLM(fn=lambda prompt: next(responses))
+
+
+def make_worker(llm, **kwargs):
+    return Worker(
+        role="researcher",
+        instructions="Research the topic.",
+        llm=llm,
+        memory=fake_memory(),
+        actions=[Echo],
+        **kwargs,
+    )
+
+
+def test_sync_and_async_execution_take_the_same_steps():
+    responses = [action("Echo", text="hello"), final("done")]
+    sync_llm, async_llm = scripted_llm(responses), scripted_llm(responses)
+
+    sync_output, _ = make_worker(sync_llm).execute_task(
+        Task(name="t", description="d", worker_config={})
+    )
+    async_output, _ = asyncio.run(
+        make_worker(async_llm).aexecute_task(Task(name="t", description="d", worker_config={}))
+    )
+
+    assert sync_output == async_output == {"final_output": "done"}
+    assert sync_llm.calls == async_llm.calls
+    assert "echo: hello" in sync_llm.calls[-1]
+
+
+def test_force_output_asks_again_for_the_output():
+    llm = scripted_llm([action("Echo", text="again"), final("forced")])
+    history = Scratchpad()
+    history.append("Question")
+
+    assert make_worker(llm)._force_output("", history, "Instructions") == (
+        False,
+        {"final_output": "forced"},
+    )
+    assert "force and give me the output" in llm.calls[0]
+    assert "give me the output. {'action'" in llm.calls[1]
+
+
+def test_worker_without_memory_is_not_traced():
+    worker = Worker(
+        role="researcher", instructions="Research the topic.", llm=scripted_llm([final("done")])
+    )
+
+    output, _ = worker.execute_task(Task(name="t", description="d", worker_config={}))
+
+    assert output == {"final_output": "done"}
+
+
+def test_speculative_action_runs_once_when_the_final_action_matches():
+    Lookup.runs = []
+    llm = scripted_llm([action("Lookup", text="a"), final("done")])
+    worker = make_worker(llm, speculative_actions=True)
+    worker.actions = [Lookup]
+
+    output, _ = worker.execute_task(Task(name="t", description="d", worker_config={}))
+
+    assert output == {"final_output": "done"}
+    assert Lookup.runs == [("a", True)]
+    assert "found: a" in llm.calls[-1]
+
+
+def test_speculative_action_is_discarded_when_the_final_action_differs():
+    Lookup.runs = []
+    llm = scripted_llm(
+        [action("Lookup", text="a") + "\nOn second thought:\n" + action("Lookup", text="b")]
+        + [final("done")]
+    )
+    worker = make_worker(llm, speculative_actions=True)
+    worker.actions = [Lookup]
+
+    worker.execute_task(Task(name="t", description="d", worker_config={}))
+
+    assert sorted(Lookup.runs) == [("a", True), ("b", False)]
+    assert "found: b" in llm.calls[-1]
+    assert "found: a" not in llm.calls[-1]
+
+
+def test_tool_calls_run_the_actions_and_feed_back_the_observations():
+    responses = iter(
+        [
+            ToolResponse("Thought: echo it.", (ToolCall("Echo", {"text": "hi"}, "call-1"),)),
+            ToolResponse("", (ToolCall("final_output", {"output": "done"}, "call-2"),)),
+        ]
+    )
+    llm = FakeToolLLM(fn=lambda messages: next(responses), calls=[])
+
+    output, _ = make_worker(llm, tool_calling=True).execute_task(
+        Task(name="t", description="d", worker_config={})
+    )
+
+    assert output == {"final_output": "done"}
+    (_, tools), (messages, _) = llm.calls
+    assert [tool["function"]["name"] for tool in tools] == ["Echo", "final_output"]
+    assert "echo: hi" in messages[-1]["content"]
+    assert "'kls': 'Echo'" in "".join(message["content"] for message in messages)
+
+
+def test_tool_calls_go_through_the_bound_chat_model():
+    chat = FakeChatModel({"name": "Echo", "args": {"text": "hi"}, "id": "call-1"})
+    llm = FakeToolLLM(llm=chat, calls=[])
+    tools = make_worker(llm)._tools()
+
+    response = super(FakeToolLLM, llm).run_tools([{"role": "user", "content": "Echo hi"}], tools)
+
+    assert chat.bound == tools
+    assert response == ToolResponse(
+        "Thought: echo it.", (ToolCall("Echo", {"text": "hi"}, "call-1"),)
+    )
+
+
+def test_llms_without_tool_calling_fall_back_to_json_prompting():
+    class ChatModel(BaseChatModel):
+        pass
+
+    llm = scripted_llm([action("Echo", text="hello"), final("done")])
+
+    output, _ = make_worker(llm, tool_calling=True).execute_task(
+        Task(name="t", description="d", worker_config={})
+    )
+
+    assert not binds_tools(ChatModel)
+    assert output == {"final_output": "done"}
+    assert "echo: hello" in llm.calls[-1]
+    assert '"action"' in llm.calls[0]